@@ -6,9 +6,27 @@ Provides two resume strategies:
 """
 
 import json
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from types import TracebackType
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+try:
+    import msgpack
+
+    _HAS_MSGPACK = True
+except ImportError:
+    _HAS_MSGPACK = False
+
+STATE_FORMATS = ("json", "msgpack")
 
 
 @dataclass
@@ -38,7 +56,11 @@ class CheckpointState:
     last_checkpoint_time: str = ""
 
     def to_dict(self) -> dict[str, str | list[str] | None]:
-        """Serialize to dictionary for JSON storage."""
+        """Serialize to dictionary for JSON storage.
+
+        Used by the msgpack and stdlib ``json`` paths; orjson encodes the
+        dataclass directly.
+        """
         return {
             "project": self.project,
             "target": self.target,
@@ -89,54 +111,165 @@ class CheckpointState:
 class CheckpointManager:
     """Manages checkpoint state for a migration directory.
 
-    Checkpoints are stored in .checkpoint/state.json within the migration directory.
+    Checkpoints are stored in .checkpoint/state.json within the migration directory,
+    or in .checkpoint/state.msgpack when the msgpack format is selected. The
+    msgpack format falls back to JSON when the msgpack package is not installed.
+
+    By default every ``mark_feature_*`` call writes the state file. With a
+    ``batch_interval_sec``, mutations are kept in memory and written once no
+    further mutation has arrived for that many seconds, or on ``flush()``.
+    Each ``mark_feature_*`` call holds the manager's lock from load to commit,
+    so the background write never sees a half-updated state. The manager is
+    a context manager that flushes on exit.
     """
 
     CHECKPOINT_DIR = ".checkpoint"
     STATE_FILE = "state.json"
+    MSGPACK_STATE_FILE = "state.msgpack"
 
-    def __init__(self, migration_dir: Path) -> None:
+    def __init__(
+        self,
+        migration_dir: Path,
+        batch_interval_sec: float | None = None,
+        state_format: str = "json",
+    ) -> None:
         """Initialize checkpoint manager.
 
         Args:
             migration_dir: Path to the migration output directory
+            batch_interval_sec: If set, delay writes until this many seconds
+                pass without a new mutation. None saves on every mutation.
+            state_format: On-disk format, "json" or "msgpack"
+
+        Raises:
+            ValueError: If state_format is not a supported format
         """
+        if state_format not in STATE_FORMATS:
+            raise ValueError(
+                f"Unknown checkpoint format: {state_format}. "
+                f"Available: {', '.join(STATE_FORMATS)}"
+            )
+        if state_format == "msgpack" and not _HAS_MSGPACK:
+            state_format = "json"
+
         self.migration_dir = migration_dir
         self.checkpoint_dir = migration_dir / self.CHECKPOINT_DIR
-        self.state_file = self.checkpoint_dir / self.STATE_FILE
+        self.state_format = state_format
+        state_name = (
+            self.MSGPACK_STATE_FILE if state_format == "msgpack" else self.STATE_FILE
+        )
+        self.state_file = self.checkpoint_dir / state_name
+        self.batch_interval_sec = batch_interval_sec
+        self._state: CheckpointState | None = None
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        self._lock = threading.RLock()
+        self._dir_ensured = False
+
+    def __enter__(self) -> "CheckpointManager":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.flush()
 
     def exists(self) -> bool:
         """Check if a checkpoint exists."""
-        return self.state_file.exists()
+        return self._dirty or self.state_file.exists()
 
     def load(self) -> CheckpointState | None:
         """Load checkpoint state from disk.
 
+        Returns the pending in-memory state instead when batched mutations
+        have not been written yet.
+
         Returns:
             CheckpointState if checkpoint exists, None otherwise
         """
+        with self._lock:
+            if self._dirty:
+                return self._state
         if not self.state_file.exists():
             return None
 
-        content = self.state_file.read_text()
-        data = json.loads(content)
+        if self.state_format == "msgpack":
+            data = msgpack.unpackb(self.state_file.read_bytes())
+        elif _HAS_ORJSON:
+            data = orjson.loads(self.state_file.read_bytes())
+        else:
+            data = json.loads(self.state_file.read_text())
         return CheckpointState.from_dict(data)
 
     def save(self, state: CheckpointState) -> None:
-        """Save checkpoint state to disk.
+        """Save checkpoint state to disk atomically.
 
         Args:
             state: CheckpointState to persist
         """
-        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        state.last_checkpoint_time = datetime.now(timezone.utc).isoformat()
-        content = json.dumps(state.to_dict(), indent=2)
-        self.state_file.write_text(content)
+        with self._lock:
+            self._cancel_timer()
+            self._state = None
+            self._dirty = False
+            if not self._dir_ensured:
+                self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+                self._dir_ensured = True
+            state.last_checkpoint_time = datetime.now(timezone.utc).isoformat()
+            payload: bytes
+            if self.state_format == "msgpack":
+                payload = msgpack.packb(state.to_dict())
+            elif _HAS_ORJSON:
+                payload = orjson.dumps(state, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(state.to_dict(), indent=2).encode()
+
+            # Write to a sibling temp file and rename over the state file so a
+            # crash mid-write never leaves a truncated checkpoint behind
+            tmp_file = self.state_file.with_suffix(".tmp")
+            tmp_file.write_bytes(payload)
+            tmp_file.replace(self.state_file)
+
+    def flush(self) -> None:
+        """Write any pending batched state to disk."""
+        with self._lock:
+            if self._dirty and self._state is not None:
+                self.save(self._state)
+            else:
+                self._cancel_timer()
 
     def clear(self) -> None:
         """Remove checkpoint state."""
-        if self.state_file.exists():
-            self.state_file.unlink()
+        with self._lock:
+            self._cancel_timer()
+            self._state = None
+            self._dirty = False
+            self._dir_ensured = False
+            if self.state_file.exists():
+                self.state_file.unlink()
+
+    def _commit(self, state: CheckpointState) -> None:
+        """Persist a mutated state now, or queue it when batching."""
+        if self.batch_interval_sec is None:
+            self.save(state)
+            return
+        with self._lock:
+            self._state = state
+            self._dirty = True
+            self._cancel_timer()
+            # A daemon timer never holds up interpreter exit; flush() and
+            # __exit__ are what guarantee the pending state is written
+            self._timer = threading.Timer(self.batch_interval_sec, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        """Cancel a scheduled batched write, if any."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
 
     def create_initial(
         self,
@@ -169,15 +302,16 @@ class CheckpointManager:
             feature: Feature name being started
             session_id: Current session ID
         """
-        state = self.load()
-        if state is None:
-            raise ValueError("No checkpoint state exists")
+        with self._lock:
+            state = self.load()
+            if state is None:
+                raise ValueError("No checkpoint state exists")
 
-        state.current_feature = feature
-        state.session_id = session_id
-        state.failed_feature = None
-        state.error_message = None
-        self.save(state)
+            state.current_feature = feature
+            state.session_id = session_id
+            state.failed_feature = None
+            state.error_message = None
+            self._commit(state)
 
     def mark_feature_completed(self, feature: str, session_id: str) -> None:
         """Mark a feature as successfully completed.
@@ -186,17 +320,18 @@ class CheckpointManager:
             feature: Feature name that completed
             session_id: Session ID to save for potential resume
         """
-        state = self.load()
-        if state is None:
-            raise ValueError("No checkpoint state exists")
-
-        if feature not in state.completed_features:
-            state.completed_features.append(feature)
-        state.current_feature = None
-        state.session_id = session_id
-        state.failed_feature = None
-        state.error_message = None
-        self.save(state)
+        with self._lock:
+            state = self.load()
+            if state is None:
+                raise ValueError("No checkpoint state exists")
+
+            if feature not in state.completed_features:
+                state.completed_features.append(feature)
+            state.current_feature = None
+            state.session_id = session_id
+            state.failed_feature = None
+            state.error_message = None
+            self._commit(state)
 
     def mark_feature_failed(self, feature: str, error: str, session_id: str) -> None:
         """Mark a feature as failed.
@@ -206,15 +341,16 @@ class CheckpointManager:
             error: Error message
             session_id: Session ID for potential resume attempt
         """
-        state = self.load()
-        if state is None:
-            raise ValueError("No checkpoint state exists")
-
-        state.current_feature = None
-        state.failed_feature = feature
-        state.error_message = error
-        state.session_id = session_id
-        self.save(state)
+        with self._lock:
+            state = self.load()
+            if state is None:
+                raise ValueError("No checkpoint state exists")
+
+            state.current_feature = None
+            state.failed_feature = feature
+            state.error_message = error
+            state.session_id = session_id
+            self._commit(state)
 
     def get_resume_info(self) -> tuple[str, list[str], str | None]:
         """Get information needed to resume a migration.
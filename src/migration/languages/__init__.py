@@ -1,15 +1,21 @@
 """Language target definitions for the migration framework."""
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from .base import LanguageTarget
 from .go import GoTarget
 from .java import JavaTarget
 from .rust import RustTarget
 
-LANGUAGE_REGISTRY: dict[str, type[LanguageTarget]] = {
-    "rust": RustTarget,
-    "java": JavaTarget,
-    "go": GoTarget,
-}
+# Read-only and alphabetical so listings and error messages are deterministic
+LANGUAGE_REGISTRY: Mapping[str, type[LanguageTarget]] = MappingProxyType(
+    {
+        "go": GoTarget,
+        "java": JavaTarget,
+        "rust": RustTarget,
+    }
+)
 
 
 def get_language_target(name: str) -> LanguageTarget:
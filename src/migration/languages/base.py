@@ -1,15 +1,50 @@
 """Abstract base class for target language configuration."""
 
+import re
 from abc import ABC, abstractmethod
 
+# Common patterns: "92.5% coverage", "Coverage: 92.5%", "92.5% of statements",
+# "line: 92.5%", combined so output is scanned once
+_COVERAGE_RE = re.compile(
+    r"(\d+\.?\d*)%\s*coverage"
+    r"|coverage[:\s]+(\d+\.?\d*)%"
+    r"|(\d+\.?\d*)%\s*of\s*statements"
+    r"|line[:\s]+(\d+\.?\d*)%",
+    re.IGNORECASE,
+)
+
 
 class LanguageTarget(ABC):
     """Abstract base class for target language configuration.
 
     Each target language (Rust, Java, etc.) implements this interface
     to provide language-specific configuration for the migration framework.
+
+    Project-specific strings (output subdirectory, source directory, coverage
+    command) are built by the ``_build_*`` hooks. Calling ``configure`` once a
+    migration's project name and directory are known precomputes them, so the
+    public getters return cached strings for those arguments.
     """
 
+    _project_name: str | None = None
+    _project_dir: str | None = None
+    _project_subdir: str = ""
+    _source_dir: str = ""
+    _coverage_command: str = ""
+
+    def configure(self, project_name: str, project_dir: str) -> None:
+        """Precompute project-specific strings for a migration run.
+
+        Args:
+            project_name: The project name from config (e.g., 'rpn2tex')
+            project_dir: Absolute path to the project directory
+        """
+        self._project_subdir = self._build_project_subdir(project_name)
+        self._source_dir = self._build_source_dir(project_dir)
+        self._coverage_command = self._build_coverage_command(project_dir)
+        self._project_name = project_name
+        self._project_dir = project_dir
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -22,7 +57,6 @@ class LanguageTarget(ABC):
         """File extension including dot (e.g., '.rs', '.java')."""
         pass
 
-    @abstractmethod
     def get_project_subdir(self, project_name: str) -> str:
         """Return the output subdirectory for this language.
 
@@ -32,6 +66,13 @@ class LanguageTarget(ABC):
         Returns:
             Subdirectory name (e.g., 'rpn2tex-rs', 'rpn2tex-java')
         """
+        if project_name == self._project_name:
+            return self._project_subdir
+        return self._build_project_subdir(project_name)
+
+    @abstractmethod
+    def _build_project_subdir(self, project_name: str) -> str:
+        """Build the output subdirectory name for ``project_name``."""
         pass
 
     @abstractmethod
@@ -90,7 +131,6 @@ class LanguageTarget(ABC):
         """
         pass
 
-    @abstractmethod
     def get_source_dir(self, project_dir: str) -> str:
         """Return the source code directory within the project.
 
@@ -100,9 +140,15 @@ class LanguageTarget(ABC):
         Returns:
             Path to source directory (e.g., 'src' for Rust, 'src/main/java/...' for Java)
         """
-        pass
+        if project_dir == self._project_dir:
+            return self._source_dir
+        return self._build_source_dir(project_dir)
 
     @abstractmethod
+    def _build_source_dir(self, project_dir: str) -> str:
+        """Build the source directory path for ``project_dir``."""
+        pass
+
     def get_coverage_command(self, project_dir: str) -> str:
         """Return shell command to measure test coverage.
 
@@ -115,6 +161,13 @@ class LanguageTarget(ABC):
         Returns:
             Shell command string, or empty string if coverage not supported
         """
+        if project_dir == self._project_dir:
+            return self._coverage_command
+        return self._build_coverage_command(project_dir)
+
+    @abstractmethod
+    def _build_coverage_command(self, project_dir: str) -> str:
+        """Build the coverage shell command for ``project_dir``."""
         pass
 
     def parse_coverage_output(self, output: str) -> float | None:
@@ -129,17 +182,7 @@ class LanguageTarget(ABC):
         Returns:
             Coverage percentage (0-100) or None if not parseable
         """
-        import re
-
-        # Common patterns: "92.5% coverage", "Coverage: 92.5%", "92.5%"
-        patterns = [
-            r"(\d+\.?\d*)%\s*coverage",
-            r"coverage[:\s]+(\d+\.?\d*)%",
-            r"(\d+\.?\d*)%\s*of\s*statements",
-            r"line[:\s]+(\d+\.?\d*)%",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, output, re.IGNORECASE)
-            if match:
-                return float(match.group(1))
+        match = _COVERAGE_RE.search(output)
+        if match:
+            return float(next(g for g in match.groups() if g))
         return None
@@ -1,7 +1,12 @@
 """Go target language configuration."""
 
+import re
+
 from .base import LanguageTarget
 
+# Go test -cover output: "coverage: 92.5% of statements"
+_GO_COVERAGE_RE = re.compile(r"coverage:\s*([\d.]+)%\s*of\s*statements")
+
 
 class GoTarget(LanguageTarget):
     """Go-specific configuration for the migration framework."""
@@ -14,7 +19,7 @@ class GoTarget(LanguageTarget):
     def file_extension(self) -> str:
         return ".go"
 
-    def get_project_subdir(self, project_name: str) -> str:
+    def _build_project_subdir(self, project_name: str) -> str:
         return f"{project_name}-go"
 
     def get_quality_gates(self) -> list[str]:
@@ -111,21 +116,18 @@ Apply these patterns for idiomatic Go:
             f"mkdir -p {project_dir}/cmd/rpn2tex",
         ]
 
-    def get_source_dir(self, project_dir: str) -> str:
+    def _build_source_dir(self, project_dir: str) -> str:
         return project_dir  # Go uses root directory for package
 
-    def get_coverage_command(self, project_dir: str) -> str:
+    def _build_coverage_command(self, project_dir: str) -> str:
         # Go has built-in coverage support
         return f"cd {project_dir} && go test -cover ./... 2>&1"
 
     def parse_coverage_output(self, output: str) -> float | None:
-        import re
-
-        # Go test -cover output: "coverage: 92.5% of statements"
-        # May have multiple packages, we want the overall or average
-        matches = re.findall(r"coverage:\s*([\d.]+)%\s*of\s*statements", output)
-        if matches:
-            # Return the average if multiple packages
-            coverages = [float(m) for m in matches]
-            return sum(coverages) / len(coverages)
-        return None
+        # May have multiple packages; return the average in a single pass
+        total = 0.0
+        count = 0
+        for match in _GO_COVERAGE_RE.finditer(output):
+            total += float(match.group(1))
+            count += 1
+        return total / count if count else None
@@ -1,7 +1,12 @@
 """Java target language configuration."""
 
+import re
+
 from .base import LanguageTarget
 
+# JaCoCo HTML report: the first percentage, e.g. "95%"
+_JACOCO_PERCENT_RE = re.compile(r"(\d+)%")
+
 
 class JavaTarget(LanguageTarget):
     """Java-specific configuration for the migration framework (Gradle build)."""
@@ -14,7 +19,7 @@ class JavaTarget(LanguageTarget):
     def file_extension(self) -> str:
         return ".java"
 
-    def get_project_subdir(self, project_name: str) -> str:
+    def _build_project_subdir(self, project_name: str) -> str:
         return f"{project_name}-java"
 
     def get_quality_gates(self) -> list[str]:
@@ -121,18 +126,15 @@ Apply these patterns for modern, idiomatic Java (17+):
             f"cd {project_dir} && gradle init --type java-application --dsl kotlin --test-framework junit-jupiter --project-name rpn2tex --package com.rpn2tex",
         ]
 
-    def get_source_dir(self, project_dir: str) -> str:
+    def _build_source_dir(self, project_dir: str) -> str:
         return f"{project_dir}/src/main/java/com/rpn2tex"
 
-    def get_coverage_command(self, project_dir: str) -> str:
+    def _build_coverage_command(self, project_dir: str) -> str:
         # Use JaCoCo via Gradle - requires jacoco plugin configured
         return f"cd {project_dir} && ./gradlew test jacocoTestReport 2>/dev/null && grep -o '[0-9]*%' build/reports/jacoco/test/html/index.html 2>/dev/null | head -1 || echo 'coverage not available'"
 
     def parse_coverage_output(self, output: str) -> float | None:
-        import re
-
-        # JaCoCo HTML output contains percentage like "95%"
-        match = re.search(r"(\d+)%", output)
+        match = _JACOCO_PERCENT_RE.search(output)
         if match:
             return float(match.group(1))
         return None
@@ -1,7 +1,17 @@
 """Rust target language configuration."""
 
+import re
+
 from .base import LanguageTarget
 
+# Coverage summaries, tried in order:
+#   cargo-llvm-cov: "TOTAL  <counts>  <pct>%  ..." -- first (region) percentage
+#   tarpaulin:      "XX.XX% coverage"
+_RUST_COVERAGE_RES = (
+    re.compile(r"TOTAL\s+\d+\s+\d+\s+([\d.]+)%"),
+    re.compile(r"(\d+\.?\d*)%\s*coverage"),
+)
+
 
 class RustTarget(LanguageTarget):
     """Rust-specific configuration for the migration framework."""
@@ -14,7 +24,7 @@ class RustTarget(LanguageTarget):
     def file_extension(self) -> str:
         return ".rs"
 
-    def get_project_subdir(self, project_name: str) -> str:
+    def _build_project_subdir(self, project_name: str) -> str:
         return f"{project_name}-rs"
 
     def get_quality_gates(self) -> list[str]:
@@ -96,10 +106,10 @@ Apply these patterns to pass clippy on first attempt:
             f"cd {project_dir} && cargo init --name rpn2tex",
         ]
 
-    def get_source_dir(self, project_dir: str) -> str:
+    def _build_source_dir(self, project_dir: str) -> str:
         return f"{project_dir}/src"
 
-    def get_coverage_command(self, project_dir: str) -> str:
+    def _build_coverage_command(self, project_dir: str) -> str:
         # Use cargo-llvm-cov with explicit paths to llvm tools
         # Falls back to tarpaulin if llvm-cov unavailable
         return f"""cd {project_dir} && (
@@ -111,17 +121,8 @@ Apply these patterns to pass clippy on first attempt:
         )"""
 
     def parse_coverage_output(self, output: str) -> float | None:
-        import re
-
-        # cargo-llvm-cov text format: "TOTAL  <counts>  <pct>%  <counts>  <pct>%  <counts>  <pct>%"
-        # We want the first percentage (Region coverage)
-        # tarpaulin format: "XX.XX% coverage"
-        patterns = [
-            r"TOTAL\s+\d+\s+\d+\s+([\d.]+)%",  # llvm-cov (first percentage after counts)
-            r"(\d+\.?\d*)%\s*coverage",  # tarpaulin
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, output)
+        for pattern in _RUST_COVERAGE_RES:
+            match = pattern.search(output)
             if match:
                 return float(match.group(1))
         return None
@@ -4,11 +4,27 @@ This module runs external tools like lizard, cloc, and cargo
 to capture code metrics that aren't available during migration.
 """
 
+import functools
+import hashlib
 import json
+import math
+import os
+import pickle
 import re
 import subprocess
+import sys
+import tempfile
+import threading
+from collections.abc import Callable, Container, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
 
 from .schema import (
     CodeMetrics,
@@ -20,6 +36,524 @@ from .schema import (
     TestOutcomeResult,
 )
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+try:
+    import lizard
+
+    _HAS_LIZARD = True
+except ImportError:
+    _HAS_LIZARD = False
+
+try:
+    from radon.metrics import mi_visit
+
+    _HAS_RADON = True
+except ImportError:
+    _HAS_RADON = False
+
+
+def _loads(data: str | bytes) -> Any:
+    """Parse JSON with orjson when installed, falling back to the stdlib.
+
+    orjson's decode error subclasses ``json.JSONDecodeError``, so callers
+    catch the same exception either way.
+    """
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Shared pool for the independent metric collectors inside analyze_* calls,
+# created on first use and reused across calls in a batch run
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared metric-collection thread pool, creating it lazily."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="posthoc-analyzer"
+            )
+        return _executor
+
+
+# rustc diagnostic codes for hard errors (lints carry their lint name instead)
+_RUSTC_ERROR_CODE_RE = re.compile(r"E\d{4}")
+
+# rustc's closing tallies ("aborting due to 2 previous errors", "1 warning
+# emitted") are code-less diagnostics that repeat the real ones
+_RUSTC_SUMMARY_RE = re.compile(r"aborting due to |.*emitted$")
+
+# Test runner summaries, matched against raw subprocess output bytes
+_GRADLE_TEST_RE = re.compile(rb"(\d+) tests completed, (\d+) failed")
+_GO_PASS_RE = re.compile(rb"--- PASS:")
+_GO_FAIL_RE = re.compile(rb"--- FAIL:")
+_GO_SKIP_RE = re.compile(rb"--- SKIP:")
+_GO_TOTAL_RE = re.compile(rb"total:\s+\(statements\)\s+(\d+\.\d+)%")
+_CARGO_PASSFAIL_RE = re.compile(rb"(\d+) passed.*?(\d+) failed")
+_CARGO_IGNORED_RE = re.compile(rb"(\d+) ignored")
+# cargo's stderr when a subcommand such as llvm-cov is not installed
+_CARGO_NO_SUCH_COMMAND = b"no such command"
+
+# Java build file dependency declarations
+_GRADLE_DEP_RE = re.compile(r"(implementation|api|compile|testImplementation)\s*['\"]")
+
+# go.mod: a "path version" module line inside a require ( ... ) block
+_GO_MODULE_LINE_RE = re.compile(r"\s*[\w./~-]+\s+v\S+")
+
+# CCN and file columns of a lizard --csv function row
+# (NLOC,CCN,token,PARAM,length,location,file,...); a header row does not match
+_LIZARD_CSV_ROW_RE = re.compile(
+    rb'^\d+,(\d+),\d+,\d+,\d+,"[^"]*","([^"]*)"', re.MULTILINE
+)
+
+# Source suffix per lizard language name, used to split a multi-language run
+_LIZARD_SUFFIXES = {"python": ".py", "rust": ".rs", "java": ".java", "go": ".go"}
+
+# Directory lizard scans for each analyze_* method, relative to its path
+_LIZARD_SUBDIRS: dict[str, tuple[str, ...]] = {
+    "python": (),
+    "rust": ("src",),
+    "java": ("src", "main", "java"),
+    "go": (),
+}
+
+# A line of code: not blank and not a // comment (leading whitespace allowed)
+_NONBLANK_NONCOMMENT_RE = re.compile(rb"(?m)^[ \t\r\f\v]*(?!//)\S.*$")
+_CFG_TEST_MARKER = b"#[cfg(test)]"
+
+# Comment syntax per cloc language name: (line prefixes, block delimiters).
+# Python docstrings count as comments, as they do in cloc.
+_COMMENT_SYNTAX: dict[str, tuple[tuple[str, ...], tuple[tuple[str, str], ...]]] = {
+    "Python": (("#",), (('"""', '"""'), ("'''", "'''"))),
+    "Rust": (("//",), (("/*", "*/"),)),
+    "Java": (("//",), (("/*", "*/"),)),
+    "Go": (("//",), (("/*", "*/"),)),
+}
+_SOURCE_SUFFIXES = {"Python": ".py", "Rust": ".rs", "Java": ".java", "Go": ".go"}
+
+
+def _count_file_loc(path: Path, language: str) -> dict[str, int]:
+    """Classify each line of a source file as code, comment or blank.
+
+    Approximates cloc for the languages in ``_COMMENT_SYNTAX``: a line is a
+    comment if it starts with a line comment or lies inside a block comment
+    opened at the start of a line.
+
+    Returns:
+        Dict with "code", "comment" and "blank" counts
+    """
+    counts = {"code": 0, "comment": 0, "blank": 0}
+    try:
+        content = path.read_text(errors="replace")
+    except OSError:
+        return counts
+
+    line_prefixes, blocks = _COMMENT_SYNTAX[language]
+    block_end: str | None = None
+    for line in content.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            counts["blank"] += 1
+        elif block_end is not None:
+            counts["comment"] += 1
+            if block_end in stripped:
+                block_end = None
+        elif stripped.startswith(line_prefixes):
+            counts["comment"] += 1
+        else:
+            for start, end in blocks:
+                if stripped.startswith(start):
+                    counts["comment"] += 1
+                    if end not in stripped[len(start) :]:
+                        block_end = end
+                    break
+            else:
+                counts["code"] += 1
+    return counts
+
+
+def _count_loc_inproc(files: Iterable[Path], language: str) -> dict[str, int]:
+    """Sum code, comment and blank lines over files without running cloc."""
+    totals = {"code": 0, "comment": 0, "blank": 0}
+    for file in files:
+        for key, value in _count_file_loc(file, language).items():
+            totals[key] += value
+    return totals
+
+
+def _walk_files(
+    root: str | os.PathLike[str],
+    suffix: str,
+    recursive: bool = True,
+    prune: Container[str] = (),
+) -> Iterator[os.DirEntry[str]]:
+    """Yield directory entries of files ending in suffix under root.
+
+    Walks with os.scandir, so no Path object is built per entry and the
+    entry's cached stat data can be reused. Symlinked directories are not
+    followed, matching Path.rglob, and directories whose path is in prune
+    are not entered at all.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.path not in prune:
+                        yield from _walk_files(entry.path, suffix, prune=prune)
+                elif entry.name.endswith(suffix) and entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
+
+def _count_and_partition(
+    root: Path,
+    suffix: str,
+    is_test: Callable[[str], bool] | None = None,
+    recursive: bool = True,
+) -> tuple[int, int]:
+    """Count files ending in suffix under root without materializing them.
+
+    Returns:
+        Tuple of (file_count, test_file_count); test files are those whose
+        path satisfies ``is_test``, and none are counted without it
+    """
+    count = 0
+    test_count = 0
+    for entry in _walk_files(root, suffix, recursive):
+        count += 1
+        if is_test is not None and is_test(entry.path):
+            test_count += 1
+    return count, test_count
+
+
+def _source_files(paths: Iterable[Path], language: str) -> list[Path]:
+    """Expand files and directories into the source files of a language."""
+    suffix = _SOURCE_SUFFIXES[language]
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(Path(entry.path) for entry in _walk_files(path, suffix))
+        elif path.suffix == suffix:
+            files.append(path)
+    return files
+
+
+def _use_cloc() -> bool:
+    """Return True if USE_CLOC=1 asks for cloc instead of the built-in counter."""
+    return os.environ.get("USE_CLOC") == "1"
+
+
+# Files whose content determines each analysis result, relative to its path:
+# "**/*<suffix>" matches anywhere in the tree, other names are single files.
+# _count_python_deps falls back to the parent's dependency files.
+_PYTHON_INPUTS = (
+    "**/*.py",
+    "requirements.txt",
+    "pyproject.toml",
+    "../requirements.txt",
+    "../pyproject.toml",
+)
+_RUST_INPUTS = ("**/*.rs", "Cargo.toml", "Cargo.lock")
+_JAVA_INPUTS = ("**/*.java", "build.gradle", "build.gradle.kts", "pom.xml")
+_GO_INPUTS = ("**/*.go", "go.mod", "go.sum")
+
+# Top-level directories of each tree that hold build output, not sources.
+# Only these exact paths are skipped, so a source package that happens to be
+# named build/ or target/ deeper in the tree is still fingerprinted.
+_DEFAULT_BUILD_DIRS = (".git",)
+_RUST_BUILD_DIRS = ("target", ".git")
+_JAVA_BUILD_DIRS = ("build", "target", ".git")
+
+
+_AnalyzerT = TypeVar("_AnalyzerT", bound="PostHocAnalyzer")
+_ResultT = TypeVar("_ResultT", CodeMetrics, QualityGates)
+
+
+def _fingerprint(
+    kind: str,
+    root: Path,
+    patterns: tuple[str, ...],
+    build_dirs: tuple[str, ...] = _DEFAULT_BUILD_DIRS,
+) -> str:
+    """Hash an analysis kind, its root and the (path, size, mtime) of its inputs.
+
+    The digest only keys a local cache, so stat data stands in for content.
+    Files that cannot be stat'ed, such as dangling symlinks, are left out.
+    The build_dirs directly under root are not walked.
+    """
+    # Joined like os.scandir joins entry.path, so "." roots still match
+    prune = frozenset(os.path.join(root, name) for name in build_dirs)  # noqa: PTH118
+    entries: set[tuple[str, int, int]] = set()
+    for pattern in patterns:
+        if pattern.startswith("**/*"):
+            for entry in _walk_files(root, pattern[4:], prune=prune):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                rel = Path(entry.path).relative_to(root).as_posix()
+                entries.add((rel, stat.st_size, stat.st_mtime_ns))
+        else:
+            try:
+                stat = (root / pattern).stat()
+            except OSError:
+                continue
+            entries.add((pattern, stat.st_size, stat.st_mtime_ns))
+
+    digest = hashlib.sha256(f"{kind}\0{root.resolve()}".encode())
+    for rel_path, size, mtime_ns in sorted(entries):
+        digest.update(f"\0{rel_path}\0{size}\0{mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _cached_analysis(
+    patterns: tuple[str, ...],
+    decode: Callable[[dict[str, Any]], _ResultT],
+    build_dirs: tuple[str, ...] = _DEFAULT_BUILD_DIRS,
+) -> Callable[
+    [Callable[[_AnalyzerT, Path], _ResultT]], Callable[[_AnalyzerT, Path], _ResultT]
+]:
+    """Cache an analyze_* result on disk, keyed by a fingerprint of its inputs.
+
+    Caching is active only when the analyzer has a ``cache_dir``.
+    """
+
+    def decorator(
+        method: Callable[[_AnalyzerT, Path], _ResultT],
+    ) -> Callable[[_AnalyzerT, Path], _ResultT]:
+        @functools.wraps(method)
+        def wrapper(self: _AnalyzerT, path: Path) -> _ResultT:
+            if self.cache_dir is None:
+                return method(self, path)
+
+            key = _fingerprint(method.__name__, path, patterns, build_dirs)
+            cache_file = self.cache_dir / f"{key}.json"
+            if cache_file.exists():
+                return decode(_loads(cache_file.read_bytes()))
+
+            result = method(self, path)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(asdict(result)))
+            self._file_cache.save()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+_FileResultT = TypeVar("_FileResultT")
+
+# Pickled per-file results, stored alongside the analysis cache
+_FILE_CACHE_NAME = "files.pickle"
+
+
+class _FileCache:
+    """Per-file results that survive until the file's mtime or size changes.
+
+    Entries are keyed by (kind, path), so one stale file is recomputed
+    without invalidating the rest. With a ``path``, the cache is loaded
+    from and saved to a pickle file for reuse across runs.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._entries: dict[tuple[str, Path], tuple[int, int, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            try:
+                # Written only by this class into the user's own cache_dir
+                self._entries = pickle.loads(path.read_bytes())  # noqa: S301
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self._entries = {}
+
+    def get(
+        self,
+        kind: str,
+        file: Path,
+        compute: Callable[[Path], _FileResultT],
+        stat: os.stat_result | None = None,
+    ) -> _FileResultT:
+        """Return the cached result for file, computing it if the file changed.
+
+        Args:
+            kind: Name of the per-file computation, part of the cache key
+            file: File the result is derived from
+            compute: Function producing the result from the file
+            stat: The file's stat result, if the caller already has it
+
+        Raises:
+            OSError: If the file cannot be stat'ed
+        """
+        if stat is None:
+            stat = file.stat()
+        key = (kind, file)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            result: _FileResultT = cached[2]
+            return result
+
+        result = compute(file)
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, result)
+            self._dirty = True
+        return result
+
+    def save(self) -> None:
+        """Write the cache to its pickle file if anything changed."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = pickle.dumps(self._entries)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix(".tmp")
+        tmp_file.write_bytes(payload)
+        tmp_file.replace(self.path)
+
+
+def _count_rust_file_loc(path: Path) -> tuple[int, int]:
+    """Count production and inline-test LOC in one Rust file.
+
+    Returns:
+        Tuple of (production_loc, inline_test_loc)
+    """
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return 0, 0
+
+    # The line holding #[cfg(test)] and everything after it is test code
+    marker = content.find(_CFG_TEST_MARKER)
+    split = len(content) if marker == -1 else content.rfind(b"\n", 0, marker) + 1
+
+    prod_lines = len(_NONBLANK_NONCOMMENT_RE.findall(content, 0, split))
+    test_lines = len(_NONBLANK_NONCOMMENT_RE.findall(content, split))
+    return prod_lines, test_lines
+
+
+def _parse_cargo_deps(cargo_toml: Path) -> int:
+    """Return the number of [dependencies] entries in a Cargo.toml."""
+    try:
+        with cargo_toml.open("rb") as f:
+            manifest = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return 0
+    return len(manifest.get("dependencies", {}))
+
+
+def _radon_file_mi(path: Path) -> float | None:
+    """Return radon's Maintainability Index for one Python file, if parseable."""
+    try:
+        return float(mi_visit(path.read_text(), multi=True))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+
+def _summarize_cc(functions: list[int]) -> dict[str, Any] | None:
+    """Summarize per-function cyclomatic complexity, or None if empty."""
+    if not functions:
+        return None
+    return {
+        "function_count": len(functions),
+        "avg_cc": sum(functions) / len(functions),
+        "max_cc": max(functions),
+    }
+
+
+def _is_private_module(filename: str) -> bool:
+    """Return True for Python modules whose name starts with an underscore."""
+    return filename.rpartition(os.sep)[2].startswith("_")
+
+
+def _is_java_test(filename: str, root: Path) -> bool:
+    """Return True for Java files under the project's own src/test tree.
+
+    The path is classified relative to root, so a src/test directory above
+    the project does not turn every file into test code.
+    """
+    try:
+        return Path(filename).relative_to(root).parts[:2] == ("src", "test")
+    except ValueError:
+        return False
+
+
+def _is_go_test(filename: str) -> bool:
+    """Return True for Go test files."""
+    return filename.endswith("_test.go")
+
+
+class _JsonLineStream:
+    """Run a command and yield its JSON output objects as they are printed.
+
+    Output is parsed line by line while the command runs instead of being
+    buffered in full. stderr is merged into stdout so neither pipe can fill
+    and stall the child; lines that are not JSON objects are kept, undecoded,
+    in ``text_lines``. A watchdog timer kills the command after ``timeout``
+    seconds, which surfaces as ``subprocess.TimeoutExpired``.
+    """
+
+    def __init__(
+        self, cmd: list[str], cwd: Path, env: dict[str, str], timeout: float
+    ) -> None:
+        self.cmd = cmd
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.returncode: int | None = None
+        self.text_lines: list[bytes] = []
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        with subprocess.Popen(
+            self.cmd,
+            cwd=self.cwd,
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        ) as proc:
+            timed_out = threading.Event()
+
+            def kill() -> None:
+                timed_out.set()
+                proc.kill()
+
+            watchdog = threading.Timer(self.timeout, kill)
+            watchdog.start()
+            try:
+                for line in proc.stdout or ():
+                    if line.startswith(b"{"):
+                        try:
+                            msg = _loads(line)
+                        except json.JSONDecodeError:
+                            pass
+                        else:
+                            yield msg
+                            continue
+                    self.text_lines.append(line)
+                self.returncode = proc.wait()
+            finally:
+                watchdog.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(self.cmd, self.timeout)
+
 
 class PostHocAnalyzer:
     """Analyzes migrated code using external tools.
@@ -30,14 +564,62 @@ class PostHocAnalyzer:
         source_metrics = analyzer.analyze_python_source(Path("source/"))
         target_metrics = analyzer.analyze_rust_target(Path("migrations/rust/"))
         quality = analyzer.analyze_rust_quality(Path("migrations/rust/"))
+
+    With a ``cache_dir``, each analyze_* result is stored on disk under a
+    hash of the analyzed files' paths, sizes and modification times, and
+    returned from there while those files are unchanged.
     """
 
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Initialize the analyzer.
+
+        Args:
+            cache_dir: Directory for cached analysis results and per-file
+                results, or None to always run the tools (per-file results
+                are then kept in memory only)
+        """
+        self.cache_dir = cache_dir
+        self._file_cache = _FileCache(
+            cache_dir / _FILE_CACHE_NAME if cache_dir is not None else None
+        )
+        self._prefetched_complexity: dict[tuple[str, Path], dict[str, Any] | None] = {}
+
+    def prefetch_complexity(self, paths_by_lang: dict[str, Path]) -> None:
+        """Run lizard once for several analyze_* calls made later.
+
+        Args:
+            paths_by_lang: Lizard language name (e.g., "python", "rust")
+                mapped to the path that will be passed to the matching
+                analyze_* method
+        """
+        roots = {
+            language: path.joinpath(*_LIZARD_SUBDIRS[language])
+            for language, path in paths_by_lang.items()
+        }
+        results = self._run_lizard_multi(roots)
+        for language, root in roots.items():
+            self._prefetched_complexity[(language, root)] = results.get(language)
+
+    @_cached_analysis(_PYTHON_INPUTS, CodeMetrics.from_dict)
     def analyze_python_source(self, source_path: Path) -> CodeMetrics:
         """Analyze Python source code complexity and size."""
         metrics = CodeMetrics()
+        executor = _get_executor()
+
+        # LOC counting, lizard, radon and the dependency scan are independent
+        loc_future = executor.submit(self._count_loc, source_path, "Python")
+        complexity_future = executor.submit(self._run_lizard, source_path, "python")
+        mi_future = executor.submit(self._run_radon_mi, source_path)
+        deps_future = executor.submit(self._count_python_deps, source_path)
+
+        # Count modules
+        py_count, private_count = _count_and_partition(
+            source_path, ".py", _is_private_module, recursive=False
+        )
+        metrics.module_count = py_count - private_count
 
-        # Count LOC with cloc
-        loc_data = self._run_cloc(source_path, "Python")
+        # Count LOC
+        loc_data = loc_future.result()
         if loc_data:
             metrics.production_loc = loc_data.get("code", 0)
             metrics.total_loc = (
@@ -47,24 +629,21 @@ class PostHocAnalyzer:
             )
 
         # Analyze complexity with lizard
-        complexity_data = self._run_lizard(source_path, "python")
+        complexity_data = complexity_future.result()
         if complexity_data:
             metrics.function_count = complexity_data.get("function_count", 0)
             metrics.avg_cyclomatic_complexity = complexity_data.get("avg_cc", 0.0)
             metrics.max_cyclomatic_complexity = complexity_data.get("max_cc", 0)
 
-        # Count modules
-        py_files = list(source_path.glob("*.py"))
-        metrics.module_count = len([f for f in py_files if not f.name.startswith("_")])
-
         # Calculate Maintainability Index with radon
-        metrics.maintainability_index = self._run_radon_mi(source_path)
+        metrics.maintainability_index = mi_future.result()
 
         # Count external dependencies
-        metrics.external_dependencies = self._count_python_deps(source_path)
+        metrics.external_dependencies = deps_future.result()
 
         return metrics
 
+    @_cached_analysis(_RUST_INPUTS, CodeMetrics.from_dict, _RUST_BUILD_DIRS)
     def analyze_rust_target(self, target_path: Path) -> CodeMetrics:
         """Analyze Rust target code complexity and size."""
         metrics = CodeMetrics()
@@ -73,15 +652,34 @@ class PostHocAnalyzer:
         if not src_path.exists():
             return metrics
 
+        executor = _get_executor()
+        tests_path = target_path / "tests"
+        cargo_toml = target_path / "Cargo.toml"
+
+        loc_future = executor.submit(self._count_rust_loc_with_inline_tests, src_path)
+        test_loc_future = (
+            executor.submit(self._count_loc, tests_path, "Rust")
+            if tests_path.exists()
+            else None
+        )
+        complexity_future = executor.submit(self._run_lizard, src_path, "rust")
+        deps_future = (
+            executor.submit(self._count_cargo_deps, cargo_toml)
+            if cargo_toml.exists()
+            else None
+        )
+
+        # Count modules (*.rs files)
+        metrics.module_count, _ = _count_and_partition(src_path, ".rs", recursive=False)
+
         # Count LOC separating production from inline #[cfg(test)] code
-        prod_loc, inline_test_loc = self._count_rust_loc_with_inline_tests(src_path)
+        prod_loc, inline_test_loc = loc_future.result()
         metrics.production_loc = prod_loc
         metrics.test_loc = inline_test_loc
 
         # Add tests/ directory LOC to test_loc
-        tests_path = target_path / "tests"
-        if tests_path.exists():
-            test_loc = self._run_cloc(tests_path, "Rust")
+        if test_loc_future is not None:
+            test_loc = test_loc_future.result()
             if test_loc:
                 metrics.test_loc += test_loc.get("code", 0)
 
@@ -89,20 +687,15 @@ class PostHocAnalyzer:
         metrics.total_loc = metrics.production_loc + metrics.test_loc
 
         # Analyze complexity with lizard
-        complexity_data = self._run_lizard(src_path, "rust")
+        complexity_data = complexity_future.result()
         if complexity_data:
             metrics.function_count = complexity_data.get("function_count", 0)
             metrics.avg_cyclomatic_complexity = complexity_data.get("avg_cc", 0.0)
             metrics.max_cyclomatic_complexity = complexity_data.get("max_cc", 0)
 
-        # Count modules (*.rs files)
-        rs_files = list(src_path.glob("*.rs"))
-        metrics.module_count = len(rs_files)
-
         # Count external dependencies from Cargo.toml
-        cargo_toml = target_path / "Cargo.toml"
-        if cargo_toml.exists():
-            metrics.external_dependencies = self._count_cargo_deps(cargo_toml)
+        if deps_future is not None:
+            metrics.external_dependencies = deps_future.result()
 
         # Calculate Maintainability Index from collected metrics
         metrics.maintainability_index = self._calculate_mi_from_metrics(
@@ -112,6 +705,7 @@ class PostHocAnalyzer:
 
         return metrics
 
+    @_cached_analysis(_JAVA_INPUTS, CodeMetrics.from_dict, _JAVA_BUILD_DIRS)
     def analyze_java_target(self, target_path: Path) -> CodeMetrics:
         """Analyze Java target code complexity and size."""
         metrics = CodeMetrics()
@@ -120,36 +714,39 @@ class PostHocAnalyzer:
         if not src_path.exists():
             return metrics
 
-        # Count LOC with cloc
-        loc_data = self._run_cloc(src_path, "Java")
-        if loc_data:
-            metrics.production_loc = loc_data.get("code", 0)
+        executor = _get_executor()
+
+        # One LOC pass over src/ covers both src/main/java and src/test/java
+        loc_future = executor.submit(
+            self._count_loc_by_file, [target_path / "src"], "Java"
+        )
+        complexity_future = executor.submit(self._run_lizard, src_path, "java")
+        deps_future = executor.submit(self._count_java_deps, target_path)
+
+        # Count Java files
+        metrics.module_count, _ = _count_and_partition(src_path, ".java")
+
+        # Count LOC, split into production and test
+        loc_by_file = loc_future.result()
+        if loc_by_file:
+            prod_loc, test_loc = self._split_loc_by_file(
+                loc_by_file, functools.partial(_is_java_test, root=target_path)
+            )
+            metrics.production_loc = prod_loc["code"]
             metrics.total_loc = (
-                loc_data.get("code", 0)
-                + loc_data.get("comment", 0)
-                + loc_data.get("blank", 0)
+                prod_loc["code"] + prod_loc["comment"] + prod_loc["blank"]
             )
-
-        # Check for test directory
-        test_path = target_path / "src" / "test" / "java"
-        if test_path.exists():
-            test_loc = self._run_cloc(test_path, "Java")
-            if test_loc:
-                metrics.test_loc = test_loc.get("code", 0)
+            metrics.test_loc = test_loc["code"]
 
         # Analyze complexity with lizard
-        complexity_data = self._run_lizard(src_path, "java")
+        complexity_data = complexity_future.result()
         if complexity_data:
             metrics.function_count = complexity_data.get("function_count", 0)
             metrics.avg_cyclomatic_complexity = complexity_data.get("avg_cc", 0.0)
             metrics.max_cyclomatic_complexity = complexity_data.get("max_cc", 0)
 
-        # Count Java files
-        java_files = list(src_path.rglob("*.java"))
-        metrics.module_count = len(java_files)
-
         # Count external dependencies from build.gradle or pom.xml
-        metrics.external_dependencies = self._count_java_deps(target_path)
+        metrics.external_dependencies = deps_future.result()
 
         # Calculate Maintainability Index from collected metrics
         metrics.maintainability_index = self._calculate_mi_from_metrics(
@@ -159,6 +756,7 @@ class PostHocAnalyzer:
 
         return metrics
 
+    @_cached_analysis(_GO_INPUTS, CodeMetrics.from_dict)
     def analyze_go_target(self, target_path: Path) -> CodeMetrics:
         """Analyze Go target code complexity and size.
 
@@ -169,46 +767,50 @@ class PostHocAnalyzer:
 
         # Go files are typically at root or in subdirectories
         # First check for go.mod to find module root
-        go_files = list(target_path.glob("*.go"))
+        # (the per-file LOC counter needs the paths themselves)
+        go_files = [
+            Path(entry.path)
+            for entry in _walk_files(target_path, ".go", recursive=False)
+        ]
         if not go_files:
             # Check for cmd/ or pkg/ structure
-            go_files = list(target_path.glob("**/*.go"))
+            go_files = [Path(entry.path) for entry in _walk_files(target_path, ".go")]
 
         if not go_files:
             return metrics
 
-        # Separate prod and test files
-        prod_files = [f for f in go_files if not f.name.endswith("_test.go")]
-        test_files = [f for f in go_files if f.name.endswith("_test.go")]
+        executor = _get_executor()
+        go_mod = target_path / "go.mod"
 
-        # Count LOC for production files
-        if prod_files:
-            loc_data = self._run_cloc_files(prod_files, "Go")
-            if loc_data:
-                metrics.production_loc = loc_data.get("code", 0)
+        # One LOC pass over all Go files, split by the _test.go suffix
+        loc_future = executor.submit(self._count_loc_by_file, go_files, "Go")
+        # Analyze complexity with lizard (use target_path for all Go files)
+        complexity_future = executor.submit(self._run_lizard, target_path, "go")
+        deps_future = (
+            executor.submit(self._count_go_deps, go_mod) if go_mod.exists() else None
+        )
 
-        # Count LOC for test files
-        if test_files:
-            test_loc = self._run_cloc_files(test_files, "Go")
-            if test_loc:
-                metrics.test_loc = test_loc.get("code", 0)
+        # Count LOC for production and test files
+        loc_by_file = loc_future.result()
+        if loc_by_file:
+            prod_loc, test_loc = self._split_loc_by_file(loc_by_file, _is_go_test)
+            metrics.production_loc = prod_loc["code"]
+            metrics.test_loc = test_loc["code"]
 
         metrics.total_loc = metrics.production_loc + metrics.test_loc
 
-        # Analyze complexity with lizard (use target_path for all Go files)
-        complexity_data = self._run_lizard(target_path, "go")
+        complexity_data = complexity_future.result()
         if complexity_data:
             metrics.function_count = complexity_data.get("function_count", 0)
             metrics.avg_cyclomatic_complexity = complexity_data.get("avg_cc", 0.0)
             metrics.max_cyclomatic_complexity = complexity_data.get("max_cc", 0)
 
         # Count modules (non-test .go files)
-        metrics.module_count = len(prod_files)
+        metrics.module_count = sum(1 for f in go_files if not _is_go_test(f.name))
 
         # Count external dependencies from go.mod
-        go_mod = target_path / "go.mod"
-        if go_mod.exists():
-            metrics.external_dependencies = self._count_go_deps(go_mod)
+        if deps_future is not None:
+            metrics.external_dependencies = deps_future.result()
 
         # Calculate Maintainability Index from collected metrics
         metrics.maintainability_index = self._calculate_mi_from_metrics(
@@ -218,29 +820,35 @@ class PostHocAnalyzer:
 
         return metrics
 
+    @_cached_analysis(_RUST_INPUTS, QualityGates.from_dict, _RUST_BUILD_DIRS)
     def analyze_rust_quality(self, target_path: Path) -> QualityGates:
-        """Run Rust quality gates and return results."""
-        quality = QualityGates()
-
-        # Check compilation
-        quality.compilation = self._check_cargo_check(target_path)
+        """Run Rust quality gates and return results.
 
-        # Check clippy
-        quality.linting = self._check_cargo_clippy(target_path)
+        The build chain runs in order in one shared target directory: clippy
+        (which also reports compile errors), then cargo test, then coverage,
+        each reusing the artifacts of the step before. Formatting needs no
+        build, so it runs alongside.
+        """
+        quality = QualityGates()
 
-        # Check formatting
-        quality.formatting = self._check_cargo_fmt(target_path)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            formatting = executor.submit(self._check_cargo_fmt, target_path)
 
-        # Run tests
-        quality.unit_tests = self._run_cargo_test(target_path)
+            quality.compilation, quality.linting = self._check_cargo_clippy(target_path)
+            quality.unit_tests = self._run_cargo_test(target_path)
+            quality.coverage = self._get_cargo_coverage(target_path)
 
-        # Get coverage if available
-        quality.coverage = self._get_cargo_coverage(target_path)
+            quality.formatting = formatting.result()
 
         return quality
 
+    @_cached_analysis(_JAVA_INPUTS, QualityGates.from_dict, _JAVA_BUILD_DIRS)
     def analyze_java_quality(self, target_path: Path) -> QualityGates:
-        """Run Java quality gates and return results."""
+        """Run Java quality gates and return results.
+
+        Steps run sequentially: Gradle holds a per-project lock, and the
+        JaCoCo report is only available after the test run.
+        """
         quality = QualityGates()
 
         # Check compilation and tests (gradle/maven)
@@ -256,18 +864,24 @@ class PostHocAnalyzer:
 
         return quality
 
+    @_cached_analysis(_GO_INPUTS, QualityGates.from_dict)
     def analyze_go_quality(self, target_path: Path) -> QualityGates:
-        """Run Go quality gates and return results."""
-        quality = QualityGates()
+        """Run Go quality gates and return results.
 
-        # Check compilation
-        quality.compilation.passed = self._check_go_build(target_path)
+        One ``go test -coverprofile`` run yields both test outcomes and the
+        coverage profile; the build check shares Go's concurrency-safe build
+        cache, so it runs alongside.
+        """
+        quality = QualityGates()
 
-        # Run tests
-        quality.unit_tests = self._run_go_test(target_path)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            build_passed = executor.submit(self._check_go_build, target_path)
+            test_run = executor.submit(self._run_go_test_with_cov, target_path)
 
-        # Get coverage
-        quality.coverage = self._get_go_coverage(target_path)
+            quality.unit_tests, profile = test_run.result()
+            if profile is not None:
+                quality.coverage = self._get_go_coverage(target_path, profile)
+            quality.compilation.passed = build_passed.result()
 
         return quality
 
@@ -278,7 +892,6 @@ class PostHocAnalyzer:
                 ["gradle", "classes"],
                 cwd=path,
                 capture_output=True,
-                text=True,
                 timeout=300,
             )
             return proc.returncode == 0
@@ -293,7 +906,6 @@ class PostHocAnalyzer:
                 ["gradle", "test"],
                 cwd=path,
                 capture_output=True,
-                text=True,
                 timeout=600,
             )
             result.passed = proc.returncode == 0
@@ -301,11 +913,7 @@ class PostHocAnalyzer:
             # Parse test results from reports if they exist
             # This is a bit complex as Gradle writes XML files.
             # Simplified fallback: parse stdout for "X tests completed, Y failed"
-            import re
-
-            match = re.search(
-                r"(\d+) tests completed, (\d+) failed", proc.stdout + proc.stderr
-            )
+            match = _GRADLE_TEST_RE.search(proc.stdout + proc.stderr)
             if match:
                 result.total = int(match.group(1))
                 result.failed_count = int(match.group(2))
@@ -322,24 +930,34 @@ class PostHocAnalyzer:
         )
         if jacoco_xml.exists():
             try:
-                # Parse XML for line and branch coverage
+                # Stream the XML; only the report's own counters are needed
                 from defusedxml import ElementTree  # type: ignore[import-untyped]
-                tree = ElementTree.parse(jacoco_xml)
-                root = tree.getroot()
-
-                for counter in root.findall("counter"):
-                    c_type = counter.get("type")
-                    missed = int(counter.get("missed", 0))
-                    covered = int(counter.get("covered", 0))
-                    total = missed + covered
-                    if total > 0:
-                        pct = (covered / total) * 100
-                        if c_type == "LINE":
-                            result.line_coverage_pct = pct
-                        elif c_type == "BRANCH":
-                            result.branch_coverage_pct = pct
-                        elif c_type == "METHOD":
-                            result.function_coverage_pct = pct
+
+                depth = 0
+                for event, elem in ElementTree.iterparse(
+                    jacoco_xml, events=("start", "end")
+                ):
+                    if event == "start":
+                        depth += 1
+                        continue
+                    depth -= 1
+                    # depth 1: direct children of <report>
+                    if depth == 1 and elem.tag == "counter":
+                        c_type = elem.get("type")
+                        missed = int(elem.get("missed", 0))
+                        covered = int(elem.get("covered", 0))
+                        total = missed + covered
+                        if total > 0:
+                            pct = (covered / total) * 100
+                            if c_type == "LINE":
+                                result.line_coverage_pct = pct
+                            elif c_type == "BRANCH":
+                                result.branch_coverage_pct = pct
+                            elif c_type == "METHOD":
+                                result.function_coverage_pct = pct
+                    if depth > 0:
+                        # Release processed subtrees instead of building the DOM
+                        elem.clear()
             except Exception:  # noqa: S110
                 # Suppression intentional here as quality gate data is optional
                 pass
@@ -352,107 +970,154 @@ class PostHocAnalyzer:
                 ["go", "build", "./..."],
                 cwd=path,
                 capture_output=True,
-                text=True,
                 timeout=300,
             )
             return proc.returncode == 0
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
-    def _run_go_test(self, path: Path) -> TestOutcomeResult:
-        """Run go test and return results."""
+    def _run_go_test_with_cov(
+        self, path: Path
+    ) -> tuple[TestOutcomeResult, Path | None]:
+        """Run go test once, collecting test results and a coverage profile.
+
+        Returns:
+            Tuple of (test results, coverage profile path or None if go test
+            did not write one)
+        """
         result = TestOutcomeResult()
+        profile = path / "coverage.out"
+        # A profile left by an earlier run must not stand in for this one
+        profile.unlink(missing_ok=True)
         try:
             proc = subprocess.run(
-                ["go", "test", "-v", "./..."],
+                ["go", "test", "-v", f"-coverprofile={profile.name}", "./..."],
                 cwd=path,
                 capture_output=True,
-                text=True,
                 timeout=600,
             )
             result.passed = proc.returncode == 0
 
             # Parse verbose output for "PASS: TestName" or "FAIL: TestName"
-            passed = len(re.findall(r"--- PASS:", proc.stdout))
-            failed = len(re.findall(r"--- FAIL:", proc.stdout))
-            skipped = len(re.findall(r"--- SKIP:", proc.stdout))
+            passed = len(_GO_PASS_RE.findall(proc.stdout))
+            failed = len(_GO_FAIL_RE.findall(proc.stdout))
+            skipped = len(_GO_SKIP_RE.findall(proc.stdout))
 
             result.passed_count = passed
             result.failed_count = failed
             result.skipped_count = skipped
             result.total = passed + failed + skipped
         except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        return result
+            return result, None
+        return result, profile if profile.exists() else None
 
-    def _get_go_coverage(self, path: Path) -> CoverageResult:
-        """Get test coverage for Go project."""
+    def _get_go_coverage(self, path: Path, profile: Path) -> CoverageResult:
+        """Get test coverage for Go project from a coverage profile."""
         result = CoverageResult()
         try:
-            # Run coverage
-            subprocess.run(
-                ["go", "test", "-coverprofile=coverage.out", "./..."],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            # Parse coverage summary
             proc = subprocess.run(
-                ["go", "tool", "cover", "-func=coverage.out"],
+                ["go", "tool", "cover", f"-func={profile}"],
                 cwd=path,
                 capture_output=True,
-                text=True,
                 timeout=60,
             )
             if proc.returncode == 0:
                 # Look for "total: (statements) X.Y%"
-                match = re.search(r"total:\s+\(statements\)\s+(\d+\.\d+)%", proc.stdout)
+                match = _GO_TOTAL_RE.search(proc.stdout)
                 if match:
                     result.line_coverage_pct = float(match.group(1))
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         return result
 
+    def _count_loc(self, path: Path, language: str) -> dict[str, int] | None:
+        """Count LOC for a language under path, in process unless USE_CLOC=1."""
+        if _use_cloc():
+            return self._run_cloc(path, language)
+        return _count_loc_inproc(_source_files([path], language), language)
+
+    def _count_loc_by_file(
+        self, paths: list[Path], language: str
+    ) -> dict[str, dict[str, int]] | None:
+        """Count per-file LOC for a language, in process unless USE_CLOC=1.
+
+        Returns:
+            Mapping of file path to its "code", "comment" and "blank" counts
+        """
+        if _use_cloc():
+            return self._run_cloc_by_file(paths, language)
+        return {
+            str(file): _count_file_loc(file, language)
+            for file in _source_files(paths, language)
+        }
+
     def _run_cloc(self, path: Path, language: str) -> dict[str, Any] | None:
         """Run cloc and return LOC data for specified language."""
         try:
             result = subprocess.run(
                 ["cloc", "--json", str(path)],
                 capture_output=True,
-                text=True,
                 timeout=60,
             )
             if result.returncode == 0:
-                data: dict[str, Any] = json.loads(result.stdout)
+                data: dict[str, Any] = _loads(result.stdout)
                 lang_data: dict[str, Any] = data.get(language, {})
                 return lang_data
         except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
             pass
         return None
 
-    def _run_cloc_files(
-        self, files: list[Path], language: str
-    ) -> dict[str, Any] | None:
-        """Run cloc on a list of specific files and return LOC data."""
-        if not files:
+    def _run_cloc_by_file(
+        self, paths: list[Path], language: str
+    ) -> dict[str, dict[str, int]] | None:
+        """Run cloc once over paths and return per-file LOC data for a language.
+
+        Args:
+            paths: Files or directories to count in a single cloc invocation
+            language: cloc language name (e.g., "Java", "Go")
+
+        Returns:
+            Mapping of file path to its "code", "comment" and "blank" counts,
+            or None if cloc is unavailable or fails
+        """
+        if not paths:
             return None
         try:
-            cmd = ["cloc", "--json"] + [str(f) for f in files]
+            cmd = ["cloc", "--by-file", "--json"] + [str(p) for p in paths]
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 timeout=60,
             )
             if result.returncode == 0:
-                data: dict[str, Any] = json.loads(result.stdout)
-                lang_data: dict[str, Any] = data.get(language, {})
-                return lang_data
+                data: dict[str, Any] = _loads(result.stdout)
+                return {
+                    name: entry
+                    for name, entry in data.items()
+                    if isinstance(entry, dict) and entry.get("language") == language
+                }
         except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
             pass
         return None
 
+    def _split_loc_by_file(
+        self,
+        loc_by_file: dict[str, dict[str, int]],
+        is_test: Callable[[str], bool],
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """Sum per-file LOC data into production and test buckets.
+
+        Returns:
+            Tuple of (production, test) dicts with "code", "comment", "blank"
+        """
+        prod = {"code": 0, "comment": 0, "blank": 0}
+        test = {"code": 0, "comment": 0, "blank": 0}
+        for name, entry in loc_by_file.items():
+            bucket = test if is_test(name) else prod
+            for key in bucket:
+                bucket[key] += entry.get(key, 0)
+        return prod, test
+
     def _count_rust_loc_with_inline_tests(self, src_path: Path) -> tuple[int, int]:
         """Count Rust LOC separating production from inline #[cfg(test)] code.
 
@@ -465,152 +1130,180 @@ class PostHocAnalyzer:
 
         Returns:
             Tuple of (production_loc, inline_test_loc) where both counts
-            exclude blank lines and single-line comments.
+            exclude blank lines and single-line comments. Per-file counts are
+            cached by mtime and size, so repeat calls skip unchanged files.
         """
         prod_lines = 0
         test_lines = 0
 
-        for rs_file in src_path.glob("*.rs"):
+        for entry in _walk_files(src_path, ".rs", recursive=False):
             try:
-                content = rs_file.read_text()
+                stat = entry.stat()
             except OSError:
                 continue
+            prod, test = self._file_cache.get(
+                "rust_loc", Path(entry.path), _count_rust_file_loc, stat
+            )
+            prod_lines += prod
+            test_lines += test
 
-            lines = content.split("\n")
+        return prod_lines, test_lines
 
-            # Find #[cfg(test)] marker
-            cfg_test_line: int | None = None
-            for i, line in enumerate(lines):
-                if "#[cfg(test)]" in line:
-                    cfg_test_line = i
-                    break
+    def _run_lizard(self, path: Path, language: str) -> dict[str, Any] | None:
+        """Return complexity data for one language, reusing a prefetched run."""
+        key = (language, path)
+        if key in self._prefetched_complexity:
+            return self._prefetched_complexity[key]
+        return self._run_lizard_multi({language: path}).get(language)
 
-            if cfg_test_line is not None:
-                # Lines before marker are production
-                for line in lines[:cfg_test_line]:
-                    stripped = line.strip()
-                    if stripped and not stripped.startswith("//"):
-                        prod_lines += 1
-                # Lines from marker onward are test
-                for line in lines[cfg_test_line:]:
-                    stripped = line.strip()
-                    if stripped and not stripped.startswith("//"):
-                        test_lines += 1
-            else:
-                # No test marker - all lines are production
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped and not stripped.startswith("//"):
-                        prod_lines += 1
+    def _run_lizard_multi(
+        self, paths_by_lang: dict[str, Path]
+    ) -> dict[str, dict[str, Any] | None]:
+        """Run lizard once over several languages and split results by suffix.
 
-        return prod_lines, test_lines
+        Uses the lizard library in process when it is installed, and the
+        lizard command otherwise.
 
-    def _run_lizard(self, path: Path, language: str) -> dict[str, Any] | None:
-        """Run lizard and return complexity data."""
-        try:
-            result = subprocess.run(
-                ["lizard", "-l", language, str(path)],
-                capture_output=True,
-                text=True,
-                timeout=120,
-            )
-            if result.returncode == 0:
-                # Parse lizard output
-                lines = result.stdout.strip().split("\n")
-                functions = []
-                for line in lines:
-                    # Parse function lines (skip headers and totals)
-                    if line.strip() and not line.startswith("-") and "@" in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            try:
-                                cc = int(parts[1])
-                                functions.append(cc)
-                            except ValueError:
-                                pass
-
-                if functions:
-                    return {
-                        "function_count": len(functions),
-                        "avg_cc": sum(functions) / len(functions),
-                        "max_cc": max(functions),
-                    }
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        return None
+        Args:
+            paths_by_lang: Lizard language name mapped to the path to scan
+
+        Returns:
+            Language mapped to its complexity summary, or None if lizard found
+            no functions for it (or is unavailable)
+        """
+        paths = sorted({str(path) for path in paths_by_lang.values()})
+        languages = list(paths_by_lang)
+        rows: list[tuple[int, str]]
+        if _HAS_LIZARD:
+            rows = [
+                (func.cyclomatic_complexity, file_info.filename)
+                for file_info in lizard.analyze(paths, lans=languages)
+                for func in file_info.function_list
+            ]
+        else:
+            cmd = ["lizard", "--csv"]
+            for language in languages:
+                cmd += ["-l", language]
+            try:
+                result = subprocess.run(
+                    cmd + paths,
+                    capture_output=True,
+                    timeout=120,
+                )
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return {}
+            if result.returncode != 0:
+                return {}
+            rows = [
+                (int(cc), filename.decode(errors="replace"))
+                for cc, filename in _LIZARD_CSV_ROW_RE.findall(result.stdout)
+            ]
+
+        # A result belongs to a language only if it has that language's
+        # suffix and lies under that language's scan root; a stray file of
+        # another language inside a scanned tree is not counted for it
+        roots = {language: path.resolve() for language, path in paths_by_lang.items()}
+        owners: dict[str, str | None] = {}
+        functions: dict[str, list[int]] = {language: [] for language in languages}
+        for cc, filename in rows:
+            if filename not in owners:
+                resolved = Path(filename).resolve()
+                owners[filename] = next(
+                    (
+                        language
+                        for language in languages
+                        if filename.endswith(_LIZARD_SUFFIXES[language])
+                        and resolved.is_relative_to(roots[language])
+                    ),
+                    None,
+                )
+            owner = owners[filename]
+            if owner is not None:
+                functions[owner].append(cc)
+        return {
+            language: _summarize_cc(language_ccs)
+            for language, language_ccs in functions.items()
+        }
 
     def _count_cargo_deps(self, cargo_toml: Path) -> int:
-        """Count external dependencies in Cargo.toml."""
-        content = cargo_toml.read_text()
-        in_deps = False
-        count = 0
-        for line in content.split("\n"):
-            if line.strip() == "[dependencies]":
-                in_deps = True
-            elif line.strip().startswith("[") and in_deps:
-                break
-            elif in_deps and "=" in line and not line.strip().startswith("#"):
-                count += 1
-        return count
+        """Count external dependencies in Cargo.toml.
 
-    def _check_cargo_check(self, path: Path) -> CompilationResult:
-        """Run cargo check and return result."""
-        result = CompilationResult()
+        Counts entries of the ``[dependencies]`` table, including those
+        declared as ``[dependencies.name]`` sub-tables.
+        """
         try:
-            proc = subprocess.run(
-                ["cargo", "check", "--message-format=json"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            result.passed = proc.returncode == 0
+            return self._file_cache.get("cargo_deps", cargo_toml, _parse_cargo_deps)
+        except OSError:
+            return 0
 
-            # Count errors and warnings from JSON output
-            for line in proc.stdout.split("\n"):
-                if line.strip():
-                    try:
-                        msg = json.loads(line)
-                        if msg.get("reason") == "compiler-message":
-                            level = msg.get("message", {}).get("level", "")
-                            if level == "error":
-                                result.error_count += 1
-                            elif level == "warning":
-                                result.warning_count += 1
-                    except json.JSONDecodeError:
-                        pass
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        return result
+    def _cargo_env(self, path: Path) -> dict[str, str]:
+        """Return an environment building into the package's own target/.
 
-    def _check_cargo_clippy(self, path: Path) -> LintingResult:
-        """Run cargo clippy and return result."""
-        result = LintingResult(tool="clippy")
+        The cargo steps run one after another, so clippy, test and coverage
+        reuse the build the migration already made, and each other's
+        artifacts, instead of compiling the crate and its dependencies from
+        scratch into a directory that a standard .gitignore does not cover.
+        """
+        return {
+            **os.environ,
+            "CARGO_TARGET_DIR": str(path / "target"),
+            "CARGO_INCREMENTAL": "1",
+        }
+
+    def _check_cargo_clippy(
+        self, path: Path
+    ) -> tuple[CompilationResult, LintingResult]:
+        """Run cargo clippy once and derive compilation and lint results.
+
+        Clippy type-checks the whole crate, so a separate cargo check is not
+        needed. Diagnostics with an ``Exxxx`` code (or no code) are compile
+        errors; diagnostics carrying a lint name are lint findings, including
+        those promoted to errors by ``-D warnings``. rustc's code-less summary
+        lines are not counted as either.
+        """
+        compilation = CompilationResult()
+        linting = LintingResult(tool="clippy")
+        stream = _JsonLineStream(
+            [
+                "cargo",
+                "clippy",
+                "--all-targets",
+                "--message-format=json",
+                "--",
+                "-D",
+                "warnings",
+            ],
+            cwd=path,
+            env=self._cargo_env(path),
+            timeout=300,
+        )
         try:
-            proc = subprocess.run(
-                ["cargo", "clippy", "--message-format=json", "--", "-D", "warnings"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            result.passed = proc.returncode == 0
-
-            for line in proc.stdout.split("\n"):
-                if line.strip():
-                    try:
-                        msg = json.loads(line)
-                        if msg.get("reason") == "compiler-message":
-                            level = msg.get("message", {}).get("level", "")
-                            if level == "error":
-                                result.error_count += 1
-                            elif level == "warning":
-                                result.warning_count += 1
-                    except json.JSONDecodeError:
-                        pass
+            for msg in stream:
+                if msg.get("reason") != "compiler-message":
+                    continue
+                message = msg.get("message", {})
+                level = message.get("level", "")
+                code = (message.get("code") or {}).get("code")
+                if code is None and _RUSTC_SUMMARY_RE.match(message.get("message", "")):
+                    continue
+                if code is None or _RUSTC_ERROR_CODE_RE.fullmatch(code):
+                    if level == "error":
+                        compilation.error_count += 1
+                    elif level == "warning":
+                        compilation.warning_count += 1
+                elif level == "error":
+                    linting.error_count += 1
+                elif level == "warning":
+                    linting.warning_count += 1
         except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        return result
+            return CompilationResult(), LintingResult(tool="clippy")
+
+        linting.passed = stream.returncode == 0
+        # Lint failures alone do not mean the crate failed to compile
+        compilation.passed = stream.returncode == 0 or (
+            compilation.error_count == 0 and linting.error_count > 0
+        )
+        return compilation, linting
 
     def _check_cargo_fmt(self, path: Path) -> FormattingResult:
         """Check if code is properly formatted."""
@@ -620,7 +1313,6 @@ class PostHocAnalyzer:
                 ["cargo", "fmt", "--check"],
                 cwd=path,
                 capture_output=True,
-                text=True,
                 timeout=60,
             )
             result.passed = proc.returncode == 0
@@ -631,135 +1323,166 @@ class PostHocAnalyzer:
     def _run_cargo_test(self, path: Path) -> TestOutcomeResult:
         """Run cargo test and return results."""
         result = TestOutcomeResult()
+        stream = _JsonLineStream(
+            ["cargo", "test", "--", "--format=json", "-Z", "unstable-options"],
+            cwd=path,
+            env=self._cargo_env(path),
+            timeout=600,
+        )
         try:
-            proc = subprocess.run(
-                ["cargo", "test", "--", "--format=json", "-Z", "unstable-options"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=600,
-            )
-            result.passed = proc.returncode == 0
+            for msg in stream:
+                if msg.get("type") == "test":
+                    result.total += 1
+                    event = msg.get("event", "")
+                    if event == "ok":
+                        result.passed_count += 1
+                    elif event == "failed":
+                        result.failed_count += 1
+                    elif event == "ignored":
+                        result.skipped_count += 1
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return TestOutcomeResult()
 
-            # Parse test results from JSON
-            for line in proc.stdout.split("\n"):
-                if line.strip():
-                    try:
-                        msg = json.loads(line)
-                        if msg.get("type") == "test":
-                            result.total += 1
-                            event = msg.get("event", "")
-                            if event == "ok":
-                                result.passed_count += 1
-                            elif event == "failed":
-                                result.failed_count += 1
-                            elif event == "ignored":
-                                result.skipped_count += 1
-                    except json.JSONDecodeError:
-                        pass
-
-            # Fallback: parse regular output if JSON parsing failed
-            if result.total == 0:
-                # Look for "test result: ok. X passed; Y failed"
-                import re
-
-                combined_output = proc.stdout + proc.stderr
-                match = re.search(
-                    r"(\d+) passed.*?(\d+) failed",
-                    combined_output,
-                )
-                if match:
-                    result.passed_count = int(match.group(1))
-                    result.failed_count = int(match.group(2))
+        result.passed = stream.returncode == 0
 
-                # Also look for ignored tests
-                ignored_match = re.search(r"(\d+) ignored", combined_output)
-                if ignored_match:
-                    result.skipped_count = int(ignored_match.group(1))
+        # Fallback: parse regular output if JSON parsing failed
+        if result.total == 0:
+            # Look for "test result: ok. X passed; Y failed"
+            combined_output = b"".join(stream.text_lines)
+            match = _CARGO_PASSFAIL_RE.search(combined_output)
+            if match:
+                result.passed_count = int(match.group(1))
+                result.failed_count = int(match.group(2))
 
-                result.total = (
-                    result.passed_count + result.failed_count + result.skipped_count
-                )
+            # Also look for ignored tests
+            ignored_match = _CARGO_IGNORED_RE.search(combined_output)
+            if ignored_match:
+                result.skipped_count = int(ignored_match.group(1))
+
+            result.total = (
+                result.passed_count + result.failed_count + result.skipped_count
+            )
 
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
         return result
 
     def _get_cargo_coverage(self, path: Path) -> CoverageResult:
-        """Get test coverage using cargo tarpaulin or llvm-cov."""
-        result = CoverageResult()
+        """Get test coverage using cargo llvm-cov, or tarpaulin without it.
 
-        # Try cargo tarpaulin first
-        try:
-            proc = subprocess.run(
-                ["cargo", "tarpaulin", "--out", "json", "--output-dir", "/tmp"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=600,
-            )
-            if proc.returncode == 0:
-                coverage_file = Path("/tmp/tarpaulin-report.json")
-                if coverage_file.exists():
-                    data = json.loads(coverage_file.read_text())
-                    # Extract coverage percentage
-                    # Tarpaulin JSON format has a top-level "files" or similar
-                    # but also often provides a summary.
-                    if "coverage" in data:
-                        result.line_coverage_pct = data["coverage"]
-                    return result
-        except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
-            pass
+        llvm-cov is much faster than tarpaulin, so tarpaulin only runs when
+        the llvm-cov subcommand is not installed.
+        """
+        result = self._run_llvm_cov(path)
+        if result is None:
+            result = self._run_tarpaulin(path)
+        return result
+
+    def _run_llvm_cov(self, path: Path) -> CoverageResult | None:
+        """Get test coverage with cargo llvm-cov.
 
-        # Fallback: try cargo llvm-cov
+        Returns:
+            Coverage result, or None if cargo llvm-cov is not installed
+        """
+        result = CoverageResult()
         try:
             proc = subprocess.run(
                 ["cargo", "llvm-cov", "--json", "--summary-only"],
                 cwd=path,
+                env=self._cargo_env(path),
                 capture_output=True,
-                text=True,
                 timeout=600,
             )
-            if proc.returncode == 0:
-                data = json.loads(proc.stdout)
-                totals = data.get("data", [{}])[0].get("totals", {})
-
-                # Lines
-                lines = totals.get("lines", {})
-                if lines.get("count", 0) > 0:
-                    result.line_coverage_pct = lines.get("percent", 0)
-
-                # Functions
-                functions = totals.get("functions", {})
-                if functions.get("count", 0) > 0:
-                    result.function_coverage_pct = functions.get("percent", 0)
-
-                # Branches (instantiated as regions in some llvm-cov versions)
-                branches = totals.get("branches", {})
-                if branches.get("count", 0) > 0:
-                    result.branch_coverage_pct = branches.get("percent", 0)
-        except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
+            if proc.returncode != 0:
+                if _CARGO_NO_SUCH_COMMAND in proc.stderr:
+                    return None
+                return result
+
+            data = _loads(proc.stdout)
+            totals = data.get("data", [{}])[0].get("totals", {})
+
+            # Lines
+            lines = totals.get("lines", {})
+            if lines.get("count", 0) > 0:
+                result.line_coverage_pct = lines.get("percent", 0)
+
+            # Functions
+            functions = totals.get("functions", {})
+            if functions.get("count", 0) > 0:
+                result.function_coverage_pct = functions.get("percent", 0)
+
+            # Branches (instantiated as regions in some llvm-cov versions)
+            branches = totals.get("branches", {})
+            if branches.get("count", 0) > 0:
+                result.branch_coverage_pct = branches.get("percent", 0)
+        except FileNotFoundError:
+            return None
+        except (subprocess.TimeoutExpired, json.JSONDecodeError):
             pass
+        return result
+
+    def _run_tarpaulin(self, path: Path) -> CoverageResult:
+        """Get test coverage with cargo tarpaulin.
 
+        The report goes to a private temporary directory so concurrent
+        analyzer runs cannot overwrite each other's results.
+        """
+        result = CoverageResult()
+        with tempfile.TemporaryDirectory(prefix="tarpaulin-") as out_dir:
+            try:
+                proc = subprocess.run(
+                    ["cargo", "tarpaulin", "--out", "json", "--output-dir", out_dir],
+                    cwd=path,
+                    env=self._cargo_env(path),
+                    capture_output=True,
+                    timeout=600,
+                )
+                coverage_file = Path(out_dir) / "tarpaulin-report.json"
+                if proc.returncode == 0 and coverage_file.exists():
+                    data = _loads(coverage_file.read_bytes())
+                    # Tarpaulin JSON format has a top-level "files" or similar
+                    # but also often provides a summary.
+                    if "coverage" in data:
+                        result.line_coverage_pct = data["coverage"]
+            except (
+                subprocess.TimeoutExpired,
+                FileNotFoundError,
+                json.JSONDecodeError,
+            ):
+                pass
         return result
 
     def _run_radon_mi(self, path: Path) -> float | None:
-        """Run radon mi and return average Maintainability Index."""
+        """Run radon mi and return average Maintainability Index.
+
+        Uses the radon library in process when it is installed, and the radon
+        command otherwise.
+        """
+        if _HAS_RADON:
+            scores = []
+            for entry in _walk_files(path, ".py"):
+                try:
+                    score = self._file_cache.get(
+                        "radon_mi", Path(entry.path), _radon_file_mi, entry.stat()
+                    )
+                except OSError:
+                    continue
+                if score is not None:
+                    scores.append(score)
+            return sum(scores) / len(scores) if scores else None
+
         try:
             result = subprocess.run(
                 ["radon", "mi", "-s", str(path)],
                 capture_output=True,
-                text=True,
                 timeout=60,
             )
             if result.returncode == 0:
                 # Parse radon mi output: "filename - A (score)"
                 scores = []
-                for line in result.stdout.strip().split("\n"):
-                    if " - " in line and "(" in line:
+                for line in result.stdout.strip().split(b"\n"):
+                    if b" - " in line and b"(" in line:
                         # Extract score from parentheses
                         try:
-                            score_str = line.split("(")[-1].rstrip(")")
+                            score_str = line.split(b"(")[-1].rstrip(b")")
                             scores.append(float(score_str))
                         except (ValueError, IndexError):
                             pass
@@ -777,10 +1500,11 @@ class PostHocAnalyzer:
             req_file = source_path.parent / "requirements.txt"
         if req_file.exists():
             count = 0
-            for line in req_file.read_text().split("\n"):
-                line = line.strip()
-                if line and not line.startswith("#") and not line.startswith("-"):
-                    count += 1
+            with req_file.open() as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith(("#", "-")):
+                        count += 1
             return count
 
         # Check pyproject.toml
@@ -788,17 +1512,12 @@ class PostHocAnalyzer:
         if not pyproject.exists():
             pyproject = source_path.parent / "pyproject.toml"
         if pyproject.exists():
-            content = pyproject.read_text()
-            in_deps = False
-            count = 0
-            for line in content.split("\n"):
-                if "dependencies" in line and "=" in line:
-                    in_deps = True
-                elif line.strip().startswith("[") and in_deps:
-                    break
-                elif in_deps and line.strip().startswith('"'):
-                    count += 1
-            return count
+            try:
+                with pyproject.open("rb") as f:
+                    project = tomllib.load(f).get("project", {})
+            except (OSError, tomllib.TOMLDecodeError):
+                return 0
+            return len(project.get("dependencies", []))
 
         return 0
 
@@ -809,55 +1528,42 @@ class PostHocAnalyzer:
         if gradle_file.exists():
             content = gradle_file.read_text()
             # Count implementation/api/compile dependencies
-            import re
-
-            deps = re.findall(
-                r"(implementation|api|compile|testImplementation)\s*['\"]",
-                content,
-            )
-            return len(deps)
+            return sum(1 for _ in _GRADLE_DEP_RE.finditer(content))
 
         # Check pom.xml
         pom_file = target_path / "pom.xml"
         if pom_file.exists():
             content = pom_file.read_text()
             # Count <dependency> tags (excluding test scope)
-            import re
-
-            deps = re.findall(r"<dependency>", content)
-            return len(deps)
+            return content.count("<dependency>")
 
         return 0
 
     def _count_go_deps(self, go_mod: Path) -> int:
-        """Count Go dependencies from go.mod file."""
-        try:
-            content = go_mod.read_text()
-            # Count require statements
-            # Can be single line: require github.com/foo/bar v1.0.0
-            # Or block: require ( ... )
-            import re
-
-            # Single-line requires
-            single_requires = re.findall(r"^require\s+\S+", content, re.MULTILINE)
-
-            # Block requires (count lines inside require blocks)
-            block_requires: list[str] = []
-            in_block = False
-            for line in content.split("\n"):
-                stripped = line.strip()
-                if stripped.startswith("require ("):
-                    in_block = True
-                    continue
-                if in_block:
-                    if stripped == ")":
-                        in_block = False
-                    elif stripped and not stripped.startswith("//"):
-                        block_requires.append(stripped)
+        """Count Go dependencies from go.mod file.
 
-            return len(single_requires) + len(block_requires)
+        Counts single-line ``require path version`` directives plus the
+        module lines inside ``require ( ... )`` blocks.
+        """
+        count = 0
+        in_block = False
+        try:
+            with go_mod.open() as f:
+                for line in f:
+                    if in_block:
+                        if line.startswith(")"):
+                            in_block = False
+                        elif _GO_MODULE_LINE_RE.match(line):
+                            count += 1
+                    elif line.startswith("require"):
+                        rest = line[7:]
+                        if rest.lstrip().startswith("("):
+                            in_block = True
+                        elif rest[:1].isspace() and rest.strip():
+                            count += 1
         except OSError:
             return 0
+        return count
 
     def _calculate_mi_from_metrics(self, loc: int, avg_cc: float) -> float | None:
         """Calculate Maintainability Index from LOC and cyclomatic complexity.
@@ -868,8 +1574,6 @@ class PostHocAnalyzer:
 
         Returns value clamped to 0-100 range.
         """
-        import math
-
         if loc <= 0:
             return None
 
@@ -9,21 +9,45 @@ Usage:
 """
 
 import argparse
+import glob
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from .analyzer import PostHocAnalyzer
-from .collector import LogParser
 from .database import MigrationDatabase
-from .generator import ReportGenerator
 from .schema import MigrationMetrics
 
+# The analyzer, log parser and report generator (jinja2) are imported inside
+# the commands that use them, so lightweight commands such as ``stats`` and
+# ``query`` do not pay for loading them.
+
 DEFAULT_DB_PATH = Path("migrations.db")
 
+_LOG_SUFFIXES = (".log", ".txt")
+
+
+def _latest_log(log_dir: Path) -> Path | None:
+    """Return the most recently modified log file in a directory, if any."""
+    latest: os.DirEntry[str] | None = None
+    latest_mtime = 0.0
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(_LOG_SUFFIXES):
+                continue
+            mtime = entry.stat(follow_symlinks=False).st_mtime
+            if latest is None or mtime > latest_mtime:
+                latest, latest_mtime = entry, mtime
+    return Path(latest.path) if latest is not None else None
+
 
 def cmd_analyze(args: argparse.Namespace) -> int:
     """Analyze a completed migration directory."""
+    from .analyzer import PostHocAnalyzer
+    from .collector import LogParser
+    from .generator import ReportGenerator
+
     migration_dir = Path(args.migration_dir)
 
     if not migration_dir.exists():
@@ -35,13 +59,11 @@ def cmd_analyze(args: argparse.Namespace) -> int:
     if not log_dir.exists():
         log_dir = migration_dir  # Try migration_dir itself
 
-    log_files = list(log_dir.glob("*.log")) + list(log_dir.glob("*.txt"))
-    if not log_files:
+    # Use the most recent log file
+    log_file = _latest_log(log_dir)
+    if log_file is None:
         print(f"Error: No log files found in {log_dir}", file=sys.stderr)
         return 1
-
-    # Use the most recent log file
-    log_file = max(log_files, key=lambda p: p.stat().st_mtime)
     print(f"Analyzing: {log_file}")
 
     # Parse log file
@@ -52,19 +74,38 @@ def cmd_analyze(args: argparse.Namespace) -> int:
     analyzer = PostHocAnalyzer()
 
     source_dir = migration_dir.parent.parent / "source"
-    if source_dir.exists():
-        print(f"Analyzing source: {source_dir}")
-        source_metrics = analyzer.analyze_python_source(source_dir)
-        metrics.source_metrics = source_metrics
-
     target_dir = migration_dir / "src"
+
+    # One lizard run covers the source and target complexity analysis
+    complexity_paths: dict[str, Path] = {}
+    if source_dir.exists():
+        complexity_paths["python"] = source_dir
     if target_dir.exists():
-        print(f"Analyzing target: {target_dir}")
-        target_metrics = analyzer.analyze_rust_target(target_dir.parent)
-        metrics.target_metrics = target_metrics
+        complexity_paths["rust"] = target_dir.parent
+    if complexity_paths:
+        analyzer.prefetch_complexity(complexity_paths)
+
+    # The quality gates are mostly waiting on cargo, so run them alongside
+    # the source and target scans rather than after them
+    with ThreadPoolExecutor(max_workers=1) as quality_pool:
+        quality_future = (
+            quality_pool.submit(analyzer.analyze_rust_quality, target_dir.parent)
+            if target_dir.exists()
+            else None
+        )
+
+        if source_dir.exists():
+            print(f"Analyzing source: {source_dir}")
+            source_metrics = analyzer.analyze_python_source(source_dir)
+            metrics.source_metrics = source_metrics
 
-        quality = analyzer.analyze_rust_quality(target_dir.parent)
-        metrics.quality_gates = quality
+        if target_dir.exists():
+            print(f"Analyzing target: {target_dir}")
+            target_metrics = analyzer.analyze_rust_target(target_dir.parent)
+            metrics.target_metrics = target_metrics
+
+        if quality_future is not None:
+            metrics.quality_gates = quality_future.result()
 
     # Save metrics
     metrics_dir = migration_dir / "metrics"
@@ -73,14 +114,16 @@ def cmd_analyze(args: argparse.Namespace) -> int:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     metrics_file = metrics_dir / f"run_{timestamp}.json"
 
+    # Serialize once for both the metrics file and the database row
+    metrics_json = metrics.to_json()
     with open(metrics_file, "w") as f:
-        f.write(metrics.to_json())
+        f.write(metrics_json)
 
     print(f"Metrics saved: {metrics_file}")
 
     # Insert into database
     db = MigrationDatabase(args.database)
-    db.insert(metrics)
+    db.insert(metrics, metrics_json)
     print(f"Inserted into database: {args.database}")
 
     # Generate report
@@ -101,14 +144,15 @@ def cmd_analyze(args: argparse.Namespace) -> int:
 
 def cmd_report(args: argparse.Namespace) -> int:
     """Generate a report from metrics JSON."""
+    from .generator import ReportGenerator
+
     metrics_file = Path(args.metrics_json)
 
     if not metrics_file.exists():
         print(f"Error: File not found: {metrics_file}", file=sys.stderr)
         return 1
 
-    with open(metrics_file) as f:
-        metrics = MigrationMetrics.from_json(f.read())
+    metrics = MigrationMetrics.load(str(metrics_file))
 
     generator = ReportGenerator()
 
@@ -131,12 +175,24 @@ def cmd_query(args: argparse.Namespace) -> int:
     """Query the migrations database."""
     db = MigrationDatabase(args.database)
 
-    results = db.query(
+    # The listing only needs indexed columns, so skip decoding metrics_json
+    results = db.query_columns(
+        [
+            "run_id",
+            "project_name",
+            "target_language",
+            "strategy",
+            "status",
+            "duration_ms",
+            "cost_usd",
+            "io_match_rate",
+        ],
         project=args.project,
         target=args.target,
         strategy=args.strategy,
         status=args.status,
         limit=args.limit,
+        project_prefix=args.project_prefix,
     )
 
     if not results:
@@ -145,15 +201,15 @@ def cmd_query(args: argparse.Namespace) -> int:
 
     print(f"Found {len(results)} migration(s):\n")
 
-    for m in results:
-        status_icon = "✓" if m.outcome.status == "success" else "✗"
-        duration = f"{m.timing.wall_clock_duration_ms / 60000:.1f}min"
+    for row in results:
+        status_icon = "✓" if row["status"] == "success" else "✗"
+        duration = f"{(row['duration_ms'] or 0) / 60000:.1f}min"
         print(
-            f"  {status_icon} {m.identity.run_id[:8]}  "
-            f"{m.identity.project_name} → {m.identity.target_language} "
-            f"({m.identity.strategy})  "
-            f"{duration}  ${m.cost.total_cost_usd:.2f}  "
-            f"I/O: {m.io_contract.match_rate_pct:.0f}%"
+            f"  {status_icon} {row['run_id'][:8]}  "
+            f"{row['project_name']} → {row['target_language']} "
+            f"({row['strategy']})  "
+            f"{duration}  ${row['cost_usd'] or 0:.2f}  "
+            f"I/O: {row['io_match_rate'] or 0:.0f}%"
         )
 
     # Show aggregates if multiple results
@@ -176,6 +232,8 @@ def cmd_query(args: argparse.Namespace) -> int:
 
 def cmd_export(args: argparse.Namespace) -> int:
     """Export database to various formats."""
+    from .generator import ReportGenerator
+
     db = MigrationDatabase(args.database)
 
     if args.format == "json":
@@ -208,6 +266,8 @@ def cmd_export(args: argparse.Namespace) -> int:
 
 def cmd_compare(args: argparse.Namespace) -> int:
     """Compare multiple migration runs."""
+    from .generator import ReportGenerator
+
     db = MigrationDatabase(args.database)
 
     runs = []
@@ -239,8 +299,26 @@ def cmd_compare(args: argparse.Namespace) -> int:
     return 0
 
 
+def _apply_backfill_overrides(
+    metrics: MigrationMetrics, args: argparse.Namespace
+) -> None:
+    """Apply the --project/--strategy overrides to backfilled metrics."""
+    # Override project name if specified
+    if args.project:
+        metrics.identity.project_name = args.project
+
+    # Override strategy if specified
+    if args.strategy:
+        metrics.identity.strategy = args.strategy
+
+
 def cmd_backfill(args: argparse.Namespace) -> int:
     """Backfill metrics from an existing log file."""
+    from .collector import LogParser
+
+    if args.batch:
+        return _backfill_batch(args)
+
     log_file = Path(args.log_file)
 
     if not log_file.exists():
@@ -251,14 +329,7 @@ def cmd_backfill(args: argparse.Namespace) -> int:
 
     parser = LogParser()
     metrics = parser.parse_log(log_file)
-
-    # Override project name if specified
-    if args.project:
-        metrics.identity.project_name = args.project
-
-    # Override strategy if specified
-    if args.strategy:
-        metrics.identity.strategy = args.strategy
+    _apply_backfill_overrides(metrics, args)
 
     # Save metrics JSON
     if args.metrics_output:
@@ -266,14 +337,16 @@ def cmd_backfill(args: argparse.Namespace) -> int:
     else:
         output_path = log_file.parent / f"metrics_{log_file.stem}.json"
 
+    # Serialize once for both the metrics file and the database row
+    metrics_json = metrics.to_json()
     with open(output_path, "w") as f:
-        f.write(metrics.to_json())
+        f.write(metrics_json)
 
     print(f"Metrics saved: {output_path}")
 
     # Insert into database
     db = MigrationDatabase(args.database)
-    db.insert(metrics)
+    db.insert(metrics, metrics_json)
     print(f"Inserted into database: {args.database}")
 
     # Print summary
@@ -288,6 +361,44 @@ def cmd_backfill(args: argparse.Namespace) -> int:
     return 0
 
 
+def _backfill_batch(args: argparse.Namespace) -> int:
+    """Backfill every log matching a glob, inserting them in one transaction."""
+    from .collector import LogParser
+
+    if args.metrics_output:
+        print("Error: --metrics-output cannot be used with --batch", file=sys.stderr)
+        return 1
+
+    # Path.glob only takes relative patterns below a fixed directory;
+    # glob.glob expands wildcards in any component, e.g. runs/*/logs/*.log
+    pattern = str(args.log_file)
+    matches = glob.glob(pattern, recursive=True)  # noqa: PTH207
+    log_files = [Path(match) for match in sorted(matches)]
+    if not log_files:
+        print(f"Error: No log files match: {pattern}", file=sys.stderr)
+        return 1
+
+    parser = LogParser()
+    runs: list[tuple[MigrationMetrics, str | None]] = []
+    for log_file in log_files:
+        print(f"Parsing: {log_file}")
+        metrics = parser.parse_log(log_file)
+        _apply_backfill_overrides(metrics, args)
+
+        metrics_json = metrics.to_json()
+        output_path = log_file.parent / f"metrics_{log_file.stem}.json"
+        with open(output_path, "w") as f:
+            f.write(metrics_json)
+        runs.append((metrics, metrics_json))
+
+    # One transaction for the whole batch instead of one per log
+    db = MigrationDatabase(args.database)
+    count = db.insert_many(runs)
+    print(f"Inserted {count} runs into database: {args.database}")
+
+    return 0
+
+
 def cmd_stats(args: argparse.Namespace) -> int:
     """Show database statistics."""
     db = MigrationDatabase(args.database)
@@ -379,6 +490,9 @@ def main() -> int:
         help="Query the migrations database",
     )
     p_query.add_argument("--project", "-p", help="Filter by project name")
+    p_query.add_argument(
+        "--project-prefix", help="Filter by project name prefix (case-insensitive)"
+    )
     p_query.add_argument("--target", "-t", help="Filter by target language")
     p_query.add_argument("--strategy", "-s", help="Filter by strategy")
     p_query.add_argument("--status", help="Filter by status (success/failure)")
@@ -440,7 +554,14 @@ def main() -> int:
         "backfill",
         help="Backfill metrics from an existing log file",
     )
-    p_backfill.add_argument("log_file", help="Path to log file")
+    p_backfill.add_argument(
+        "log_file", help="Path to log file (a glob pattern with --batch)"
+    )
+    p_backfill.add_argument(
+        "--batch",
+        action="store_true",
+        help="Backfill every log matching the pattern in one transaction",
+    )
     p_backfill.add_argument("--project", "-p", help="Project name override")
     p_backfill.add_argument("--strategy", "-s", help="Strategy override")
     p_backfill.add_argument(
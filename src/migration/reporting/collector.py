@@ -4,8 +4,14 @@ This module provides instrumentation hooks to capture timing,
 tool usage, and other metrics during migration execution.
 """
 
+import functools
+import mmap
+import os
 import re
+import sys
 import time
+from collections import Counter
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -81,28 +87,30 @@ class MetricsCollector:
         self.io_contract = IOContractMetrics()
 
         # Internal tracking
-        self._phase_start_times: dict[str, float] = {}
-        self._module_start_times: dict[str, float] = {}
+        # Start times are time.monotonic_ns() readings, so durations are
+        # integer arithmetic and immune to wall-clock adjustments
+        self._phase_start_times: dict[str, int] = {}
+        self._module_start_times: dict[str, int] = {}
         self._module_attempts: dict[str, int] = {}
         self._active_module: str | None = None
-        self._start_time = time.time()
+        self._start_time = time.monotonic_ns()
         self._message_count = 0
 
     def start_phase(self, phase_name: str) -> None:
         """Mark the start of a migration phase."""
-        self._phase_start_times[phase_name] = time.time()
+        self._phase_start_times[phase_name] = time.monotonic_ns()
 
     def end_phase(self, phase_name: str) -> None:
         """Mark the end of a migration phase."""
         if phase_name in self._phase_start_times:
-            duration_ms = int(
-                (time.time() - self._phase_start_times[phase_name]) * 1000
-            )
+            duration_ms = (
+                time.monotonic_ns() - self._phase_start_times[phase_name]
+            ) // 1_000_000
             self.timing.phase_durations_ms[phase_name] = duration_ms
 
     def start_module(self, module_name: str) -> None:
         """Mark the start of a module migration."""
-        self._module_start_times[module_name] = time.time()
+        self._module_start_times[module_name] = time.monotonic_ns()
         self._module_attempts[module_name] = (
             self._module_attempts.get(module_name, 0) + 1
         )
@@ -111,9 +119,9 @@ class MetricsCollector:
     def end_module(self, module_name: str, attempts: int | None = None) -> None:
         """Mark the end of a module migration."""
         if module_name in self._module_start_times:
-            duration_ms = int(
-                (time.time() - self._module_start_times[module_name]) * 1000
-            )
+            duration_ms = (
+                time.monotonic_ns() - self._module_start_times[module_name]
+            ) // 1_000_000
             actual_attempts = attempts or self._module_attempts.get(module_name, 1)
             self.timing.module_durations.append(
                 ModuleTiming(
@@ -138,9 +146,9 @@ class MetricsCollector:
             self.agent.subagent_invocations.get(agent_type, 0) + 1
         )
 
-    def record_message(self) -> None:
-        """Record a message processed."""
-        self._message_count += 1
+    def record_message(self, count: int = 1) -> None:
+        """Record messages processed."""
+        self._message_count += count
 
     def record_error_recovery(self) -> None:
         """Record an error recovery event."""
@@ -256,37 +264,23 @@ class MetricsCollector:
 
         Extracts timing, cost, and token metrics from the result.
         """
-        # Handle ResultMessage object or dict
-        if hasattr(result, "__dict__"):
-            # Object with attributes
-            self.timing.wall_clock_duration_ms = getattr(result, "duration_ms", 0)
-            self.timing.api_duration_ms = getattr(result, "duration_api_ms", 0)
-            self.cost.total_cost_usd = getattr(result, "total_cost_usd", 0.0)
-            self.agent.total_turns = getattr(result, "num_turns", 0)
-
-            usage = getattr(result, "usage", {})
-            if isinstance(usage, dict):
-                self.tokens.input_tokens = usage.get("input_tokens", 0)
-                self.tokens.output_tokens = usage.get("output_tokens", 0)
-                self.tokens.cache_creation_input_tokens = usage.get(
-                    "cache_creation_input_tokens", 0
-                )
-                self.tokens.cache_read_input_tokens = usage.get(
-                    "cache_read_input_tokens", 0
-                )
-
-            # Set outcome based on subtype
-            subtype = getattr(result, "subtype", "failure")
-            self.outcome.status = "success" if subtype == "success" else "failure"
-
-        elif isinstance(result, dict):
-            # Dictionary format
-            self.timing.wall_clock_duration_ms = result.get("duration_ms", 0)
-            self.timing.api_duration_ms = result.get("duration_api_ms", 0)
-            self.cost.total_cost_usd = result.get("total_cost_usd", 0.0)
-            self.agent.total_turns = result.get("num_turns", 0)
-
-            usage = result.get("usage", {})
+        # Handle ResultMessage object or dict through one accessor, chosen
+        # once, instead of duplicating the extraction for each shape
+        get: Callable[[str, Any], Any]
+        if isinstance(result, dict):
+            get = result.get
+        elif hasattr(result, "__dict__"):
+            get = functools.partial(getattr, result)
+        else:
+            return
+
+        self.timing.wall_clock_duration_ms = get("duration_ms", 0)
+        self.timing.api_duration_ms = get("duration_api_ms", 0)
+        self.cost.total_cost_usd = get("total_cost_usd", 0.0)
+        self.agent.total_turns = get("num_turns", 0)
+
+        usage = get("usage", {})
+        if isinstance(usage, dict):
             self.tokens.input_tokens = usage.get("input_tokens", 0)
             self.tokens.output_tokens = usage.get("output_tokens", 0)
             self.tokens.cache_creation_input_tokens = usage.get(
@@ -296,9 +290,10 @@ class MetricsCollector:
                 "cache_read_input_tokens", 0
             )
 
-            self.outcome.status = (
-                "success" if result.get("subtype") == "success" else "failure"
-            )
+        # Set outcome based on subtype
+        self.outcome.status = (
+            "success" if get("subtype", "failure") == "success" else "failure"
+        )
 
     def set_outcome(
         self,
@@ -320,14 +315,17 @@ class MetricsCollector:
 
         Call this at the end of the migration to get the final metrics object.
         """
-        self.identity.completed_at = datetime.now().isoformat()
+        # Keep a completion time that is already known (e.g. backfilled from
+        # a log); only a live run needs the current time
+        if self.identity.completed_at is None:
+            self.identity.completed_at = datetime.now().isoformat()
         self.agent.total_messages = self._message_count
 
         # If wall clock wasn't set from result, calculate from start time
         if self.timing.wall_clock_duration_ms == 0:
-            self.timing.wall_clock_duration_ms = int(
-                (time.time() - self._start_time) * 1000
-            )
+            self.timing.wall_clock_duration_ms = (
+                time.monotonic_ns() - self._start_time
+            ) // 1_000_000
 
         return MigrationMetrics(
             identity=self.identity,
@@ -350,116 +348,166 @@ class LogParser:
     the MetricsCollector was integrated.
     """
 
-    # Regex patterns for log parsing
+    # Regex patterns for log parsing. They are bytes patterns so the log can
+    # be scanned straight out of a memory map without decoding it.
     RESULT_MESSAGE_PATTERN = re.compile(
-        r"ResultMessage\("
-        r".*?duration_ms=(\d+)"
-        r".*?duration_api_ms=(\d+)"
-        r".*?num_turns=(\d+)"
-        r".*?total_cost_usd=([\d.]+)"
+        rb"ResultMessage\("
+        rb"[^\n]*?duration_ms=(\d+)"
+        rb"[^\n]*?duration_api_ms=(\d+)"
+        rb"[^\n]*?num_turns=(\d+)"
+        rb"[^\n]*?total_cost_usd=([\d.]+)"
     )
     USAGE_PATTERN = re.compile(
-        r"'input_tokens': (\d+).*?"
-        r"'cache_creation_input_tokens': (\d+).*?"
-        r"'cache_read_input_tokens': (\d+)"
+        rb"'input_tokens': (\d+)[^\n]*?"
+        rb"'cache_creation_input_tokens': (\d+)[^\n]*?"
+        rb"'cache_read_input_tokens': (\d+)"
     )
-    OUTPUT_TOKENS_PATTERN = re.compile(r"'output_tokens': (\d+)")
-    TOOL_USE_PATTERN = re.compile(r"ToolUseBlock\(.*?name='(\w+)'")
-    TASK_PATTERN = re.compile(r"subagent_type='(\w+)'")
-    MSG_PATTERN = re.compile(r"\[[\d:]+\] MSG #(\d+)")
-    TIMESTAMP_PATTERN = re.compile(r"\[([\d:]+)\]")
-    START_PATTERN = re.compile(r"Starting Migration: (\w+) -> (\w+)")
-    STRATEGY_PATTERN = re.compile(r"Strategy: ([\w-]+)")
+    OUTPUT_TOKENS_PATTERN = re.compile(rb"'output_tokens': (\d+)")
+    # Body patterns. Each starts with a literal (or a line anchor), which
+    # lets re jump between candidate positions with a fast substring search
+    # rather than trying every alternative at every byte as one fused
+    # alternation would. Log timestamps only ever open a line.
+    STAMP_PATTERN = re.compile(rb"^\[([\d:]+)\]", re.MULTILINE)
+    # One SDK message per stamped line; a "] MSG #" quoted inside a logged
+    # message body is not another message
+    MSG_PATTERN = re.compile(rb"^\[[\d:]+\] MSG #\d+", re.MULTILINE)
+    TOOL_USE_PATTERN = re.compile(rb"ToolUseBlock\([^\n]*?name='(\w+)'")
+    TASK_PATTERN = re.compile(rb"subagent_type='(\w+)'")
+    RESULT_LINE_PATTERN = re.compile(rb"ResultMessage\([^\n]*")
+    START_PATTERN = re.compile(rb"Starting Migration: (\w+) -> (\w+)")
+    STRATEGY_PATTERN = re.compile(rb"Strategy: ([\w-]+)")
+    SESSION_PATTERN = re.compile(rb"session_id='([^']+)'")
+    LOG_NAME_PATTERN = re.compile(r"migration_(\d{8})_(\d{6})")
 
     def parse_log(self, log_path: Path) -> MigrationMetrics:
         """Parse a log file and extract metrics."""
-        content = log_path.read_text()
-        lines = content.split("\n")
+        with log_path.open("rb") as f:
+            # mmap refuses zero-length files, which have nothing to parse
+            if not os.fstat(f.fileno()).st_size:
+                return self._parse_content(b"", log_path)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return self._parse_content(content, log_path)
+
+    def _parse_content(
+        self, content: bytes | mmap.mmap, log_path: Path
+    ) -> MigrationMetrics:
+        """Extract metrics from raw log bytes."""
+        collector = self._collector_from_header(content)
+
+        collector.record_message(len(self.MSG_PATTERN.findall(content)))
+        tool_names = self.TOOL_USE_PATTERN.findall(content)
+        subagent_names = self.TASK_PATTERN.findall(content)
+        for result_line in self.RESULT_LINE_PATTERN.findall(content):
+            self._parse_result_line(result_line, collector)
+
+        # Tally names in bulk, decoding each distinct name once; interned
+        # so the many dicts built from these runs share the key objects
+        for name, count in Counter(tool_names).items():
+            collector.agent.tool_invocations[sys.intern(name.decode())] = count
+        for name, count in Counter(subagent_names).items():
+            collector.agent.subagent_invocations[sys.intern(name.decode())] = count
+
+        # Convert the first/last timestamps into start/end times
+        first_stamp = self.STAMP_PATTERN.search(content)
+        if first_stamp:
+            last_stamp = self._last_stamp(content)
+            # Get date from log filename
+            date_match = self.LOG_NAME_PATTERN.search(log_path.name)
+            if date_match:
+                date_str = date_match.group(1)
+                year, month, day = (
+                    int(date_str[:4]),
+                    int(date_str[4:6]),
+                    int(date_str[6:8]),
+                )
+                started_at = self._log_timestamp(year, month, day, first_stamp.group(1))
+                if started_at:
+                    collector.identity.started_at = started_at
+                if last_stamp and last_stamp.start() != first_stamp.start():
+                    completed_at = self._log_timestamp(
+                        year, month, day, last_stamp.group(1)
+                    )
+                    if completed_at:
+                        collector.identity.completed_at = completed_at
+
+        # Set run_id from session_id in log if available
+        session_match = self.SESSION_PATTERN.search(content)
+        if session_match:
+            collector.identity.run_id = session_match.group(1).decode()
+
+        return collector.finalize()
 
+    def _collector_from_header(self, content: bytes | mmap.mmap) -> MetricsCollector:
+        """Create a collector from the run details in the log header."""
         # Extract basic info
         project_name = "unknown"
         target_language = "unknown"
         strategy = "unknown"
 
-        for line in lines[:20]:  # Check first 20 lines for header
-            start_match = self.START_PATTERN.search(line)
-            if start_match:
-                project_name = start_match.group(1)
-                target_language = start_match.group(2)
-
-            strat_match = self.STRATEGY_PATTERN.search(line)
-            if strat_match:
-                strategy = strat_match.group(1)
-
-        # Create collector for accumulating metrics
-        collector = MetricsCollector(
+        # Check first 20 lines for header
+        header_end = 0
+        for _ in range(20):
+            header_end = content.find(b"\n", header_end) + 1
+            if not header_end:
+                header_end = len(content)
+                break
+        # Search the header region in place (later lines win) rather than
+        # copying it out and splitting it into lines
+        for start_match in self.START_PATTERN.finditer(content, 0, header_end):
+            project_name = start_match.group(1).decode()
+            target_language = start_match.group(2).decode()
+        for strat_match in self.STRATEGY_PATTERN.finditer(content, 0, header_end):
+            strategy = strat_match.group(1).decode()
+
+        return MetricsCollector(
             project_name=project_name,
             source_language="python",
             target_language=target_language,
             strategy=strategy,
         )
 
-        # Parse the file
-        for line in lines:
-            # Count messages
-            if self.MSG_PATTERN.search(line):
-                collector.record_message()
-
-            # Extract tool uses
-            tool_match = self.TOOL_USE_PATTERN.search(line)
-            if tool_match:
-                collector.record_tool_use(tool_match.group(1))
-
-            # Extract subagent invocations
-            task_match = self.TASK_PATTERN.search(line)
-            if task_match:
-                collector.record_subagent(task_match.group(1))
-
-            # Extract ResultMessage data
-            if "ResultMessage" in line:
-                result_match = self.RESULT_MESSAGE_PATTERN.search(line)
-                if result_match:
-                    collector.timing.wall_clock_duration_ms = int(result_match.group(1))
-                    collector.timing.api_duration_ms = int(result_match.group(2))
-                    collector.agent.total_turns = int(result_match.group(3))
-                    collector.cost.total_cost_usd = float(result_match.group(4))
-
-                usage_match = self.USAGE_PATTERN.search(line)
-                if usage_match:
-                    collector.tokens.input_tokens = int(usage_match.group(1))
-                    collector.tokens.cache_creation_input_tokens = int(
-                        usage_match.group(2)
-                    )
-                    collector.tokens.cache_read_input_tokens = int(usage_match.group(3))
-
-                output_match = self.OUTPUT_TOKENS_PATTERN.search(line)
-                if output_match:
-                    collector.tokens.output_tokens = int(output_match.group(1))
-
-                # Set success status
-                if "subtype='success'" in line:
-                    collector.outcome.status = "success"
-
-        # Extract timestamps for start/end
-        timestamps = self.TIMESTAMP_PATTERN.findall(content)
-        if timestamps:
-            # Get date from log filename
-            date_match = re.search(r"migration_(\d{8})_(\d{6})", log_path.name)
-            if date_match:
-                date_str = date_match.group(1)
-                time_str = timestamps[0]
-                collector.identity.started_at = (
-                    f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}T{time_str}"
-                )
-                if len(timestamps) > 1:
-                    time_str = timestamps[-1]
-                    collector.identity.completed_at = (
-                        f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}T{time_str}"
-                    )
-
-        # Set run_id from session_id in log if available
-        session_match = re.search(r"session_id='([^']+)'", content)
-        if session_match:
-            collector.identity.run_id = session_match.group(1)
-
-        return collector.finalize()
+    def _last_stamp(self, content: bytes | mmap.mmap) -> re.Match[bytes] | None:
+        """Return the timestamp of the last stamped line, scanning backwards."""
+        end = len(content)
+        while end > 0:
+            start = content.rfind(b"\n", 0, end - 1) + 1
+            match = self.STAMP_PATTERN.match(content, start)
+            if match:
+                return match
+            end = start
+        return None
+
+    @staticmethod
+    def _log_timestamp(year: int, month: int, day: int, time_str: bytes) -> str | None:
+        """Build an ISO timestamp from the log date and an ``HH:MM:SS`` stamp.
+
+        Returns None if the stamp is not a valid time of day.
+        """
+        try:
+            hour, minute, second = (int(part) for part in time_str.split(b":"))
+            return datetime(year, month, day, hour, minute, second).isoformat()
+        except ValueError:
+            return None
+
+    def _parse_result_line(self, line: bytes, collector: MetricsCollector) -> None:
+        """Record timing, cost, and token totals from a ResultMessage line."""
+        result_match = self.RESULT_MESSAGE_PATTERN.match(line)
+        if result_match:
+            collector.timing.wall_clock_duration_ms = int(result_match.group(1))
+            collector.timing.api_duration_ms = int(result_match.group(2))
+            collector.agent.total_turns = int(result_match.group(3))
+            collector.cost.total_cost_usd = float(result_match.group(4))
+
+        usage_match = self.USAGE_PATTERN.search(line)
+        if usage_match:
+            collector.tokens.input_tokens = int(usage_match.group(1))
+            collector.tokens.cache_creation_input_tokens = int(usage_match.group(2))
+            collector.tokens.cache_read_input_tokens = int(usage_match.group(3))
+
+        output_match = self.OUTPUT_TOKENS_PATTERN.search(line)
+        if output_match:
+            collector.tokens.output_tokens = int(output_match.group(1))
+
+        # Set success status
+        if b"subtype='success'" in line:
+            collector.outcome.status = "success"
@@ -4,18 +4,69 @@ This module provides storage and querying capabilities for
 analyzing migration metrics across many runs.
 """
 
+import functools
 import sqlite3
-from collections.abc import Iterator
+import threading
+import zlib
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass, fields
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 
 from .schema import MigrationMetrics
 
+try:
+    import numpy as np
+
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
 DEFAULT_DB_PATH = Path("migrations.db")
 
 
+def _datetime_ms(value: datetime) -> int:
+    """Milliseconds since the epoch; naive datetimes are local time."""
+    return int(value.timestamp() * 1000)
+
+
+def _epoch_ms(value: str | None) -> int | None:
+    """Convert a stored ISO 8601 timestamp to epoch milliseconds.
+
+    Returns None for missing or unparseable values.
+    """
+    if not value:
+        return None
+    try:
+        # fromisoformat() only accepts a "Z" suffix from Python 3.11
+        return _datetime_ms(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+# A write SQLite refused rather than failed: SQLITE_BUSY, SQLITE_LOCKED and
+# SQLITE_READONLY (sqlite3 only names the codes from 3.11), and their messages
+# for older Pythons, whose sqlite3 errors carry no code
+_WRITE_REFUSED_CODES = frozenset({5, 6, 8})
+_WRITE_REFUSED_MESSAGES = (
+    "attempt to write a readonly database",
+    "database is locked",
+    "database table is locked",
+)
+
+
+def _write_refused(err: sqlite3.OperationalError) -> bool:
+    """Return True if err means the database is read-only or busy."""
+    code: int | None = getattr(err, "sqlite_errorcode", None)
+    if code is not None:
+        # Extended codes (e.g. SQLITE_READONLY_DBMOVED) keep the primary
+        # code in their low byte
+        return code & 0xFF in _WRITE_REFUSED_CODES
+    return str(err).startswith(_WRITE_REFUSED_MESSAGES)
+
+
 @dataclass
 class AggregateStats:
     """Aggregated statistics across multiple migrations."""
@@ -32,9 +83,15 @@ class AggregateStats:
     avg_coverage_pct: float | None = None
 
 
+_STATS_FIELDS = tuple(f.name for f in fields(AggregateStats))
+
+
 class MigrationDatabase:
     """SQLite database for storing and querying migration metrics.
 
+    The database keeps one connection open until ``close()`` (or the end
+    of a ``with`` block).
+
     Usage:
         db = MigrationDatabase("migrations.db")
         db.insert(metrics)
@@ -56,6 +113,8 @@ class MigrationDatabase:
         strategy TEXT NOT NULL,
         started_at DATETIME NOT NULL,
         completed_at DATETIME,
+        started_at_ms INTEGER,
+        completed_at_ms INTEGER,
         duration_ms INTEGER,
         cost_usd REAL,
         io_match_rate REAL,
@@ -65,15 +124,108 @@ class MigrationDatabase:
         target_loc INTEGER,
         source_test_loc INTEGER,
         target_test_loc INTEGER,
-        metrics_json TEXT NOT NULL,
+        input_tokens INTEGER,
+        output_tokens INTEGER,
+        cache_creation_input_tokens INTEGER,
+        cache_read_input_tokens INTEGER,
+        tests_total INTEGER,
+        tests_passed INTEGER,
+        target_avg_cc REAL,
+        target_max_cc INTEGER,
+        metrics_json TEXT NOT NULL,  -- zlib-compressed BLOB since V4
         created_at DATETIME DEFAULT CURRENT_TIMESTAMP
     );
 
-    CREATE INDEX IF NOT EXISTS idx_project ON migrations(project_name);
-    CREATE INDEX IF NOT EXISTS idx_target ON migrations(target_language);
-    CREATE INDEX IF NOT EXISTS idx_strategy ON migrations(strategy);
-    CREATE INDEX IF NOT EXISTS idx_started ON migrations(started_at);
+    -- Serves case-insensitive project_name LIKE 'prefix%' filters
+    CREATE INDEX IF NOT EXISTS idx_project_nocase
+        ON migrations(project_name COLLATE NOCASE);
     CREATE INDEX IF NOT EXISTS idx_status ON migrations(status);
+
+    -- Unfiltered aggregate() (group_field '') and group_by() results,
+    -- cleared by the triggers below whenever migrations changes
+    CREATE TABLE IF NOT EXISTS summary_cache (
+        group_field TEXT NOT NULL,
+        group_value TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        avg_duration_ms REAL,
+        median_duration_ms REAL,
+        p95_duration_ms REAL,
+        total_cost_usd REAL,
+        avg_cost_usd REAL,
+        avg_io_match_rate REAL,
+        success_rate_pct REAL,
+        avg_loc_expansion REAL,
+        avg_coverage_pct REAL,
+        PRIMARY KEY (group_field, group_value)
+    );
+
+    CREATE TRIGGER IF NOT EXISTS summary_cache_insert AFTER INSERT ON migrations
+    BEGIN DELETE FROM summary_cache; END;
+    CREATE TRIGGER IF NOT EXISTS summary_cache_update AFTER UPDATE ON migrations
+    BEGIN DELETE FROM summary_cache; END;
+    CREATE TRIGGER IF NOT EXISTS summary_cache_delete AFTER DELETE ON migrations
+    BEGIN DELETE FROM summary_cache; END;
+
+    -- Row counts in total (field '') and per project and target, kept by
+    -- triggers so count() and list_*() skip scanning migrations
+    CREATE TABLE IF NOT EXISTS migration_counts (
+        field TEXT NOT NULL,
+        value TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (field, value)
+    );
+
+    -- INSERT OR REPLACE only fires DELETE triggers with recursive_triggers
+    -- on, so the row being replaced is uncounted before the insert instead
+    CREATE TRIGGER IF NOT EXISTS migration_counts_replace
+    BEFORE INSERT ON migrations
+    BEGIN
+        UPDATE migration_counts SET count = count - 1
+        WHERE (field, value) IN (
+            SELECT '', '' FROM migrations WHERE run_id = NEW.run_id
+            UNION ALL
+            SELECT 'project_name', project_name FROM migrations
+            WHERE run_id = NEW.run_id
+            UNION ALL
+            SELECT 'target_language', target_language FROM migrations
+            WHERE run_id = NEW.run_id
+        );
+        DELETE FROM migration_counts WHERE count <= 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS migration_counts_insert
+    AFTER INSERT ON migrations
+    BEGIN
+        INSERT INTO migration_counts VALUES
+            ('', '', 1),
+            ('project_name', NEW.project_name, 1),
+            ('target_language', NEW.target_language, 1)
+        ON CONFLICT (field, value) DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS migration_counts_delete
+    AFTER DELETE ON migrations
+    BEGIN
+        UPDATE migration_counts SET count = count - 1
+        WHERE (field, value) IN (
+            VALUES ('', ''),
+                ('project_name', OLD.project_name),
+                ('target_language', OLD.target_language)
+        );
+        DELETE FROM migration_counts WHERE count <= 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS migration_counts_update
+    AFTER UPDATE OF project_name, target_language ON migrations
+    BEGIN
+        UPDATE migration_counts SET count = count - 1
+        WHERE (field, value) IN (
+            VALUES ('project_name', OLD.project_name),
+                ('target_language', OLD.target_language)
+        );
+        INSERT INTO migration_counts VALUES
+            ('project_name', NEW.project_name, 1),
+            ('target_language', NEW.target_language, 1)
+        ON CONFLICT (field, value) DO UPDATE SET count = count + 1;
+        DELETE FROM migration_counts WHERE count <= 0;
+    END;
     """
 
     MIGRATION_V2 = """
@@ -85,10 +237,126 @@ class MigrationDatabase:
     ALTER TABLE migrations ADD COLUMN target_test_loc INTEGER;
     """
 
+    # V5: Report fields copied out of metrics_json so comparison and table
+    # rows can be read without decoding the full document
+    REPORT_COLUMNS: Mapping[str, str] = MappingProxyType(
+        {
+            "input_tokens": "INTEGER",
+            "output_tokens": "INTEGER",
+            "cache_creation_input_tokens": "INTEGER",
+            "cache_read_input_tokens": "INTEGER",
+            "tests_total": "INTEGER",
+            "tests_passed": "INTEGER",
+            "target_avg_cc": "REAL",
+            "target_max_cc": "INTEGER",
+        }
+    )
+
+    # V6: Covering indexes, one led by each filter/group column, so
+    # aggregate() and group_by() never read the (large) table rows. They
+    # replace the single-column indexes on the same leading columns.
+    _AGGREGATED = (
+        "duration_ms, cost_usd, io_match_rate, line_coverage_pct, status, "
+        "source_loc, target_loc"
+    )
+    MIGRATION_V6 = (
+        "CREATE INDEX IF NOT EXISTS idx_cover_project ON migrations("
+        f"project_name, target_language, strategy, {_AGGREGATED})",
+        "CREATE INDEX IF NOT EXISTS idx_cover_target ON migrations("
+        f"target_language, strategy, project_name, {_AGGREGATED})",
+        "CREATE INDEX IF NOT EXISTS idx_cover_strategy ON migrations("
+        f"strategy, target_language, project_name, {_AGGREGATED})",
+        "DROP INDEX IF EXISTS idx_project",
+        "DROP INDEX IF EXISTS idx_target",
+        "DROP INDEX IF EXISTS idx_strategy",
+    )
+
+    # Applied to the shared connection: WAL lets readers proceed during a
+    # write, and the cache/mmap sizes keep hot pages across method calls
+    PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+    """
+
+    # WHERE conditions for each _where() filter
+    FILTER_CONDITIONS: Mapping[str, str] = MappingProxyType(
+        {
+            "project": "project_name = ?",
+            "project_prefix": "project_name LIKE ? ESCAPE '\\'",
+            "target": "target_language = ?",
+            "strategy": "strategy = ?",
+            "status": "status = ?",
+            "since": "started_at_ms >= ?",
+            "until": "started_at_ms <= ?",
+        }
+    )
+
+    # Columns selectable through query_columns()
+    COLUMNS = frozenset(
+        {
+            "run_id",
+            "project_name",
+            "source_language",
+            "target_language",
+            "strategy",
+            "started_at",
+            "completed_at",
+            "started_at_ms",
+            "completed_at_ms",
+            "duration_ms",
+            "cost_usd",
+            "io_match_rate",
+            "line_coverage_pct",
+            "status",
+            "source_loc",
+            "target_loc",
+            "source_test_loc",
+            "target_test_loc",
+            *REPORT_COLUMNS,
+            "metrics_json",
+            "created_at",
+        }
+    )
+
+    # Aggregate select list shared by aggregate() and group_by()
+    AGGREGATE_COLUMNS = """
+        COUNT(*) as count,
+        AVG(duration_ms) as avg_duration_ms,
+        SUM(cost_usd) as total_cost_usd,
+        AVG(cost_usd) as avg_cost_usd,
+        AVG(io_match_rate) as avg_io_match_rate,
+        AVG(line_coverage_pct) as avg_coverage_pct,
+        AVG(CASE WHEN status = 'success' THEN 1.0 ELSE 0.0 END) * 100 as success_rate_pct,
+        AVG(CAST(target_loc AS REAL) / NULLIF(source_loc, 0)) as avg_loc_expansion
+    """
+
     def __init__(self, db_path: Path = DEFAULT_DB_PATH):
         self.db_path = db_path
+        # One connection for the lifetime of the database object, so its
+        # page and statement caches survive between calls (the statement
+        # cache fits every filter combination); the lock serializes threads
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=256
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(self.PRAGMAS)
+        self._lock = threading.RLock()
         self._init_db()
 
+    def __enter__(self) -> "MigrationDatabase":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
     def _init_db(self) -> None:
         """Initialize database schema."""
         with self._connect() as conn:
@@ -124,50 +392,188 @@ class MigrationDatabase:
             except sqlite3.OperationalError:
                 pass
 
-    @contextmanager
-    def _connect(self) -> Iterator[sqlite3.Connection]:
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        finally:
-            conn.close()
+        # V4: Compress metrics_json written as plain text by older versions
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 4:
+            conn.create_function(
+                "zlib_compress", 1, self._compress_json, deterministic=True
+            )
+            conn.execute(
+                "UPDATE migrations SET metrics_json = zlib_compress(metrics_json) "
+                "WHERE typeof(metrics_json) = 'text'"
+            )
+            conn.execute("PRAGMA user_version = 4")
+
+        # V5: Add report columns and fill them from existing documents
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 5:
+            for name, sql_type in self.REPORT_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE migrations ADD COLUMN {name} {sql_type}")
+            rows = conn.execute("SELECT metrics_json FROM migrations").fetchall()
+            assignments = ", ".join(f"{name} = ?" for name in self.REPORT_COLUMNS)
+            conn.executemany(
+                f"UPDATE migrations SET {assignments} WHERE run_id = ?",
+                [
+                    (*self._report_values(metrics), metrics.identity.run_id)
+                    for metrics in map(self._load_metrics, (r[0] for r in rows))
+                ],
+            )
+            conn.execute("PRAGMA user_version = 5")
 
-    def insert(self, metrics: MigrationMetrics) -> None:
-        """Insert a migration run into the database."""
-        with self._connect() as conn:
+        # V6: Covering indexes for the aggregate columns
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 6:
+            for statement in self.MIGRATION_V6:
+                conn.execute(statement)
+            conn.execute("PRAGMA user_version = 6")
+
+        # V7: Seed migration_counts from rows written before its triggers
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 7:
+            conn.execute("DELETE FROM migration_counts")
             conn.execute(
                 """
-                INSERT OR REPLACE INTO migrations (
-                    run_id, project_name, source_language, target_language,
-                    strategy, started_at, completed_at, duration_ms, cost_usd,
-                    io_match_rate, line_coverage_pct, status,
-                    source_loc, target_loc, source_test_loc, target_test_loc,
-                    metrics_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    metrics.identity.run_id,
-                    metrics.identity.project_name,
-                    metrics.identity.source_language,
-                    metrics.identity.target_language,
-                    metrics.identity.strategy,
-                    metrics.identity.started_at,
-                    metrics.identity.completed_at,
-                    metrics.timing.wall_clock_duration_ms,
-                    metrics.cost.total_cost_usd,
-                    metrics.io_contract.match_rate_pct,
-                    metrics.quality_gates.coverage.line_coverage_pct,
-                    metrics.outcome.status,
-                    metrics.source_metrics.production_loc,
-                    metrics.target_metrics.production_loc,
-                    metrics.source_metrics.test_loc,
-                    metrics.target_metrics.test_loc,
-                    metrics.to_json(),
-                ),
+                INSERT INTO migration_counts
+                SELECT '', '', COUNT(*) FROM migrations HAVING COUNT(*) > 0
+                UNION ALL
+                SELECT 'project_name', project_name, COUNT(*) FROM migrations
+                GROUP BY project_name
+                UNION ALL
+                SELECT 'target_language', target_language, COUNT(*) FROM migrations
+                GROUP BY target_language
+                """
             )
+            conn.execute("PRAGMA user_version = 7")
+
+        # V8: Epoch-millisecond timestamps for range filters and ordering
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 8:
+            for name in ("started_at_ms", "completed_at_ms"):
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE migrations ADD COLUMN {name} INTEGER")
+            conn.create_function("epoch_ms", 1, _epoch_ms, deterministic=True)
+            conn.execute(
+                "UPDATE migrations SET started_at_ms = epoch_ms(started_at), "
+                "completed_at_ms = epoch_ms(completed_at)"
+            )
+            conn.execute("DROP INDEX IF EXISTS idx_started")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_started_ms ON migrations(started_at_ms)"
+            )
+            conn.execute("PRAGMA user_version = 8")
+
+    @staticmethod
+    def _compress_json(metrics_json: str) -> bytes:
+        """Compress a metrics JSON document for the metrics_json column."""
+        return zlib.compress(metrics_json.encode())
+
+    @staticmethod
+    def _load_metrics(stored: str | bytes) -> MigrationMetrics:
+        """Decode a metrics_json value, compressed or from a pre-V4 row."""
+        if isinstance(stored, bytes):
+            stored = zlib.decompress(stored)
+        return MigrationMetrics.from_json(stored)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection, committing on success."""
+        with self._lock:
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    INSERT_SQL = """
+    INSERT OR REPLACE INTO migrations (
+        run_id, project_name, source_language, target_language,
+        strategy, started_at, completed_at, started_at_ms, completed_at_ms,
+        duration_ms, cost_usd,
+        io_match_rate, line_coverage_pct, status,
+        source_loc, target_loc, source_test_loc, target_test_loc,
+        input_tokens, output_tokens, cache_creation_input_tokens,
+        cache_read_input_tokens, tests_total, tests_passed,
+        target_avg_cc, target_max_cc,
+        metrics_json
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?,
+        ?
+    )
+    """
+
+    @staticmethod
+    def _report_values(metrics: MigrationMetrics) -> tuple[object, ...]:
+        """Values for REPORT_COLUMNS, in the same order."""
+        return (
+            metrics.tokens.input_tokens,
+            metrics.tokens.output_tokens,
+            metrics.tokens.cache_creation_input_tokens,
+            metrics.tokens.cache_read_input_tokens,
+            metrics.quality_gates.unit_tests.total,
+            metrics.quality_gates.unit_tests.passed_count,
+            metrics.target_metrics.avg_cyclomatic_complexity,
+            metrics.target_metrics.max_cyclomatic_complexity,
+        )
+
+    @classmethod
+    def _insert_row(
+        cls, metrics: MigrationMetrics, metrics_json: str | None
+    ) -> tuple[object, ...]:
+        """Build the INSERT_SQL parameters for one migration run."""
+        return (
+            metrics.identity.run_id,
+            metrics.identity.project_name,
+            metrics.identity.source_language,
+            metrics.identity.target_language,
+            metrics.identity.strategy,
+            metrics.identity.started_at,
+            metrics.identity.completed_at,
+            _epoch_ms(metrics.identity.started_at),
+            _epoch_ms(metrics.identity.completed_at),
+            metrics.timing.wall_clock_duration_ms,
+            metrics.cost.total_cost_usd,
+            metrics.io_contract.match_rate_pct,
+            metrics.quality_gates.coverage.line_coverage_pct,
+            metrics.outcome.status,
+            metrics.source_metrics.production_loc,
+            metrics.target_metrics.production_loc,
+            metrics.source_metrics.test_loc,
+            metrics.target_metrics.test_loc,
+            *cls._report_values(metrics),
+            cls._compress_json(
+                metrics.to_json() if metrics_json is None else metrics_json
+            ),
+        )
+
+    def insert(
+        self, metrics: MigrationMetrics, metrics_json: str | None = None
+    ) -> None:
+        """Insert a migration run into the database.
+
+        Args:
+            metrics: The migration run to store
+            metrics_json: ``metrics.to_json()``, if the caller already has it
+        """
+        self.insert_many([(metrics, metrics_json)])
+
+    def insert_many(self, runs: Iterable[tuple[MigrationMetrics, str | None]]) -> int:
+        """Insert many migration runs in a single transaction.
+
+        Args:
+            runs: ``(metrics, metrics_json)`` pairs; ``metrics_json`` may be
+                None to serialize the metrics here
+
+        Returns:
+            Number of runs inserted
+        """
+        # Serialize before taking the write lock so other connections are
+        # only blocked for the executemany itself
+        rows = [self._insert_row(metrics, json) for metrics, json in runs]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(self.INSERT_SQL, rows)
+        return len(rows)
 
     def get(self, run_id: str) -> MigrationMetrics | None:
         """Get a single migration by run_id."""
@@ -177,7 +583,7 @@ class MigrationDatabase:
                 (run_id,),
             ).fetchone()
             if row:
-                return MigrationMetrics.from_json(row["metrics_json"])
+                return self._load_metrics(row["metrics_json"])
         return None
 
     def query(
@@ -189,45 +595,153 @@ class MigrationDatabase:
         since: datetime | None = None,
         until: datetime | None = None,
         limit: int = 100,
+        project_prefix: str | None = None,
     ) -> list[MigrationMetrics]:
         """Query migrations with filters."""
-        conditions: list[str] = []
-        params: list[str | int] = []
-
-        if project:
-            conditions.append("project_name = ?")
-            params.append(project)
-        if target:
-            conditions.append("target_language = ?")
-            params.append(target)
-        if strategy:
-            conditions.append("strategy = ?")
-            params.append(strategy)
-        if status:
-            conditions.append("status = ?")
-            params.append(status)
-        if since:
-            conditions.append("started_at >= ?")
-            params.append(since.isoformat())
-        if until:
-            conditions.append("started_at <= ?")
-            params.append(until.isoformat())
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-        params.append(limit)
+        sql, params = self._query_sql(
+            ["metrics_json"],
+            project=project,
+            target=target,
+            strategy=strategy,
+            status=status,
+            since=since,
+            until=until,
+            limit=limit,
+            project_prefix=project_prefix,
+        )
+        # Decode straight off the cursor rather than materializing the rows
+        with self._connect() as conn:
+            return [
+                self._load_metrics(stored) for (stored,) in conn.execute(sql, params)
+            ]
 
+    def query_columns(
+        self,
+        columns: Sequence[str],
+        project: str | None = None,
+        target: str | None = None,
+        strategy: str | None = None,
+        status: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
+        project_prefix: str | None = None,
+    ) -> list[sqlite3.Row]:
+        """Query table columns with the same filters as query().
+
+        Listing-style callers that only show indexed scalars use this to
+        avoid decoding ``metrics_json`` for every row.
+
+        Args:
+            columns: Column names from the migrations table to select
+            project: Only runs of this project
+            target: Only runs targeting this language
+            strategy: Only runs using this strategy
+            status: Only runs with this outcome status
+            since: Only runs started at or after this time
+            until: Only runs started at or before this time
+            limit: Maximum number of rows, newest first
+            project_prefix: Only runs whose project name starts with this,
+                ignoring case
+
+        Returns:
+            Rows keyed by column name
+
+        Raises:
+            ValueError: If a column is not in the migrations table
+        """
+        sql, params = self._query_sql(
+            columns,
+            project=project,
+            target=target,
+            strategy=strategy,
+            status=status,
+            since=since,
+            until=until,
+            limit=limit,
+            project_prefix=project_prefix,
+        )
         with self._connect() as conn:
-            rows = conn.execute(
-                f"""
-                SELECT metrics_json FROM migrations
-                WHERE {where_clause}
-                ORDER BY started_at DESC
-                LIMIT ?
-                """,
-                params,
-            ).fetchall()
+            return conn.execute(sql, params).fetchall()
 
-        return [MigrationMetrics.from_json(row["metrics_json"]) for row in rows]
+    def _query_sql(
+        self,
+        columns: Sequence[str],
+        project: str | None,
+        target: str | None,
+        strategy: str | None,
+        status: str | None,
+        since: datetime | None,
+        until: datetime | None,
+        limit: int,
+        project_prefix: str | None,
+    ) -> tuple[str, list[str | int]]:
+        """Build the SELECT shared by query() and query_columns()."""
+        invalid = [c for c in columns if c not in self.COLUMNS]
+        if invalid:
+            raise ValueError(f"Invalid columns: {invalid}")
+
+        where_clause, params = self._where(
+            project=project,
+            target=target,
+            strategy=strategy,
+            status=status,
+            since=since,
+            until=until,
+            project_prefix=project_prefix,
+        )
+        params.append(limit)
+        sql = f"""
+            SELECT {", ".join(columns)} FROM migrations
+            WHERE {where_clause}
+            ORDER BY started_at_ms DESC
+            LIMIT ?
+            """
+        return sql, params
+
+    @staticmethod
+    def _where(
+        project: str | None = None,
+        target: str | None = None,
+        strategy: str | None = None,
+        status: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        project_prefix: str | None = None,
+    ) -> tuple[str, list[str | int]]:
+        """Build a WHERE clause and its parameters from query filters."""
+        if project_prefix:
+            # Match the prefix literally; LIKE is case-insensitive for ASCII
+            project_prefix = (
+                project_prefix.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+                + "%"
+            )
+        values: dict[str, str | int | None] = {
+            "project": project,
+            "project_prefix": project_prefix,
+            "target": target,
+            "strategy": strategy,
+            "status": status,
+            "since": _datetime_ms(since) if since else None,
+            "until": _datetime_ms(until) if until else None,
+        }
+        present = tuple(name for name, value in values.items() if value)
+        params: list[str | int] = [value for value in values.values() if value]
+        return MigrationDatabase._where_clause(present), params
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _where_clause(filters: tuple[str, ...]) -> str:
+        """Join the conditions for one combination of filters.
+
+        Each combination always yields the same SQL text, so the
+        connection's statement cache reuses the prepared statement.
+        """
+        if not filters:
+            return "1=1"
+        return " AND ".join(MigrationDatabase.FILTER_CONDITIONS[f] for f in filters)
 
     def aggregate(
         self,
@@ -236,34 +750,21 @@ class MigrationDatabase:
         strategy: str | None = None,
     ) -> AggregateStats | None:
         """Compute aggregate statistics for filtered migrations."""
-        conditions = []
-        params = []
-
-        if project:
-            conditions.append("project_name = ?")
-            params.append(project)
-        if target:
-            conditions.append("target_language = ?")
-            params.append(target)
-        if strategy:
-            conditions.append("strategy = ?")
-            params.append(strategy)
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        where_clause, params = self._where(
+            project=project, target=target, strategy=strategy
+        )
+        unfiltered = not params
 
         with self._connect() as conn:
+            if unfiltered:
+                cached = self._cached_summary(conn, "")
+                if cached:
+                    return cached[""]
+
             # Basic aggregates
             row = conn.execute(
                 f"""
-                SELECT
-                    COUNT(*) as count,
-                    AVG(duration_ms) as avg_duration_ms,
-                    SUM(cost_usd) as total_cost_usd,
-                    AVG(cost_usd) as avg_cost_usd,
-                    AVG(io_match_rate) as avg_io_match_rate,
-                    AVG(line_coverage_pct) as avg_coverage_pct,
-                    AVG(CASE WHEN status = 'success' THEN 1.0 ELSE 0.0 END) * 100 as success_rate_pct,
-                    AVG(CAST(target_loc AS REAL) / NULLIF(source_loc, 0)) as avg_loc_expansion
+                SELECT {self.AGGREGATE_COLUMNS}
                 FROM migrations
                 WHERE {where_clause}
                 """,
@@ -273,41 +774,113 @@ class MigrationDatabase:
             if not row or row["count"] == 0:
                 return None
 
-            # Median and p95 require window functions or sorting
+            # Median and p95 are selected in Python; no ORDER BY sort needed
             durations = conn.execute(
                 f"""
                 SELECT duration_ms FROM migrations
                 WHERE {where_clause} AND duration_ms IS NOT NULL
-                ORDER BY duration_ms
                 """,
                 params,
             ).fetchall()
 
-            duration_values = [d["duration_ms"] for d in durations]
-            median = self._percentile(duration_values, 50)
-            p95 = self._percentile(duration_values, 95)
-
-            return AggregateStats(
-                count=row["count"],
-                avg_duration_ms=row["avg_duration_ms"] or 0,
-                median_duration_ms=median,
-                p95_duration_ms=p95,
-                total_cost_usd=row["total_cost_usd"] or 0,
-                avg_cost_usd=row["avg_cost_usd"] or 0,
-                avg_io_match_rate=row["avg_io_match_rate"] or 0,
-                success_rate_pct=row["success_rate_pct"] or 0,
-                avg_loc_expansion=row["avg_loc_expansion"] or 0,
-                avg_coverage_pct=row["avg_coverage_pct"],
+            stats = self._stats_from_row(row, [d["duration_ms"] for d in durations])
+            if unfiltered:
+                self._store_summary(conn, "", {"": stats})
+            return stats
+
+    def _cached_summary(
+        self, conn: sqlite3.Connection, group_field: str
+    ) -> dict[str, AggregateStats]:
+        """Read the summary_cache rows for a group field, in value order."""
+        rows = conn.execute(
+            "SELECT * FROM summary_cache WHERE group_field = ? ORDER BY group_value",
+            (group_field,),
+        )
+        return {
+            row["group_value"]: AggregateStats(
+                **{name: row[name] for name in _STATS_FIELDS}
             )
+            for row in rows
+        }
+
+    def _store_summary(
+        self,
+        conn: sqlite3.Connection,
+        group_field: str,
+        stats: dict[str, AggregateStats],
+    ) -> None:
+        """Write computed stats into summary_cache for later calls.
+
+        The cache is best effort: on a read-only or locked database the
+        write is skipped and the stats are simply recomputed next time. Any
+        other error, such as a mismatched summary_cache schema, is raised.
+        """
+        placeholders = ", ".join("?" * (len(_STATS_FIELDS) + 2))
+        try:
+            conn.executemany(
+                f"""
+                INSERT OR REPLACE INTO summary_cache (
+                    group_field, group_value, {", ".join(_STATS_FIELDS)}
+                ) VALUES ({placeholders})
+                """,
+                [(group_field, value, *astuple(s)) for value, s in stats.items()],
+            )
+        except sqlite3.OperationalError as err:
+            if not _write_refused(err):
+                raise
+
+    def _stats_from_row(
+        self, row: sqlite3.Row, duration_values: list[int]
+    ) -> AggregateStats:
+        """Build AggregateStats from an AGGREGATE_COLUMNS row and its durations."""
+        return AggregateStats(
+            count=row["count"],
+            avg_duration_ms=row["avg_duration_ms"] or 0,
+            median_duration_ms=self._percentile(duration_values, 50),
+            p95_duration_ms=self._percentile(duration_values, 95),
+            total_cost_usd=row["total_cost_usd"] or 0,
+            avg_cost_usd=row["avg_cost_usd"] or 0,
+            avg_io_match_rate=row["avg_io_match_rate"] or 0,
+            success_rate_pct=row["success_rate_pct"] or 0,
+            avg_loc_expansion=row["avg_loc_expansion"] or 0,
+            avg_coverage_pct=row["avg_coverage_pct"],
+        )
 
     def _percentile(self, values: list[int], percentile: int) -> float:
-        """Calculate percentile from sorted list."""
+        """Calculate a linearly interpolated percentile from an unsorted list.
+
+        Uses numpy's C implementation when installed. Otherwise the two
+        neighbouring order statistics are found by selection in O(n) rather
+        than by sorting every value.
+        """
         if not values:
             return 0.0
+        if _HAS_NUMPY:
+            return float(np.percentile(np.asarray(values, dtype=np.int64), percentile))
         k = (len(values) - 1) * percentile / 100
         f = int(k)
-        c = f + 1 if f + 1 < len(values) else f
-        return values[f] + (values[c] - values[f]) * (k - f)
+        lower = self._select(values, f)
+        if k == f:
+            return float(lower)
+        upper = self._select(values, f + 1)
+        return lower + (upper - lower) * (k - f)
+
+    @staticmethod
+    def _select(values: list[int], k: int) -> int:
+        """Return the k-th smallest value (0-based) using quickselect."""
+        items = values
+        while True:
+            pivot = items[len(items) // 2]
+            lows = [v for v in items if v < pivot]
+            if k < len(lows):
+                items = lows
+                continue
+            highs = [v for v in items if v > pivot]
+            equal = len(items) - len(lows) - len(highs)
+            if k < len(lows) + equal:
+                return pivot
+            k -= len(lows) + equal
+            items = highs
 
     def group_by(
         self,
@@ -318,44 +891,63 @@ class MigrationDatabase:
         if group_field not in valid_fields:
             raise ValueError(f"Invalid group field. Must be one of: {valid_fields}")
 
-        results = {}
         with self._connect() as conn:
-            groups = conn.execute(
-                f"SELECT DISTINCT {group_field} FROM migrations"
+            cached = self._cached_summary(conn, group_field)
+            if cached:
+                return cached
+
+            rows = conn.execute(
+                f"""
+                SELECT {group_field} AS group_value, {self.AGGREGATE_COLUMNS}
+                FROM migrations
+                GROUP BY {group_field}
+                ORDER BY {group_field}
+                """
             ).fetchall()
 
-            for group in groups:
-                value = group[0]
-                kwargs = {
-                    group_field.replace("_language", "").replace("_name", ""): value
-                }
-                stats = self.aggregate(**kwargs)
-                if stats:
-                    results[value] = stats
+            # Durations for every group in one unordered pass
+            durations: dict[str, list[int]] = {row["group_value"]: [] for row in rows}
+            for value, duration_ms in conn.execute(
+                f"""
+                SELECT {group_field}, duration_ms FROM migrations
+                WHERE duration_ms IS NOT NULL
+                """
+            ):
+                durations[value].append(duration_ms)
 
-        return results
+            grouped = {
+                row["group_value"]: self._stats_from_row(
+                    row, durations[row["group_value"]]
+                )
+                for row in rows
+            }
+            self._store_summary(conn, group_field, grouped)
+        return grouped
 
     def list_projects(self) -> list[str]:
         """List all unique project names."""
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT DISTINCT project_name FROM migrations ORDER BY project_name"
-            ).fetchall()
-            return [row[0] for row in rows]
+        return self._counted_values("project_name")
 
     def list_targets(self) -> list[str]:
         """List all unique target languages."""
+        return self._counted_values("target_language")
+
+    def _counted_values(self, field: str) -> list[str]:
+        """Distinct values of a column, read from migration_counts."""
         with self._connect() as conn:
             rows = conn.execute(
-                "SELECT DISTINCT target_language FROM migrations ORDER BY target_language"
+                "SELECT value FROM migration_counts WHERE field = ? ORDER BY value",
+                (field,),
             ).fetchall()
             return [row[0] for row in rows]
 
     def count(self) -> int:
         """Count total migrations in database."""
         with self._connect() as conn:
-            row = conn.execute("SELECT COUNT(*) FROM migrations").fetchone()
-            return int(row[0])
+            row = conn.execute(
+                "SELECT count FROM migration_counts WHERE field = ''"
+            ).fetchone()
+            return int(row[0]) if row else 0
 
     def delete(self, run_id: str) -> bool:
         """Delete a migration by run_id."""
@@ -367,14 +959,29 @@ class MigrationDatabase:
             return cursor.rowcount > 0
 
     def export_to_json(self, output_path: Path) -> None:
-        """Export all migrations to a JSON file."""
-        import json
-
-        metrics_list = self.query(limit=10000)
-        data = {
-            "exported_at": datetime.now().isoformat(),
-            "count": len(metrics_list),
-            "migrations": [m.to_dict() for m in metrics_list],
-        }
-        with open(output_path, "w") as f:
-            json.dump(data, f, indent=2)
+        """Export all migrations to a JSON file.
+
+        Stored documents are already JSON, so they are streamed from the
+        cursor into the file without being decoded and re-encoded.
+        """
+        limit = 10000
+        with self._connect() as conn, open(output_path, "wb") as f:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM migrations LIMIT ?)", (limit,)
+            ).fetchone()[0]
+            f.write(
+                f'{{\n  "exported_at": "{datetime.now().isoformat()}",\n'
+                f'  "count": {count},\n  "migrations": ['.encode()
+            )
+            rows = conn.execute(
+                "SELECT metrics_json FROM migrations "
+                "ORDER BY started_at_ms DESC LIMIT ?",
+                (limit,),
+            )
+            for i, (stored,) in enumerate(rows):
+                f.write(b",\n" if i else b"\n")
+                if isinstance(stored, bytes):
+                    f.write(zlib.decompress(stored))
+                else:
+                    f.write(stored.encode())
+            f.write(b"\n  ]\n}\n")
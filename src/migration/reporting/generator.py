@@ -4,6 +4,7 @@ This module renders Jinja2 templates to produce Markdown and
 LaTeX reports from standardized migration metrics.
 """
 
+import functools
 from datetime import datetime
 from pathlib import Path
 
@@ -19,6 +20,12 @@ from .schema import MigrationMetrics
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+# (exclusive upper bound, unit size, suffix) for durations from 1s up to 1h
+_DURATION_UNITS = (
+    (60_000, 1000, "s"),
+    (3_600_000, 60_000, "min"),
+)
+
 
 class ReportGenerator:
     """Generates reports from migration metrics.
@@ -41,41 +48,30 @@ class ReportGenerator:
 
     def __init__(self, templates_dir: Path | None = None):
         self.templates_dir = templates_dir or TEMPLATES_DIR
-        self.env = Environment(
-            loader=FileSystemLoader(self.templates_dir),
-            autoescape=select_autoescape(["html", "xml"]),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.env = _environment(self.templates_dir)
 
-        # Add custom filters
-        self.env.filters["duration"] = self._format_duration
-        self.env.filters["cost"] = self._format_cost
-        self.env.filters["pct"] = self._format_percentage
-        self.env.filters["number"] = self._format_number
-
-    def _format_duration(self, ms: int) -> str:
+    @staticmethod
+    def _format_duration(ms: int) -> str:
         """Format milliseconds as human-readable duration."""
         if ms < 1000:
             return f"{ms}ms"
-        seconds = ms / 1000
-        if seconds < 60:
-            return f"{seconds:.1f}s"
-        minutes = seconds / 60
-        if minutes < 60:
-            return f"{minutes:.1f}min"
-        hours = minutes / 60
-        return f"{hours:.1f}h"
-
-    def _format_cost(self, usd: float) -> str:
+        for limit_ms, unit_ms, suffix in _DURATION_UNITS:
+            if ms < limit_ms:
+                return f"{ms / unit_ms:.1f}{suffix}"
+        return f"{ms / 3_600_000:.1f}h"
+
+    @staticmethod
+    def _format_cost(usd: float) -> str:
         """Format USD cost."""
         return f"${usd:.2f}"
 
-    def _format_percentage(self, value: float) -> str:
+    @staticmethod
+    def _format_percentage(value: float) -> str:
         """Format percentage."""
         return f"{value:.1f}%"
 
-    def _format_number(self, value: int) -> str:
+    @staticmethod
+    def _format_number(value: int) -> str:
         """Format integer with thousands separator."""
         return f"{value:,}"
 
@@ -147,6 +143,29 @@ class ReportGenerator:
         )
 
 
+@functools.cache
+def _environment(templates_dir: Path) -> Environment:
+    """Build the Jinja environment for a templates directory once per process.
+
+    Generators for the same directory share it, so each template is loaded
+    and compiled once. Templates are not re-checked on disk after loading.
+    """
+    env = Environment(
+        loader=FileSystemLoader(templates_dir),
+        autoescape=select_autoescape(["html", "xml"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False,
+    )
+
+    # Add custom filters
+    env.filters["duration"] = ReportGenerator._format_duration
+    env.filters["cost"] = ReportGenerator._format_cost
+    env.filters["pct"] = ReportGenerator._format_percentage
+    env.filters["number"] = ReportGenerator._format_number
+    return env
+
+
 def create_default_templates() -> None:
     """Create default Jinja2 templates if they don't exist."""
     TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
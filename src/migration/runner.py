@@ -1,172 +1,230 @@
 """Core migration orchestration logic."""
 
+import functools
+import itertools
+import os
 import re
 import subprocess
 import sys
+import time
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Optional, TextIO
 
 from .agents import build_agents
 from .checkpoint import CheckpointManager
 from .config import ProjectConfig
 from .languages.base import LanguageTarget
 
+# Line buffer for the LOC counters' reads, well above io.DEFAULT_BUFFER_SIZE
+_READ_BUFFER_SIZE = 128 * 1024
+
+_DOCSTRING_PREFIXES = ('"""', "'''")
+
+# run_migration keeps its log open with this buffer, flushing it at phase
+# boundaries and every _LOG_FLUSH_INTERVAL SDK messages
+_LOG_BUFFER_SIZE = 64 * 1024
+_LOG_FLUSH_INTERVAL = 50
+
 if TYPE_CHECKING:
     from .reporting.collector import MetricsCollector
     from .strategies.base import MigrationStrategy
 
 
-def _count_rust_test_loc(filepath: Path) -> tuple[int, int]:
+def _iter_files(root: str, ext: str) -> Iterator[str]:
+    """Yield paths of files under root whose names end with ext.
+
+    Walks with an explicit stack of os.scandir() calls, so only matching
+    files become path strings and the directory entries' cached type data
+    avoids extra stat calls. Like Path.glob("**/*ext"), symlinked
+    directories are not descended into.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(ext) and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _file_name(filepath: str | Path) -> str:
+    """Final component of a path, without building a Path object."""
+    return str(filepath).rpartition(os.sep)[2]
+
+
+def _open_source(filepath: str | Path) -> TextIO:
+    """Open a source file for line-by-line reading with a large buffer."""
+    return open(
+        filepath, encoding="utf-8", errors="replace", buffering=_READ_BUFFER_SIZE
+    )
+
+
+def _read_source_bytes(filepath: str | Path) -> bytes:
+    """Read a whole source file as bytes for counters that only match ASCII.
+
+    Comment markers and whitespace are ASCII, so skipping the UTF-8 decode
+    leaves the counts unchanged and keeps the per-line work in bytes methods.
+    """
+    with open(filepath, "rb") as f:
+        return f.read()
+
+
+def _count_rust_test_loc(filepath: str | Path) -> tuple[int, int]:
     """Count production vs test LOC in a Rust file.
 
     Rust tests are inline with #[cfg(test)] or mod tests blocks.
     Returns (production_loc, test_loc).
     """
-    try:
-        content = filepath.read_text()
-    except Exception:
-        return 0, 0
-
-    lines = content.split("\n")
     prod_loc = 0
     test_loc = 0
     in_test_block = False
     brace_depth = 0
     test_block_start_depth = 0
 
-    for line in lines:
-        stripped = line.strip()
+    try:
+        with _open_source(filepath) as f:
+            for line in f:
+                stripped = line.strip()
 
-        # Skip empty lines and comments for counting
-        if not stripped or stripped.startswith("//"):
-            continue
+                # Skip empty lines and comments for counting
+                if not stripped or stripped.startswith("//"):
+                    continue
 
-        # Detect test block start
-        if not in_test_block:
-            if "#[cfg(test)]" in line or ("mod tests" in line and "{" in line):
-                in_test_block = True
-                test_block_start_depth = brace_depth
-                # Count braces on this line
-                brace_depth += line.count("{") - line.count("}")
-                test_loc += 1
-                continue
-            elif "#[test]" in line:
-                # Individual test function - next function is test
-                pass  # Will be counted with the block
-
-        # Track brace depth
-        open_braces = line.count("{")
-        close_braces = line.count("}")
-
-        if in_test_block:
-            test_loc += 1
-            brace_depth += open_braces - close_braces
-            # Check if we've closed the test block
-            if brace_depth <= test_block_start_depth:
-                in_test_block = False
-        else:
-            prod_loc += 1
-            brace_depth += open_braces - close_braces
+                # Detect test block start; individual #[test] functions are
+                # counted with their enclosing block
+                if not in_test_block and (
+                    "#[cfg(test)]" in line or ("mod tests" in line and "{" in line)
+                ):
+                    in_test_block = True
+                    test_block_start_depth = brace_depth
+                    # Count braces on this line
+                    brace_depth += line.count("{") - line.count("}")
+                    test_loc += 1
+                    continue
+
+                # Track brace depth
+                open_braces = line.count("{")
+                close_braces = line.count("}")
+
+                if in_test_block:
+                    test_loc += 1
+                    brace_depth += open_braces - close_braces
+                    # Check if we've closed the test block
+                    if brace_depth <= test_block_start_depth:
+                        in_test_block = False
+                else:
+                    prod_loc += 1
+                    brace_depth += open_braces - close_braces
+    except OSError:
+        return 0, 0
 
     return prod_loc, test_loc
 
 
-def _count_go_loc(filepath: Path) -> tuple[int, int]:
+def _count_go_loc(filepath: str | Path) -> tuple[int, int]:
     """Count LOC in a Go file. Test files end with _test.go."""
     try:
-        content = filepath.read_text()
-    except Exception:
+        data = _read_source_bytes(filepath)
+    except OSError:
         return 0, 0
 
     # Count non-empty, non-comment lines
     loc = 0
-    for line in content.split("\n"):
+    for line in data.splitlines():
         stripped = line.strip()
-        if stripped and not stripped.startswith("//"):
+        if stripped and not stripped.startswith(b"//"):
             loc += 1
 
-    is_test = filepath.name.endswith("_test.go")
+    is_test = str(filepath).endswith("_test.go")
     if is_test:
         return 0, loc
     return loc, 0
 
 
-def _count_java_loc(filepath: Path) -> tuple[int, int]:
+def _count_java_loc(filepath: str | Path) -> tuple[int, int]:
     """Count LOC in a Java file. Test files are in test/ or have Test in name."""
     try:
-        content = filepath.read_text()
-    except Exception:
+        data = _read_source_bytes(filepath)
+    except OSError:
         return 0, 0
 
     loc = 0
     in_block_comment = False
-    for line in content.split("\n"):
+    for line in data.splitlines():
         stripped = line.strip()
 
         # Handle block comments
-        if "/*" in stripped:
+        if b"/*" in stripped:
             in_block_comment = True
-        if "*/" in stripped:
+        if b"*/" in stripped:
             in_block_comment = False
             continue
         if in_block_comment:
             continue
 
-        if stripped and not stripped.startswith("//"):
+        if stripped and not stripped.startswith(b"//"):
             loc += 1
 
     # Classify by path or filename
-    path_str = str(filepath).lower()
+    path_str = str(filepath)
+    name = _file_name(path_str)
+    stem = name.rpartition(".")[0] or name
+    path_str = path_str.lower()
     is_test = (
         "/test/" in path_str
         or "/tests/" in path_str
-        or filepath.stem.endswith("Test")
-        or filepath.stem.startswith("Test")
+        or stem.endswith("Test")
+        or stem.startswith("Test")
     )
     if is_test:
         return 0, loc
     return loc, 0
 
 
-def _count_python_loc(filepath: Path) -> tuple[int, int]:
+def _count_python_loc(filepath: str | Path) -> tuple[int, int]:
     """Count LOC in a Python file. Test files have test_ prefix or are in tests/."""
-    try:
-        content = filepath.read_text()
-    except Exception:
-        return 0, 0
-
     loc = 0
     in_docstring = False
     docstring_char: str = ""
 
-    for line in content.split("\n"):
-        stripped = line.strip()
-
-        # Handle docstrings
-        if not in_docstring:
-            if stripped.startswith('"""') or stripped.startswith("'''"):
-                docstring_char = stripped[:3]
-                if stripped.count(docstring_char) >= 2:
-                    # Single-line docstring
+    try:
+        with _open_source(filepath) as f:
+            for line in f:
+                stripped = line.strip()
+
+                # Handle docstrings
+                if not in_docstring:
+                    if stripped.startswith(_DOCSTRING_PREFIXES):
+                        docstring_char = stripped[:3]
+                        if stripped.count(docstring_char) >= 2:
+                            # Single-line docstring
+                            continue
+                        in_docstring = True
+                        continue
+                else:
+                    if docstring_char and docstring_char in stripped:
+                        in_docstring = False
                     continue
-                in_docstring = True
-                continue
-        else:
-            if docstring_char and docstring_char in stripped:
-                in_docstring = False
-            continue
 
-        if stripped and not stripped.startswith("#"):
-            loc += 1
+                if stripped and not stripped.startswith("#"):
+                    loc += 1
+    except OSError:
+        return 0, 0
 
     # Classify by path or filename
+    name = _file_name(filepath)
     path_str = str(filepath).lower()
     is_test = (
         "/test/" in path_str
         or "/tests/" in path_str
-        or filepath.name.startswith("test_")
-        or filepath.name.endswith("_test.py")
+        or name.startswith("test_")
+        or name.endswith("_test.py")
     )
     if is_test:
         return 0, loc
@@ -174,7 +232,7 @@ def _count_python_loc(filepath: Path) -> tuple[int, int]:
 
 
 def measure_loc(
-    directory: str, language: str, log_file: Path | None = None
+    directory: str, language: str, log_file: Path | TextIO | None = None
 ) -> tuple[int, int, int]:
     """Measure lines of code by parsing files.
 
@@ -205,7 +263,7 @@ def measure_loc(
         return 0, 0, 0
 
     ext, counter = config
-    files = list(dir_path.glob(f"**/*{ext}"))
+    files = list(_iter_files(directory, ext))
 
     production_loc = 0
     test_loc = 0
@@ -224,7 +282,7 @@ def measure_loc(
 
 
 def evaluate_idiomaticness(
-    target: LanguageTarget, project_dir: str, log_file: Path | None = None
+    target: LanguageTarget, project_dir: str, log_file: Path | TextIO | None = None
 ) -> tuple[str | None, str | None]:
     """Evaluate idiomaticness of the migrated code using LLM judgment.
 
@@ -250,10 +308,10 @@ def evaluate_idiomaticness(
         log(f"Source directory not found: {source_dir}", log_file)
         return None, None
 
-    # Find source files
+    # Find source files; only the first few are sampled, so stop walking there
     extensions = {"rust": ".rs", "java": ".java", "go": ".go"}
-    ext = extensions.get(target.name, ".*")
-    source_files = list(source_path.glob(f"**/*{ext}"))
+    ext = extensions.get(target.name, "")
+    source_files = list(itertools.islice(_iter_files(source_dir, ext), 3))
 
     if not source_files:
         log(f"No {target.name} source files found", log_file)
@@ -261,12 +319,13 @@ def evaluate_idiomaticness(
 
     # Read source code (limit to first 3 files, 500 lines each to stay within context)
     code_samples = []
-    for f in source_files[:3]:
+    for source_file in source_files:
         try:
-            content = f.read_text()
+            with open(source_file) as f:
+                content = f.read()
             lines = content.split("\n")[:500]
             code_samples.append(
-                f"### {f.name}\n```{target.name}\n{chr(10).join(lines)}\n```"
+                f"### {_file_name(source_file)}\n```{target.name}\n{chr(10).join(lines)}\n```"
             )
         except Exception:
             pass
@@ -337,7 +396,7 @@ REASONING: [1-2 sentences explaining the score]
 
 
 def measure_coverage(
-    target: LanguageTarget, project_dir: str, log_file: Path | None = None
+    target: LanguageTarget, project_dir: str, log_file: Path | TextIO | None = None
 ) -> float | None:
     """Measure test coverage for the migrated project.
 
@@ -378,15 +437,27 @@ def measure_coverage(
         return None
 
 
-def log(msg: str, log_file: Path | None = None, also_print: bool = True) -> None:
-    """Log a message with timestamp."""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    formatted = f"[{timestamp}] {msg}"
+@functools.lru_cache(maxsize=1)
+def _clock_time(sec: int) -> str:
+    """Local HH:MM:SS for an epoch second, formatted once per second."""
+    return time.strftime("%H:%M:%S", time.localtime(sec))
+
 
-    if log_file:
+def log(
+    msg: str, log_file: Path | TextIO | None = None, also_print: bool = True
+) -> None:
+    """Log a message with timestamp.
+
+    log_file is either a path, opened and closed around this one line, or an
+    open handle, which is written to and left for the caller to flush.
+    """
+    formatted = f"[{_clock_time(int(time.time()))}] {msg}"
+
+    if isinstance(log_file, Path):
         with open(log_file, "a") as f:
             f.write(formatted + "\n")
-            f.flush()
+    elif log_file:
+        log_file.write(formatted + "\n")
 
     if also_print:
         print(formatted)
@@ -576,6 +647,9 @@ async def run_migration(
         # Create checkpoint manager for new migration
         checkpoint_manager = CheckpointManager(Path(project_dir))
 
+    # Precompute project-specific target paths for the rest of the run
+    target.configure(config.name, project_dir)
+
     # Build prompt using strategy (or default to built-in prompt)
     if strategy:
         prompt = strategy.get_prompt(config, target, project_dir)
@@ -624,388 +698,404 @@ async def run_migration(
     log_dir = Path(project_dir) / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     log_file = log_dir / f"migration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    # One buffered handle for the whole run instead of an open() per line;
+    # the with block flushes and closes it however the run ends
+    with open(log_file, "a", buffering=_LOG_BUFFER_SIZE) as log_fh:
+        log("=" * 60, log_fh)
+        log(f"Starting Migration: {config.name} -> {target.name.title()}", log_fh)
+        log(f"Strategy: {strategy_name}", log_fh)
+        log("=" * 60, log_fh)
+        log(f"Source: {config.source_directory}", log_fh)
+        log(f"Target: {project_dir}", log_fh)
+        log(f"Modules: {len(config.modules)}", log_fh)
+        log(f"Log file: {log_file}", log_fh)
+        log("=" * 60, log_fh)
+
+        # Measure source metrics
+        if collector:
+            log("Analyzing source code with PostHocAnalyzer...", log_fh)
+            try:
+                from .reporting.analyzer import PostHocAnalyzer
 
-    log("=" * 60, log_file)
-    log(f"Starting Migration: {config.name} -> {target.name.title()}", log_file)
-    log(f"Strategy: {strategy_name}", log_file)
-    log("=" * 60, log_file)
-    log(f"Source: {config.source_directory}", log_file)
-    log(f"Target: {project_dir}", log_file)
-    log(f"Modules: {len(config.modules)}", log_file)
-    log(f"Log file: {log_file}", log_file)
-    log("=" * 60, log_file)
-
-    # Measure source metrics
-    if collector:
-        log("Analyzing source code with PostHocAnalyzer...", log_file)
-        try:
-            from .reporting.analyzer import PostHocAnalyzer
-
-            analyzer = PostHocAnalyzer()
-            source_metrics = analyzer.analyze_python_source(
-                Path(config.source_directory)
-            )
-            collector.source_metrics = source_metrics
-            log(
-                f"Source Metrics: {source_metrics.production_loc} prod LOC, "
-                f"{source_metrics.function_count} functions, "
-                f"{source_metrics.avg_cyclomatic_complexity:.2f} avg CC",
-                log_file,
-            )
-        except Exception as e:
-            log(
-                f"Warning: PostHocAnalyzer failed for source, using fallback: {e}",
-                log_file,
-            )
-            src_prod, src_test, src_files = measure_loc(
-                config.source_directory, config.source_language, log_file
+                analyzer = PostHocAnalyzer()
+                source_metrics = analyzer.analyze_python_source(
+                    Path(config.source_directory)
+                )
+                collector.source_metrics = source_metrics
+                log(
+                    f"Source Metrics: {source_metrics.production_loc} prod LOC, "
+                    f"{source_metrics.function_count} functions, "
+                    f"{source_metrics.avg_cyclomatic_complexity:.2f} avg CC",
+                    log_fh,
+                )
+            except Exception as e:
+                log(
+                    f"Warning: PostHocAnalyzer failed for source, using fallback: {e}",
+                    log_fh,
+                )
+                src_prod, src_test, src_files = measure_loc(
+                    config.source_directory, config.source_language, log_fh
+                )
+                collector.record_source_loc(src_prod, src_test, src_files)
+
+        # Create AgentDefinition objects
+        agents = {
+            name: AgentDefinition(
+                description=agent["description"],
+                prompt=agent["prompt"],
+                tools=agent["tools"],
+                model=agent["model"],
             )
-            collector.record_source_loc(src_prod, src_test, src_files)
-
-    # Create AgentDefinition objects
-    agents = {
-        name: AgentDefinition(
-            description=agent["description"],
-            prompt=agent["prompt"],
-            tools=agent["tools"],
-            model=agent["model"],
+            for name, agent in agents_config.items()
+        }
+
+        def stderr_handler(line: str) -> None:
+            """Capture stderr from subprocesses to the log file."""
+            log(f"[stderr] {line}", log_fh)
+
+        # Build options with optional resume
+        options = ClaudeAgentOptions(
+            allowed_tools=["Read", "Write", "Edit", "Bash", "Glob", "Grep", "Task"],
+            agents=agents,
+            permission_mode="acceptEdits",
+            stderr=stderr_handler,
+            resume=resume_session_id,
+            enable_file_checkpointing=True,
         )
-        for name, agent in agents_config.items()
-    }
 
-    def stderr_handler(line: str) -> None:
-        """Capture stderr from subprocesses to the log file."""
-        log(f"[stderr] {line}", log_file)
-
-    # Build options with optional resume
-    options = ClaudeAgentOptions(
-        allowed_tools=["Read", "Write", "Edit", "Bash", "Glob", "Grep", "Task"],
-        agents=agents,
-        permission_mode="acceptEdits",
-        stderr=stderr_handler,
-        resume=resume_session_id,
-        enable_file_checkpointing=True,
-    )
-
-    # Create initial checkpoint for new migrations
-    if checkpoint_manager and not resume_dir:
-        checkpoint_manager.create_initial(
-            project=config.name,
-            target=target.name,
-            strategy=strategy_name,
-        )
+        # Create initial checkpoint for new migrations
+        if checkpoint_manager and not resume_dir:
+            checkpoint_manager.create_initial(
+                project=config.name,
+                target=target.name,
+                strategy=strategy_name,
+            )
 
-    if collector:
-        collector.end_phase("setup")
-        collector.start_phase("migration")
+        log_fh.flush()
+        if collector:
+            collector.end_phase("setup")
+            collector.start_phase("migration")
 
-    message_count = 0
-    migration_status = "success"
-    result_message = None
-    try:
-        async for message in query(prompt=prompt, options=options):
-            message_count += 1
-            _log_message(message, message_count, log_file)
+        message_count = 0
+        migration_status = "success"
+        result_message = None
+        try:
+            async for message in query(prompt=prompt, options=options):
+                message_count += 1
+                _log_message(message, message_count, log_fh)
+                if message_count % _LOG_FLUSH_INTERVAL == 0:
+                    log_fh.flush()
 
-            # Record message for metrics
-            if collector:
-                collector.record_message()
-
-            # Record tool uses for metrics - check content for ToolUseBlocks
-            if collector and hasattr(message, "content"):
-                content = message.content
-                if isinstance(content, list):
-                    for item in content:
-                        if type(item).__name__ == "ToolUseBlock":
-                            tool_name = getattr(item, "name", "unknown")
-                            collector.record_tool_use(tool_name)
-                            # Track subagent invocations for Task tool
-                            if tool_name == "Task":
-                                tool_input = getattr(item, "input", {})
-                                if isinstance(tool_input, dict):
-                                    subagent_type = tool_input.get(
-                                        "subagent_type", "unknown"
-                                    )
-                                    collector.record_subagent(subagent_type)
-
-                                    # Bug #2: Track module timing
-                                    # Task tool for migrator typically includes 'module' in prompt or input
-                                    if subagent_type == "migrator":
-                                        # End previous module if any
-                                        if collector._active_module:
+                # Record message for metrics
+                if collector:
+                    collector.record_message()
+
+                # Record tool uses for metrics - check content for ToolUseBlocks
+                if collector and hasattr(message, "content"):
+                    content = message.content
+                    if isinstance(content, list):
+                        for item in content:
+                            if type(item).__name__ == "ToolUseBlock":
+                                tool_name = getattr(item, "name", "unknown")
+                                collector.record_tool_use(tool_name)
+                                # Track subagent invocations for Task tool
+                                if tool_name == "Task":
+                                    tool_input = getattr(item, "input", {})
+                                    if isinstance(tool_input, dict):
+                                        subagent_type = tool_input.get(
+                                            "subagent_type", "unknown"
+                                        )
+                                        collector.record_subagent(subagent_type)
+
+                                        # Bug #2: Track module timing
+                                        # Task tool for migrator typically includes 'module' in prompt or input
+                                        if subagent_type == "migrator":
+                                            # End previous module if any
+                                            if collector._active_module:
+                                                collector.end_module(
+                                                    collector._active_module
+                                                )
+
+                                            # Look for module name in task prompt or input
+                                            task_prompt = str(
+                                                tool_input.get("task", "")
+                                            )
+                                            # Extract module name - assumes standard phrasing like "Migrate module X"
+                                            module_match = re.search(
+                                                r"module\s+(['\"]?)([\w.]+)\1",
+                                                task_prompt,
+                                                re.IGNORECASE,
+                                            )
+                                            if module_match:
+                                                module_name = module_match.group(2)
+                                                collector.start_module(module_name)
+
+                                        if (
+                                            subagent_type == "reviewer"
+                                            and collector._active_module
+                                        ):
+                                            # End previous module if it was a migrator task
                                             collector.end_module(
                                                 collector._active_module
                                             )
 
-                                        # Look for module name in task prompt or input
-                                        task_prompt = str(tool_input.get("task", ""))
-                                        # Extract module name - assumes standard phrasing like "Migrate module X"
-                                        module_match = re.search(
-                                            r"module\s+(['\"]?)([\w.]+)\1",
-                                            task_prompt,
-                                            re.IGNORECASE,
-                                        )
-                                        if module_match:
-                                            module_name = module_match.group(2)
-                                            collector.start_module(module_name)
-
-                                    if (
-                                        subagent_type == "reviewer"
-                                        and collector._active_module
-                                    ):
-                                        # End previous module if it was a migrator task
-                                        collector.end_module(collector._active_module)
-
-            # Capture ResultMessage for metrics extraction
-            if type(message).__name__ == "ResultMessage":
-                result_message = message
-                # Bug #2: End any remaining module timing
-                if collector:
-                    if collector._active_module:
-                        collector.end_module(collector._active_module)
-
-                    # Ensure modules_completed is accurate (Bug #5)
-                    completed = len(collector.timing.module_durations)
-                    collector.set_outcome(
-                        status="success"
-                        if getattr(result_message, "subtype", "failure") == "success"
-                        else "failure",
-                        modules_completed=completed,
-                        modules_total=len(config.modules),
+                # Capture ResultMessage for metrics extraction
+                if type(message).__name__ == "ResultMessage":
+                    result_message = message
+                    # Bug #2: End any remaining module timing
+                    if collector:
+                        if collector._active_module:
+                            collector.end_module(collector._active_module)
+
+                        # Ensure modules_completed is accurate (Bug #5)
+                        completed = len(collector.timing.module_durations)
+                        collector.set_outcome(
+                            status="success"
+                            if getattr(result_message, "subtype", "failure")
+                            == "success"
+                            else "failure",
+                            modules_completed=completed,
+                            modules_total=len(config.modules),
+                        )
+
+        except KeyboardInterrupt:
+            log("\n\nMigration interrupted by user.", log_fh)
+            migration_status = "interrupted"
+            if collector:
+                collector.record_result(type("Result", (), {"status": "interrupted"})())
+            # Save checkpoint on interrupt
+            if checkpoint_manager and result_message:
+                session_id = getattr(result_message, "session_id", "")
+                if session_id:
+                    checkpoint_manager.mark_feature_failed(
+                        "unknown", "Interrupted by user", session_id
+                    )
+            sys.exit(1)
+        except Exception as e:
+            log(f"\n\nError during migration: {e}", log_fh)
+            migration_status = "failure"
+            if collector:
+                collector.record_result(
+                    type("Result", (), {"status": "failure", "error": str(e)})()
+                )
+            # Save checkpoint on failure
+            if checkpoint_manager and result_message:
+                session_id = getattr(result_message, "session_id", "")
+                if session_id:
+                    checkpoint_manager.mark_feature_failed(
+                        "unknown", str(e), session_id
                     )
+            raise
 
-    except KeyboardInterrupt:
-        log("\n\nMigration interrupted by user.", log_file)
-        migration_status = "interrupted"
-        if collector:
-            collector.record_result(type("Result", (), {"status": "interrupted"})())
-        # Save checkpoint on interrupt
+        # Save checkpoint on success
         if checkpoint_manager and result_message:
             session_id = getattr(result_message, "session_id", "")
             if session_id:
-                checkpoint_manager.mark_feature_failed(
-                    "unknown", "Interrupted by user", session_id
-                )
-        sys.exit(1)
-    except Exception as e:
-        log(f"\n\nError during migration: {e}", log_file)
-        migration_status = "failure"
+                # Mark migration as fully completed
+                state = checkpoint_manager.load()
+                if state:
+                    state.session_id = session_id
+                    state.current_feature = None
+                    state.failed_feature = None
+                    state.error_message = None
+                    checkpoint_manager.save(state)
+
         if collector:
-            collector.record_result(
-                type("Result", (), {"status": "failure", "error": str(e)})()
-            )
-        # Save checkpoint on failure
-        if checkpoint_manager and result_message:
-            session_id = getattr(result_message, "session_id", "")
-            if session_id:
-                checkpoint_manager.mark_feature_failed("unknown", str(e), session_id)
-        raise
-
-    # Save checkpoint on success
-    if checkpoint_manager and result_message:
-        session_id = getattr(result_message, "session_id", "")
-        if session_id:
-            # Mark migration as fully completed
-            state = checkpoint_manager.load()
-            if state:
-                state.session_id = session_id
-                state.current_feature = None
-                state.failed_feature = None
-                state.error_message = None
-                checkpoint_manager.save(state)
-
-    if collector:
-        collector.end_phase("migration")
-        # Use actual ResultMessage if captured, otherwise dummy for status only
-        if result_message:
-            collector.record_result(result_message)
-        elif migration_status == "success":
-            collector.record_result(type("Result", (), {"status": "success"})())
-
-    log("", log_file)
-    log("=" * 60, log_file)
-    log("Migration Complete", log_file)
-    log("=" * 60, log_file)
-    log(f"Total messages processed: {message_count}", log_file)
-    log("", log_file)
-    log("Next steps:", log_file)
-    for i, cmd in enumerate(target.get_quality_gates(), 1):
-        log(f"{i}. Run: {cmd}", log_file)
-
-    # Measure target metrics after migration using PostHocAnalyzer
-    if collector:
-        log("", log_file)
-        log("Analyzing target code with PostHocAnalyzer...", log_file)
-        try:
-            from .reporting.analyzer import PostHocAnalyzer
-            from .reporting.schema import CodeMetrics
-
-            analyzer = PostHocAnalyzer()
-            target_path = Path(project_dir)
-
-            # Call language-specific analyzer
-            if target.name == "rust":
-                target_metrics = analyzer.analyze_rust_target(target_path)
-                quality_gates = analyzer.analyze_rust_quality(target_path)
-                # Use coverage from quality gates if available
-                if quality_gates.coverage.line_coverage_pct is not None:
-                    collector.record_coverage(
-                        quality_gates.coverage.line_coverage_pct,
-                        quality_gates.coverage.function_coverage_pct,
-                        quality_gates.coverage.branch_coverage_pct,
-                    )
+            collector.end_phase("migration")
+            # Use actual ResultMessage if captured, otherwise dummy for status only
+            if result_message:
+                collector.record_result(result_message)
+            elif migration_status == "success":
+                collector.record_result(type("Result", (), {"status": "success"})())
+
+        log("", log_fh)
+        log("=" * 60, log_fh)
+        log("Migration Complete", log_fh)
+        log("=" * 60, log_fh)
+        log(f"Total messages processed: {message_count}", log_fh)
+        log("", log_fh)
+        log("Next steps:", log_fh)
+        for i, cmd in enumerate(target.get_quality_gates(), 1):
+            log(f"{i}. Run: {cmd}", log_fh)
+        log_fh.flush()
+
+        # Measure target metrics after migration using PostHocAnalyzer
+        if collector:
+            log("", log_fh)
+            log("Analyzing target code with PostHocAnalyzer...", log_fh)
+            try:
+                from .reporting.analyzer import PostHocAnalyzer
+                from .reporting.schema import CodeMetrics
+
+                analyzer = PostHocAnalyzer()
+                target_path = Path(project_dir)
+
+                # Call language-specific analyzer
+                if target.name == "rust":
+                    target_metrics = analyzer.analyze_rust_target(target_path)
+                    quality_gates = analyzer.analyze_rust_quality(target_path)
+                    # Use coverage from quality gates if available
+                    if quality_gates.coverage.line_coverage_pct is not None:
+                        collector.record_coverage(
+                            quality_gates.coverage.line_coverage_pct,
+                            quality_gates.coverage.function_coverage_pct,
+                            quality_gates.coverage.branch_coverage_pct,
+                        )
+                    else:
+                        # Fallback to manual coverage measurement
+                        coverage = measure_coverage(target, project_dir, log_fh)
+                        collector.record_coverage(coverage)
+                    collector.quality_gates = quality_gates
+                elif target.name == "java":
+                    target_metrics = analyzer.analyze_java_target(target_path)
+                    # Java coverage from measure_coverage
+                    coverage = measure_coverage(target, project_dir, log_fh)
+                    collector.record_coverage(coverage)
+                elif target.name == "go":
+                    target_metrics = analyzer.analyze_go_target(target_path)
+                    coverage = measure_coverage(target, project_dir, log_fh)
+                    collector.record_coverage(coverage)
                 else:
-                    # Fallback to manual coverage measurement
-                    coverage = measure_coverage(target, project_dir, log_file)
+                    # Fallback to manual measurement for unknown targets
+                    target_dir = target.get_source_dir(project_dir)
+                    tgt_prod, tgt_test, _ = measure_loc(target_dir, target.name, log_fh)
+                    target_metrics = CodeMetrics(
+                        production_loc=tgt_prod, test_loc=tgt_test
+                    )
+                    coverage = measure_coverage(target, project_dir, log_fh)
                     collector.record_coverage(coverage)
-                collector.quality_gates = quality_gates
-            elif target.name == "java":
-                target_metrics = analyzer.analyze_java_target(target_path)
-                # Java coverage from measure_coverage
-                coverage = measure_coverage(target, project_dir, log_file)
-                collector.record_coverage(coverage)
-            elif target.name == "go":
-                target_metrics = analyzer.analyze_go_target(target_path)
-                coverage = measure_coverage(target, project_dir, log_file)
-                collector.record_coverage(coverage)
-            else:
-                # Fallback to manual measurement for unknown targets
+
+                collector.target_metrics = target_metrics
+                log(
+                    f"Target LOC: {target_metrics.production_loc} prod, "
+                    f"{target_metrics.test_loc} test",
+                    log_fh,
+                )
+            except Exception as e:
+                log(f"Warning: PostHocAnalyzer failed, using fallback: {e}", log_fh)
+                # Fallback to manual measurement
                 target_dir = target.get_source_dir(project_dir)
-                tgt_prod, tgt_test, _ = measure_loc(target_dir, target.name, log_file)
-                target_metrics = CodeMetrics(production_loc=tgt_prod, test_loc=tgt_test)
-                coverage = measure_coverage(target, project_dir, log_file)
+                tgt_prod, tgt_test, tgt_files = measure_loc(
+                    target_dir, target.name, log_fh
+                )
+                collector.record_target_loc(tgt_prod, tgt_test, tgt_files)
+                coverage = measure_coverage(target, project_dir, log_fh)
                 collector.record_coverage(coverage)
 
-            collector.target_metrics = target_metrics
-            log(
-                f"Target LOC: {target_metrics.production_loc} prod, "
-                f"{target_metrics.test_loc} test",
-                log_file,
-            )
-        except Exception as e:
-            log(f"Warning: PostHocAnalyzer failed, using fallback: {e}", log_file)
-            # Fallback to manual measurement
-            target_dir = target.get_source_dir(project_dir)
-            tgt_prod, tgt_test, tgt_files = measure_loc(
-                target_dir, target.name, log_file
-            )
-            collector.record_target_loc(tgt_prod, tgt_test, tgt_files)
-            coverage = measure_coverage(target, project_dir, log_file)
-            collector.record_coverage(coverage)
-
-        # Evaluate idiomaticness
-        log("", log_file)
-        score, reasoning = evaluate_idiomaticness(target, project_dir, log_file)
-        collector.record_idiomaticness(score, reasoning)
-
-        # Record I/O contract results
-        total_test_cases = len(config.test_inputs)
-        passed_cases = 0
-
-        # Try to parse actual results from PHASE_3_REVIEW.md
-        review_file = Path(project_dir) / "artifacts" / "PHASE_3_REVIEW.md"
-        if review_file.exists():
-            try:
-                review_content = review_file.read_text()
-                # Look for patterns like:
-                # - [x] Tested all I/O contract inputs
-                # - [x] All outputs match expected values exactly
-                # Or more detailed counts if the reviewer provided them
-
-                # Basic check for full pass
-                if (
-                    "[x] Tested all I/O contract inputs" in review_content
-                    and "[x] All outputs match expected values exactly"
-                    in review_content
-                ):
-                    passed_cases = total_test_cases
-                else:
-                    # Try to find specific counts if mentioned, e.g. "20/21 cases passed"
-                    match = re.search(r"(\d+)/(\d+)\s+cases\s+passed", review_content)
-                    if match:
-                        passed_cases = int(match.group(1))
-                        total_found = int(match.group(2))
-                        if total_found > total_test_cases:
-                            total_test_cases = total_found
+            # Evaluate idiomaticness
+            log("", log_fh)
+            score, reasoning = evaluate_idiomaticness(target, project_dir, log_fh)
+            collector.record_idiomaticness(score, reasoning)
+
+            # Record I/O contract results
+            total_test_cases = len(config.test_inputs)
+            passed_cases = 0
+
+            # Try to parse actual results from PHASE_3_REVIEW.md
+            review_file = Path(project_dir) / "artifacts" / "PHASE_3_REVIEW.md"
+            if review_file.exists():
+                try:
+                    review_content = review_file.read_text()
+                    # Look for patterns like:
+                    # - [x] Tested all I/O contract inputs
+                    # - [x] All outputs match expected values exactly
+                    # Or more detailed counts if the reviewer provided them
+
+                    # Basic check for full pass
+                    if (
+                        "[x] Tested all I/O contract inputs" in review_content
+                        and "[x] All outputs match expected values exactly"
+                        in review_content
+                    ):
+                        passed_cases = total_test_cases
                     else:
-                        # Count individual checkmarks in I/O section if they exist
-                        io_section = re.search(
-                            r"### I/O Contract Compliance(.*?)(###|$)",
-                            review_content,
-                            re.DOTALL,
+                        # Try to find specific counts if mentioned, e.g. "20/21 cases passed"
+                        match = re.search(
+                            r"(\d+)/(\d+)\s+cases\s+passed", review_content
                         )
-                        if io_section:
-                            passed_cases = io_section.group(1).count("[x]")
-            except Exception as e:
-                log(
-                    f"Warning: Could not parse I/O contract results from review: {e}",
-                    log_file,
-                )
+                        if match:
+                            passed_cases = int(match.group(1))
+                            total_found = int(match.group(2))
+                            if total_found > total_test_cases:
+                                total_test_cases = total_found
+                        else:
+                            # Count individual checkmarks in I/O section if they exist
+                            io_section = re.search(
+                                r"### I/O Contract Compliance(.*?)(###|$)",
+                                review_content,
+                                re.DOTALL,
+                            )
+                            if io_section:
+                                passed_cases = io_section.group(1).count("[x]")
+                except Exception as e:
+                    log(
+                        f"Warning: Could not parse I/O contract results from review: {e}",
+                        log_fh,
+                    )
 
-        if passed_cases == 0 and migration_status == "success":
-            # Fallback for success if parsing failed or review doesn't have checkboxes
-            passed_cases = total_test_cases
+            if passed_cases == 0 and migration_status == "success":
+                # Fallback for success if parsing failed or review doesn't have checkboxes
+                passed_cases = total_test_cases
 
-        failed_cases = max(0, total_test_cases - passed_cases)
+            failed_cases = max(0, total_test_cases - passed_cases)
 
-        collector.record_io_contract(
-            total_test_cases=total_test_cases,
-            passed=passed_cases,
-            failed=failed_cases,
-            unsupported=0,
-        )
-        log(f"I/O contract: {passed_cases}/{total_test_cases} passed", log_file)
+            collector.record_io_contract(
+                total_test_cases=total_test_cases,
+                passed=passed_cases,
+                failed=failed_cases,
+                unsupported=0,
+            )
+            log(f"I/O contract: {passed_cases}/{total_test_cases} passed", log_fh)
 
-    # Finalize and save metrics
-    if collector:
-        collector.start_phase("reporting")
-        metrics = collector.finalize()
+        # Finalize and save metrics
+        if collector:
+            collector.start_phase("reporting")
+            metrics = collector.finalize()
 
-        # Save metrics JSON
-        metrics_dir = Path(project_dir) / "metrics"
-        metrics_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        metrics_file = metrics_dir / f"run_{timestamp}.json"
+            # Save metrics JSON
+            metrics_dir = Path(project_dir) / "metrics"
+            metrics_dir.mkdir(exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            metrics_file = metrics_dir / f"run_{timestamp}.json"
 
-        with open(metrics_file, "w") as f:
-            f.write(metrics.to_json())
-        log(f"Metrics saved: {metrics_file}", log_file)
+            metrics.save(str(metrics_file))
+            log(f"Metrics saved: {metrics_file}", log_fh)
 
-        # Generate report
-        try:
-            from .reporting.generator import ReportGenerator
+            # Generate report
+            try:
+                from .reporting.generator import ReportGenerator
 
-            generator = ReportGenerator()
-            report = generator.generate_run_report(metrics)
+                generator = ReportGenerator()
+                report = generator.generate_run_report(metrics)
 
-            reports_dir = Path(project_dir) / "reports"
-            reports_dir.mkdir(exist_ok=True)
-            report_file = reports_dir / f"run_{timestamp}.md"
+                reports_dir = Path(project_dir) / "reports"
+                reports_dir.mkdir(exist_ok=True)
+                report_file = reports_dir / f"run_{timestamp}.md"
 
-            with open(report_file, "w") as f:
-                f.write(report)
-            log(f"Report saved: {report_file}", log_file)
-        except Exception as e:
-            log(f"Warning: Could not generate report: {e}", log_file)
+                with open(report_file, "w") as f:
+                    f.write(report)
+                log(f"Report saved: {report_file}", log_fh)
+            except Exception as e:
+                log(f"Warning: Could not generate report: {e}", log_fh)
 
-        # Insert metrics into database
-        try:
-            from .reporting.database import MigrationDatabase
+            # Insert metrics into database
+            try:
+                from .reporting.database import MigrationDatabase
 
-            db_path = Path(base_dir) / "migrations.db"
-            db = MigrationDatabase(db_path)
-            db.insert(metrics)
-            log(f"Metrics inserted into database: {db_path}", log_file)
-        except Exception as e:
-            log(f"Warning: Could not insert metrics into database: {e}", log_file)
+                db_path = Path(base_dir) / "migrations.db"
+                with MigrationDatabase(db_path) as db:
+                    db.insert(metrics)
+                log(f"Metrics inserted into database: {db_path}", log_fh)
+            except Exception as e:
+                log(f"Warning: Could not insert metrics into database: {e}", log_fh)
 
-        collector.end_phase("reporting")
-        return collector
+            collector.end_phase("reporting")
+            return collector
 
-    return None
+        return None
 
 
-def _log_message(message: Any, count: int, log_file: Path) -> None:
+def _log_message(message: Any, count: int, log_file: TextIO) -> None:
     """Log a message from the SDK."""
     log(f"MSG #{count}: type={type(message).__name__}", log_file, also_print=False)
 
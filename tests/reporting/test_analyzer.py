@@ -1,16 +1,40 @@
 """Unit tests for PostHocAnalyzer."""
 
+import io
 import json
+import os
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from migration.reporting.analyzer import PostHocAnalyzer
+from migration.reporting.analyzer import (
+    _PYTHON_INPUTS,
+    _RUST_BUILD_DIRS,
+    _RUST_INPUTS,
+    PostHocAnalyzer,
+    _count_and_partition,
+    _FileCache,
+    _fingerprint,
+    _get_executor,
+    _is_go_test,
+    _JsonLineStream,
+    _loads,
+)
 from migration.reporting.schema import CodeMetrics
 
 
+def _stream_output(mock_popen: MagicMock, returncode: int, stdout: str) -> None:
+    """Make a patched Popen stream ``stdout`` as bytes and exit with ``returncode``."""
+    proc = mock_popen.return_value.__enter__.return_value
+    proc.stdout = io.BytesIO(stdout.encode())
+    proc.wait.return_value = returncode
+    proc.poll.return_value = returncode
+
+
 class TestPostHocAnalyzerInit:
     """Tests for PostHocAnalyzer initialization."""
 
@@ -19,11 +43,182 @@ class TestPostHocAnalyzerInit:
         analyzer = PostHocAnalyzer()
         assert analyzer is not None
 
+    def test_executor_is_shared(self) -> None:
+        """Test the metric-collection pool is created once and reused."""
+        assert _get_executor() is _get_executor()
+
+
+class TestFileCache:
+    """Tests for the per-file result cache."""
+
+    def test_recomputes_only_changed_files(self, tmp_path: Path) -> None:
+        """Test a result is reused until its file's size or mtime changes."""
+        file = tmp_path / "a.txt"
+        file.write_text("one")
+        compute = MagicMock(side_effect=lambda path: path.read_text())
+
+        cache = _FileCache()
+        assert cache.get("text", file, compute) == "one"
+        assert cache.get("text", file, compute) == "one"
+        assert compute.call_count == 1
+
+        file.write_text("three")
+        assert cache.get("text", file, compute) == "three"
+        assert compute.call_count == 2
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        """Test saved entries are loaded by a new cache on the same file."""
+        file = tmp_path / "a.txt"
+        file.write_text("one")
+        cache_file = tmp_path / "cache" / "files.pickle"
+
+        cache = _FileCache(cache_file)
+        cache.get("size", file, lambda path: path.stat().st_size)
+        cache.save()
+
+        compute = MagicMock(return_value=-1)
+        assert _FileCache(cache_file).get("size", file, compute) == 3
+        compute.assert_not_called()
+
+    def test_corrupt_cache_file_is_ignored(self, tmp_path: Path) -> None:
+        """Test an unreadable pickle starts an empty cache."""
+        cache_file = tmp_path / "files.pickle"
+        cache_file.write_bytes(b"not a pickle")
+        file = tmp_path / "a.txt"
+        file.write_text("one")
+
+        assert _FileCache(cache_file).get("n", file, lambda path: 1) == 1
+
+
+class TestLoads:
+    """Tests for the JSON parsing helper."""
+
+    def test_loads_accepts_str_and_bytes(self) -> None:
+        """Test both subprocess text and bytes output parse the same."""
+        assert _loads('{"a": [1, 2]}') == _loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_loads_raises_json_decode_error(self) -> None:
+        """Test invalid input raises the stdlib decode error type."""
+        with pytest.raises(json.JSONDecodeError):
+            _loads(b"not json")
+
+
+class TestAnalysisCache:
+    """Tests for the on-disk analysis result cache."""
+
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._count_loc")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_lizard")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_radon_mi")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._count_python_deps")
+    def test_cache_hit_skips_tools(
+        self,
+        mock_deps: MagicMock,
+        mock_radon: MagicMock,
+        mock_lizard: MagicMock,
+        mock_cloc: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test an unchanged tree is served from the cache."""
+        mock_cloc.return_value = {"code": 42, "comment": 0, "blank": 0}
+        mock_lizard.return_value = None
+        mock_radon.return_value = 80.0
+        mock_deps.return_value = 1
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "main.py").write_text("def main(): pass\n")
+
+        analyzer = PostHocAnalyzer(cache_dir=tmp_path / "cache")
+        first = analyzer.analyze_python_source(source)
+        second = analyzer.analyze_python_source(source)
+
+        assert first == second
+        assert second.production_loc == 42
+        assert mock_cloc.call_count == 1
+
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._check_go_build")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_go_test_with_cov")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._get_go_coverage")
+    def test_changed_file_misses_cache(
+        self,
+        mock_coverage: MagicMock,
+        mock_test: MagicMock,
+        mock_build: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test modifying an input file invalidates the cached result."""
+        from migration.reporting.schema import CoverageResult, TestOutcomeResult
+
+        mock_build.return_value = True
+        mock_test.return_value = (
+            TestOutcomeResult(passed=True, total=2),
+            tmp_path / "coverage.out",
+        )
+        mock_coverage.return_value = CoverageResult(line_coverage_pct=50.0)
+        (tmp_path / "main.go").write_text("package main\n")
+
+        analyzer = PostHocAnalyzer(cache_dir=tmp_path / ".cache")
+        analyzer.analyze_go_quality(tmp_path)
+        cached = analyzer.analyze_go_quality(tmp_path)
+        assert cached.coverage.line_coverage_pct == 50.0
+        assert mock_build.call_count == 1
+
+        (tmp_path / "main.go").write_text("package main\n\nfunc f() {}\n")
+        analyzer.analyze_go_quality(tmp_path)
+        assert mock_build.call_count == 2
+
+    def test_fingerprint_ignores_build_dirs(self, tmp_path: Path) -> None:
+        """Test files under target/ do not change the fingerprint."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "lib.rs").write_text("pub fn f() {}\n")
+        (tmp_path / "Cargo.toml").write_text("[package]\n")
+        before = _fingerprint("rust", tmp_path, _RUST_INPUTS, _RUST_BUILD_DIRS)
+
+        build = tmp_path / "target" / "debug" / "build" / "out"
+        build.mkdir(parents=True)
+        (build / "generated.rs").write_text("// generated\n")
+
+        assert _fingerprint("rust", tmp_path, _RUST_INPUTS, _RUST_BUILD_DIRS) == before
+        (tmp_path / "Cargo.toml").write_text("[package]\nname = 'x'\n")
+        assert _fingerprint("rust", tmp_path, _RUST_INPUTS, _RUST_BUILD_DIRS) != before
+
+    def test_fingerprint_hashes_nested_build_named_package(
+        self, tmp_path: Path
+    ) -> None:
+        """Test only top-level build dirs are skipped, not same-named packages."""
+        package = tmp_path / "src" / "build"
+        package.mkdir(parents=True)
+        (package / "steps.py").write_text("STEPS = 1\n")
+        before = _fingerprint("python", tmp_path, _PYTHON_INPUTS)
+
+        (package / "steps.py").write_text("STEPS = 2\n")
+
+        assert _fingerprint("python", tmp_path, _PYTHON_INPUTS) != before
+
+    def test_fingerprint_includes_parent_dependency_files(self, tmp_path: Path) -> None:
+        """Test the parent's dependency files, read as a fallback, are hashed."""
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "main.py").write_text("def main(): pass\n")
+        (tmp_path / "requirements.txt").write_text("requests\n")
+        before = _fingerprint("python", source, _PYTHON_INPUTS)
+
+        (tmp_path / "requirements.txt").write_text("requests\nclick\n")
+        assert _fingerprint("python", source, _PYTHON_INPUTS) != before
+
+    def test_fingerprint_skips_dangling_symlink(self, tmp_path: Path) -> None:
+        """Test a symlink to a missing file does not break fingerprinting."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "lib.rs").write_text("pub fn f() {}\n")
+        before = _fingerprint("rust", tmp_path, _RUST_INPUTS)
+        (tmp_path / "src" / "gone.rs").symlink_to(tmp_path / "nonexistent.rs")
+
+        assert _fingerprint("rust", tmp_path, _RUST_INPUTS) == before
+
 
 class TestAnalyzePythonSource:
     """Tests for analyze_python_source method."""
 
-    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_cloc")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._count_loc")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._run_lizard")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._run_radon_mi")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._count_python_deps")
@@ -72,7 +267,7 @@ class TestAnalyzeRustTarget:
     @patch(
         "migration.reporting.analyzer.PostHocAnalyzer._count_rust_loc_with_inline_tests"
     )
-    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_cloc")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._count_loc")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._run_lizard")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._count_cargo_deps")
     def test_analyze_rust_target(
@@ -159,11 +354,36 @@ mod tests {
             assert prod_loc == 9  # 6 + 3
             assert test_loc == 8
 
+    def test_count_rust_loc_marker_mid_line(self, tmp_path: Path) -> None:
+        """Test the line holding the cfg(test) marker counts as test code."""
+        src_dir = tmp_path / "src"
+        src_dir.mkdir()
+        (src_dir / "lib.rs").write_bytes(
+            b"pub fn a() {}\r\n  // note\r\n\t\r\n"
+            b"    #[cfg(test)] mod tests {}\nfn t() {}\n"
+        )
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_rust_loc_with_inline_tests(src_dir) == (1, 2)
+
+    def test_count_rust_loc_recounts_modified_file(self, tmp_path: Path) -> None:
+        """Test memoized per-file counts are refreshed when a file changes."""
+        src_dir = tmp_path / "src"
+        src_dir.mkdir()
+        lib = src_dir / "lib.rs"
+        lib.write_text("pub fn one() {}\n")
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_rust_loc_with_inline_tests(src_dir) == (1, 0)
+        assert analyzer._count_rust_loc_with_inline_tests(src_dir) == (1, 0)
+
+        lib.write_text("pub fn one() {}\npub fn two() {}\n")
+        assert analyzer._count_rust_loc_with_inline_tests(src_dir) == (2, 0)
+
 
 class TestAnalyzeRustQuality:
     """Tests for analyze_rust_quality method."""
 
-    @patch("migration.reporting.analyzer.PostHocAnalyzer._check_cargo_check")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._check_cargo_clippy")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._check_cargo_fmt")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._run_cargo_test")
@@ -174,7 +394,6 @@ class TestAnalyzeRustQuality:
         mock_test: MagicMock,
         mock_fmt: MagicMock,
         mock_clippy: MagicMock,
-        mock_check: MagicMock,
     ) -> None:
         """Test analyzing Rust quality gates."""
         from migration.reporting.schema import (
@@ -185,8 +404,10 @@ class TestAnalyzeRustQuality:
             TestOutcomeResult,
         )
 
-        mock_check.return_value = CompilationResult(passed=True)
-        mock_clippy.return_value = LintingResult(passed=True, tool="clippy")
+        mock_clippy.return_value = (
+            CompilationResult(passed=True),
+            LintingResult(passed=True, tool="clippy"),
+        )
         mock_fmt.return_value = FormattingResult(passed=True, tool="rustfmt")
         mock_test.return_value = TestOutcomeResult(
             passed=True, total=10, passed_count=10, failed_count=0, skipped_count=0
@@ -206,6 +427,84 @@ class TestAnalyzeRustQuality:
         assert quality.coverage is not None
         assert quality.coverage.line_coverage_pct == 85.0
 
+    def test_cargo_env_reuses_package_target_dir(self) -> None:
+        """Test cargo steps build into the package's existing target/."""
+        analyzer = PostHocAnalyzer()
+        env = analyzer._cargo_env(Path("/proj"))
+
+        assert env["CARGO_TARGET_DIR"] == "/proj/target"
+        assert env["CARGO_INCREMENTAL"] == "1"
+
+
+class TestAnalyzeGoQuality:
+    """Tests for analyze_go_quality method."""
+
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._check_go_build")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_go_test_with_cov")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._get_go_coverage")
+    def test_analyze_go_quality(
+        self,
+        mock_coverage: MagicMock,
+        mock_test: MagicMock,
+        mock_build: MagicMock,
+    ) -> None:
+        """Test analyzing Go quality gates."""
+        from migration.reporting.schema import CoverageResult, TestOutcomeResult
+
+        mock_build.return_value = True
+        mock_test.return_value = (
+            TestOutcomeResult(passed=True, total=4),
+            Path("/proj/coverage.out"),
+        )
+        mock_coverage.return_value = CoverageResult(line_coverage_pct=77.0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            analyzer = PostHocAnalyzer()
+            quality = analyzer.analyze_go_quality(Path(tmpdir))
+
+        assert quality.compilation.passed is True
+        assert quality.unit_tests.total == 4
+        assert quality.coverage.line_coverage_pct == 77.0
+        mock_coverage.assert_called_once_with(Path(tmpdir), Path("/proj/coverage.out"))
+
+    @patch("subprocess.run")
+    def test_run_go_test_with_cov_single_invocation(
+        self, mock_run: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test one go test run yields both outcomes and the profile."""
+
+        def run_go_test(*args: object, **kwargs: object) -> MagicMock:
+            (tmp_path / "coverage.out").write_text("mode: set\n")
+            return MagicMock(
+                returncode=1,
+                stdout=b"--- PASS: TestA\n--- FAIL: TestB\n--- SKIP: TestC\n",
+            )
+
+        mock_run.side_effect = run_go_test
+
+        analyzer = PostHocAnalyzer()
+        result, profile = analyzer._run_go_test_with_cov(tmp_path)
+
+        assert mock_run.call_count == 1
+        assert "-coverprofile=coverage.out" in mock_run.call_args[0][0]
+        assert (result.passed_count, result.failed_count) == (1, 1)
+        assert result.skipped_count == 1
+        assert result.passed is False
+        assert profile == tmp_path / "coverage.out"
+
+    @patch("subprocess.run")
+    def test_run_go_test_with_cov_ignores_stale_profile(
+        self, mock_run: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test a profile from an earlier run is not reported as current."""
+        (tmp_path / "coverage.out").write_text("mode: set\n")
+        mock_run.return_value = MagicMock(returncode=2, stdout=b"build failed\n")
+
+        analyzer = PostHocAnalyzer()
+        _, profile = analyzer._run_go_test_with_cov(tmp_path)
+
+        assert profile is None
+
 
 class TestRunCloc:
     """Tests for _run_cloc helper method."""
@@ -257,30 +556,149 @@ class TestRunCloc:
         assert result is None
 
 
+class TestRunClocByFile:
+    """Tests for the single-pass per-file cloc helpers."""
+
+    @patch("subprocess.run")
+    def test_run_cloc_by_file_filters_language(self, mock_run: MagicMock) -> None:
+        """Test per-file results keep only the requested language."""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps(
+                {
+                    "header": {"cloc_version": "1.98"},
+                    "a.go": {"blank": 1, "comment": 2, "code": 30, "language": "Go"},
+                    "a_test.go": {
+                        "blank": 0,
+                        "comment": 0,
+                        "code": 12,
+                        "language": "Go",
+                    },
+                    "go.mod": {
+                        "blank": 0,
+                        "comment": 0,
+                        "code": 3,
+                        "language": "Go Module",
+                    },
+                    "SUM": {"blank": 1, "comment": 2, "code": 45, "nFiles": 3},
+                }
+            ),
+        )
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._run_cloc_by_file([Path("/p")], "Go")
+
+        assert result is not None
+        assert sorted(result) == ["a.go", "a_test.go"]
+        assert "--by-file" in mock_run.call_args[0][0]
+
+    def test_split_loc_by_file(self) -> None:
+        """Test per-file counts are summed into production and test buckets."""
+        analyzer = PostHocAnalyzer()
+        prod, test = analyzer._split_loc_by_file(
+            {
+                "a.go": {"code": 30, "comment": 2, "blank": 1},
+                "b.go": {"code": 10, "comment": 0, "blank": 2},
+                "a_test.go": {"code": 12, "comment": 1, "blank": 0},
+            },
+            lambda name: name.endswith("_test.go"),
+        )
+
+        assert prod == {"code": 40, "comment": 2, "blank": 3}
+        assert test == {"code": 12, "comment": 1, "blank": 0}
+
+
+class TestCountAndPartition:
+    """Tests for the scandir-based file counter."""
+
+    def test_counts_recursively_and_partitions(self, tmp_path: Path) -> None:
+        """Test nested files are counted and split by the test predicate."""
+        (tmp_path / "cmd").mkdir()
+        (tmp_path / "main.go").write_text("package main\n")
+        (tmp_path / "main_test.go").write_text("package main\n")
+        (tmp_path / "cmd" / "run.go").write_text("package cmd\n")
+        (tmp_path / "go.mod").write_text("module example\n")
+
+        assert _count_and_partition(tmp_path, ".go", _is_go_test) == (3, 1)
+        assert _count_and_partition(tmp_path, ".go", recursive=False) == (2, 0)
+
+    def test_missing_root_counts_nothing(self, tmp_path: Path) -> None:
+        """Test a missing directory yields zero counts instead of raising."""
+        assert _count_and_partition(tmp_path / "missing", ".go") == (0, 0)
+
+
+class TestCountLoc:
+    """Tests for the in-process LOC counter."""
+
+    def test_count_python_loc(self, tmp_path: Path) -> None:
+        """Test docstrings and # comments count as comments in Python."""
+        (tmp_path / "mod.py").write_text(
+            '"""Module docstring.\n\nMore text.\n"""\n'
+            "\n"
+            "# A comment\n"
+            "def f() -> int:\n"
+            '    """One-line docstring."""\n'
+            "    return 1\n"
+        )
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._count_loc(tmp_path, "Python")
+
+        assert result == {"code": 2, "comment": 5, "blank": 2}
+
+    def test_count_loc_by_file_block_comments(self, tmp_path: Path) -> None:
+        """Test C-style block and line comments are counted per file."""
+        main = tmp_path / "main.go"
+        main.write_text(
+            "/*\n * Package main.\n */\npackage main\n\n// f does things\nfunc f() {}\n"
+        )
+        (tmp_path / "go.mod").write_text("module example\n")
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._count_loc_by_file([tmp_path], "Go")
+
+        assert result == {str(main): {"code": 2, "comment": 4, "blank": 1}}
+
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_cloc")
+    def test_use_cloc_env_falls_back_to_cloc(
+        self,
+        mock_cloc: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test USE_CLOC=1 routes counting through cloc."""
+        monkeypatch.setenv("USE_CLOC", "1")
+        mock_cloc.return_value = {"code": 7}
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_loc(tmp_path, "Rust") == {"code": 7}
+        mock_cloc.assert_called_once_with(tmp_path, "Rust")
+
+
 class TestRunLizard:
     """Tests for _run_lizard helper method."""
 
+    @patch("migration.reporting.analyzer._HAS_LIZARD", False)
     @patch("subprocess.run")
     def test_run_lizard_success(self, mock_run: MagicMock) -> None:
         """Test successful lizard execution."""
-        lizard_output = """
-================================================
-  NLOC    CCN   token  PARAM  length  location
-------------------------------------------------
-      10      2     50      2      12 main@1-12@/path/main.py
-      20      5     80      3      25 process@14-38@/path/main.py
-
-Total nloc   Avg.NLOC  AvgCCN  Avg.token   Fun Cnt  Warning cnt
-      30        15.0     3.5       65.0         2            0
-"""
-        mock_run.return_value = MagicMock(returncode=0, stdout=lizard_output)
+        lizard_output = (
+            "NLOC,CCN,token,PARAM,length,location,file,function,long_name,"
+            "start,end\n"
+            '10,2,50,2,12,"main@1-12@/path/main.py","/path/main.py",'
+            '"main","main( a , b )",1,12\n'
+            '20,5,80,3,25,"process@14-38@/path/main.py","/path/main.py",'
+            '"process","process( x , y , z )",14,38\n'
+        )
+        mock_run.return_value = MagicMock(returncode=0, stdout=lizard_output.encode())
 
         analyzer = PostHocAnalyzer()
-        result = analyzer._run_lizard(Path("/some/path"), "python")
+        result = analyzer._run_lizard(Path("/path"), "python")
 
-        assert result is not None
-        # The parser should extract function count and avg CC
+        assert result == {"function_count": 2, "avg_cc": 3.5, "max_cc": 5}
+        assert "--csv" in mock_run.call_args[0][0]
 
+    @patch("migration.reporting.analyzer._HAS_LIZARD", False)
     @patch("subprocess.run")
     def test_run_lizard_not_found(self, mock_run: MagicMock) -> None:
         """Test lizard not installed."""
@@ -291,6 +709,87 @@ Total nloc   Avg.NLOC  AvgCCN  Avg.token   Fun Cnt  Warning cnt
 
         assert result is None
 
+    def test_run_lizard_library(self, tmp_path: Path) -> None:
+        """Test the lizard library is used in process when installed."""
+        pytest.importorskip("lizard")
+        (tmp_path / "mod.py").write_text(
+            "def f(x):\n    if x:\n        return 1\n    return 0\n"
+        )
+
+        analyzer = PostHocAnalyzer()
+        with patch("subprocess.run") as mock_run:
+            result = analyzer._run_lizard(tmp_path, "python")
+
+        mock_run.assert_not_called()
+        assert result == {"function_count": 1, "avg_cc": 2.0, "max_cc": 2}
+
+    @patch("migration.reporting.analyzer._HAS_LIZARD", False)
+    @patch("subprocess.run")
+    def test_run_lizard_multi_splits_by_suffix(self, mock_run: MagicMock) -> None:
+        """Test one lizard run is split into per-language summaries."""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=(
+                b'4,2,20,1,5,"f@1-5@/src/a.py","/src/a.py","f","f( x )",1,5\n'
+                b'6,6,40,0,8,"g@1-8@/tgt/src/lib.rs","/tgt/src/lib.rs",'
+                b'"g","g( )",1,8\n'
+                b'3,4,30,0,4,"h@9-12@/src/b.py","/src/b.py","h","h( )",9,12\n'
+            ),
+        )
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._run_lizard_multi(
+            {"python": Path("/src"), "rust": Path("/tgt/src")}
+        )
+
+        assert result == {
+            "python": {"function_count": 2, "avg_cc": 3.0, "max_cc": 4},
+            "rust": {"function_count": 1, "avg_cc": 6.0, "max_cc": 6},
+        }
+        cmd = mock_run.call_args[0][0]
+        assert cmd.count("-l") == 2
+        assert mock_run.call_count == 1
+
+    @patch("migration.reporting.analyzer._HAS_LIZARD", False)
+    @patch("subprocess.run")
+    def test_run_lizard_multi_ignores_files_outside_root(
+        self, mock_run: MagicMock
+    ) -> None:
+        """Test a stray file of another language is not counted for it."""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=(
+                b'4,2,20,1,5,"f@1-5@/src/a.py","/src/a.py","f","f( x )",1,5\n'
+                b'6,6,40,0,8,"g@1-8@/tgt/src/lib.rs","/tgt/src/lib.rs",'
+                b'"g","g( )",1,8\n'
+                b'9,9,40,0,8,"s@1-8@/src/other.rs","/src/other.rs",'
+                b'"s","s( )",1,8\n'
+                b'7,7,40,0,8,"t@1-8@/tgt/tool.py","/tgt/tool.py","t","t( )",1,8\n'
+            ),
+        )
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._run_lizard_multi(
+            {"python": Path("/src"), "rust": Path("/tgt/src")}
+        )
+
+        assert result == {
+            "python": {"function_count": 1, "avg_cc": 2.0, "max_cc": 2},
+            "rust": {"function_count": 1, "avg_cc": 6.0, "max_cc": 6},
+        }
+
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_lizard_multi")
+    def test_prefetch_complexity_is_reused(self, mock_multi: MagicMock) -> None:
+        """Test analyze-level paths map to lizard roots and skip a rerun."""
+        summary = {"function_count": 1, "avg_cc": 1.0, "max_cc": 1}
+        mock_multi.return_value = {"rust": summary}
+
+        analyzer = PostHocAnalyzer()
+        analyzer.prefetch_complexity({"rust": Path("/tgt")})
+
+        assert analyzer._run_lizard(Path("/tgt/src"), "rust") == summary
+        mock_multi.assert_called_once_with({"rust": Path("/tgt/src")})
+
 
 class TestCountCargoDeps:
     """Tests for _count_cargo_deps helper method."""
@@ -332,48 +831,106 @@ version = "0.1.0"
 
         assert count == 0
 
+    def test_count_cargo_deps_subtables_and_inline(self, tmp_path: Path) -> None:
+        """Test sub-table and multi-line inline-table dependencies count once."""
+        cargo_path = tmp_path / "Cargo.toml"
+        cargo_path.write_text(
+            "[package]\n"
+            'name = "test"\n'
+            "\n"
+            "[dependencies]\n"
+            'serde = { version = "1.0", features = [\n    "derive",\n] }\n'
+            "\n"
+            "[dependencies.tokio]\n"
+            'version = "1.0"\n'
+            'features = ["full"]\n'
+            "\n"
+            "[dev-dependencies]\n"
+            'proptest = "1.0"\n'
+        )
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_cargo_deps(cargo_path) == 2
+
 
 class TestCheckCargoCommands:
     """Tests for cargo-related check methods."""
 
-    @patch("subprocess.run")
-    def test_check_cargo_check_pass(self, mock_run: MagicMock) -> None:
-        """Test successful cargo check."""
-        mock_run.return_value = MagicMock(returncode=0, stderr="")
+    @patch("subprocess.Popen")
+    def test_check_cargo_clippy_pass(self, mock_popen: MagicMock) -> None:
+        """Test successful clippy run passes compilation and linting."""
+        _stream_output(mock_popen, 0, "")
 
         with tempfile.TemporaryDirectory() as tmpdir:
             analyzer = PostHocAnalyzer()
-            result = analyzer._check_cargo_check(Path(tmpdir))
+            compilation, linting = analyzer._check_cargo_clippy(Path(tmpdir))
 
-        assert result is not None
-        assert result.passed is True
+        assert compilation.passed is True
+        assert linting.passed is True
+        assert linting.tool == "clippy"
 
-    @patch("subprocess.run")
-    def test_check_cargo_check_fail(self, mock_run: MagicMock) -> None:
-        """Test failed cargo check."""
-        mock_run.return_value = MagicMock(
-            returncode=1, stderr="error: expected expression"
-        )
+    @patch("subprocess.Popen")
+    def test_check_cargo_clippy_compile_error(self, mock_popen: MagicMock) -> None:
+        """Test rustc errors fail compilation."""
+        message = {
+            "reason": "compiler-message",
+            "message": {"level": "error", "code": {"code": "E0308"}},
+        }
+        _stream_output(mock_popen, 101, json.dumps(message))
 
         with tempfile.TemporaryDirectory() as tmpdir:
             analyzer = PostHocAnalyzer()
-            result = analyzer._check_cargo_check(Path(tmpdir))
-
-        assert result is not None
-        assert result.passed is False
-
-    @patch("subprocess.run")
-    def test_check_cargo_clippy_pass(self, mock_run: MagicMock) -> None:
-        """Test successful clippy check."""
-        mock_run.return_value = MagicMock(returncode=0, stderr="")
+            compilation, linting = analyzer._check_cargo_clippy(Path(tmpdir))
+
+        assert compilation.passed is False
+        assert compilation.error_count == 1
+        assert linting.passed is False
+
+    @patch("subprocess.Popen")
+    def test_check_cargo_clippy_lint_only(self, mock_popen: MagicMock) -> None:
+        """Test denied lints and rustc's summaries do not fail compilation."""
+        lines = [
+            {
+                "reason": "compiler-message",
+                "message": {
+                    "level": "error",
+                    "code": {"code": "clippy::needless_return"},
+                },
+            },
+            {
+                "reason": "compiler-message",
+                "message": {"level": "warning", "code": {"code": "dead_code"}},
+            },
+            {
+                "reason": "compiler-message",
+                "message": {
+                    "level": "error",
+                    "code": None,
+                    "message": "aborting due to 1 previous error; 1 warning emitted",
+                    "spans": [],
+                },
+            },
+            {
+                "reason": "compiler-message",
+                "message": {
+                    "level": "warning",
+                    "code": None,
+                    "message": "1 warning emitted",
+                    "spans": [],
+                },
+            },
+        ]
+        _stream_output(mock_popen, 101, "\n".join(json.dumps(line) for line in lines))
 
         with tempfile.TemporaryDirectory() as tmpdir:
             analyzer = PostHocAnalyzer()
-            result = analyzer._check_cargo_clippy(Path(tmpdir))
+            compilation, linting = analyzer._check_cargo_clippy(Path(tmpdir))
 
-        assert result is not None
-        assert result.passed is True
-        assert result.tool == "clippy"
+        assert compilation.passed is True
+        assert compilation.error_count == 0
+        assert linting.passed is False
+        assert linting.error_count == 1
+        assert linting.warning_count == 1
 
     @patch("subprocess.run")
     def test_check_cargo_fmt_pass(self, mock_run: MagicMock) -> None:
@@ -387,8 +944,8 @@ class TestCheckCargoCommands:
         assert result is not None
         assert result.passed is True
 
-    @patch("subprocess.run")
-    def test_run_cargo_test_pass(self, mock_run: MagicMock) -> None:
+    @patch("subprocess.Popen")
+    def test_run_cargo_test_pass(self, mock_popen: MagicMock) -> None:
         """Test successful cargo test."""
         test_output = """
 running 5 tests
@@ -400,7 +957,7 @@ test test_five ... ok
 
 test result: ok. 5 passed; 0 failed; 0 ignored
 """
-        mock_run.return_value = MagicMock(returncode=0, stdout=test_output, stderr="")
+        _stream_output(mock_popen, 0, test_output)
 
         with tempfile.TemporaryDirectory() as tmpdir:
             analyzer = PostHocAnalyzer()
@@ -409,8 +966,8 @@ test result: ok. 5 passed; 0 failed; 0 ignored
         assert result is not None
         assert result.passed is True
 
-    @patch("subprocess.run")
-    def test_run_cargo_test_fail(self, mock_run: MagicMock) -> None:
+    @patch("subprocess.Popen")
+    def test_run_cargo_test_fail(self, mock_popen: MagicMock) -> None:
         """Test failed cargo test."""
         test_output = """
 running 5 tests
@@ -419,7 +976,7 @@ test test_two ... FAILED
 
 test result: FAILED. 1 passed; 1 failed; 0 ignored
 """
-        mock_run.return_value = MagicMock(returncode=1, stdout=test_output, stderr="")
+        _stream_output(mock_popen, 1, test_output)
 
         with tempfile.TemporaryDirectory() as tmpdir:
             analyzer = PostHocAnalyzer()
@@ -427,6 +984,59 @@ test result: FAILED. 1 passed; 1 failed; 0 ignored
 
         assert result is not None
         assert result.passed is False
+        assert result.failed_count == 1
+
+    @patch("subprocess.Popen")
+    def test_run_cargo_test_json_events(self, mock_popen: MagicMock) -> None:
+        """Test libtest JSON events are counted as they stream in."""
+        events = [
+            {"type": "suite", "event": "started", "test_count": 3},
+            {"type": "test", "event": "ok", "name": "a"},
+            {"type": "test", "event": "failed", "name": "b"},
+            {"type": "test", "event": "ignored", "name": "c"},
+        ]
+        output = "   Compiling rpn2tex\n" + "\n".join(json.dumps(e) for e in events)
+        _stream_output(mock_popen, 101, output)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            analyzer = PostHocAnalyzer()
+            result = analyzer._run_cargo_test(Path(tmpdir))
+
+        assert result.total == 3
+        assert result.passed_count == 1
+        assert result.failed_count == 1
+        assert result.skipped_count == 1
+        assert result.passed is False
+
+
+class TestJsonLineStream:
+    """Tests for streaming JSON lines from a subprocess."""
+
+    def test_yields_json_and_keeps_text(self, tmp_path: Path) -> None:
+        """Test JSON objects are yielded and other lines are kept as text."""
+        script = "print('plain'); print('{\"a\": 1}'); raise SystemExit(3)"
+        stream = _JsonLineStream(
+            [sys.executable, "-c", script],
+            cwd=tmp_path,
+            env=dict(os.environ),
+            timeout=30,
+        )
+
+        assert list(stream) == [{"a": 1}]
+        assert stream.text_lines == [b"plain\n"]
+        assert stream.returncode == 3
+
+    def test_timeout_kills_process(self, tmp_path: Path) -> None:
+        """Test the watchdog kills a command that overruns its timeout."""
+        stream = _JsonLineStream(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            cwd=tmp_path,
+            env=dict(os.environ),
+            timeout=0.2,
+        )
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            list(stream)
 
 
 class TestCalculateMI:
@@ -476,11 +1086,45 @@ from flask import Flask
         # Should count third-party imports (requests, numpy, flask)
         assert count >= 0
 
+    def test_count_python_deps_pyproject(self, tmp_path: Path) -> None:
+        """Test only [project] dependencies are counted from pyproject.toml."""
+        (tmp_path / "pyproject.toml").write_text(
+            "[project]\n"
+            'name = "demo"\n'
+            'dependencies = ["pyyaml>=6.0", "jinja2>=3.0"]\n'
+            "\n"
+            "[project.optional-dependencies]\n"
+            'dev = ["pytest>=8.0"]\n'
+        )
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_python_deps(tmp_path) == 2
+
+    def test_count_python_deps_multiline_array(self, tmp_path: Path) -> None:
+        """Test a multi-line dependency array with comments is counted."""
+        (tmp_path / "pyproject.toml").write_text(
+            "[project]\n"
+            "dependencies = [\n"
+            '    "pyyaml>=6.0",  # config\n'
+            '    "jinja2>=3.0", "click",\n'
+            "]\n"
+        )
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_python_deps(tmp_path) == 3
+
+    def test_count_python_deps_invalid_pyproject(self, tmp_path: Path) -> None:
+        """Test an unparseable pyproject.toml counts as no dependencies."""
+        (tmp_path / "pyproject.toml").write_text("[project\n")
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_python_deps(tmp_path) == 0
+
 
 class TestAnalyzeJavaTarget:
     """Tests for analyze_java_target method."""
 
-    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_cloc")
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._count_loc_by_file")
     @patch("migration.reporting.analyzer.PostHocAnalyzer._run_lizard")
     def test_analyze_java_target(
         self,
@@ -488,10 +1132,21 @@ class TestAnalyzeJavaTarget:
         mock_cloc: MagicMock,
     ) -> None:
         """Test analyzing Java target code."""
-        mock_cloc.return_value = {"code": 700, "comment": 150, "blank": 70}
         mock_lizard.return_value = {"function_count": 40, "avg_cc": 3.0, "max_cc": 12}
 
         with tempfile.TemporaryDirectory() as tmpdir:
+            mock_cloc.return_value = {
+                f"{tmpdir}/src/main/java/Main.java": {
+                    "code": 700,
+                    "comment": 150,
+                    "blank": 70,
+                },
+                f"{tmpdir}/src/test/java/MainTest.java": {
+                    "code": 90,
+                    "comment": 5,
+                    "blank": 9,
+                },
+            }
             # Create Java project structure
             src_dir = Path(tmpdir) / "src" / "main" / "java"
             src_dir.mkdir(parents=True)
@@ -501,8 +1156,29 @@ class TestAnalyzeJavaTarget:
             metrics = analyzer.analyze_java_target(Path(tmpdir))
 
         assert metrics.production_loc == 700
+        assert metrics.total_loc == 920
+        assert metrics.test_loc == 90
         assert metrics.function_count == 40
 
+    @patch("migration.reporting.analyzer.PostHocAnalyzer._run_lizard")
+    def test_project_under_src_test_ancestor(
+        self, mock_lizard: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test a src/test directory above the project is not test code."""
+        mock_lizard.return_value = None
+        project = tmp_path / "src" / "test" / "proj"
+        main_dir = project / "src" / "main" / "java"
+        test_dir = project / "src" / "test" / "java"
+        main_dir.mkdir(parents=True)
+        test_dir.mkdir(parents=True)
+        (main_dir / "Main.java").write_text("class Main {\n    int x;\n}\n")
+        (test_dir / "MainTest.java").write_text("class MainTest {\n}\n")
+
+        metrics = PostHocAnalyzer().analyze_java_target(project)
+
+        assert metrics.production_loc == 3
+        assert metrics.test_loc == 2
+
     def test_analyze_java_target_no_src(self) -> None:
         """Test analyzing when src directory doesn't exist."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -515,10 +1191,11 @@ class TestAnalyzeJavaTarget:
 class TestRunRadonMI:
     """Tests for _run_radon_mi helper."""
 
+    @patch("migration.reporting.analyzer._HAS_RADON", False)
     @patch("subprocess.run")
     def test_run_radon_mi_success(self, mock_run: MagicMock) -> None:
         """Test successful radon MI execution."""
-        radon_output = "main.py - A (85.50)"
+        radon_output = b"main.py - A (85.50)"
         mock_run.return_value = MagicMock(returncode=0, stdout=radon_output)
 
         analyzer = PostHocAnalyzer()
@@ -527,6 +1204,7 @@ class TestRunRadonMI:
         # Should extract average MI
         assert result is None or isinstance(result, float)
 
+    @patch("migration.reporting.analyzer._HAS_RADON", False)
     @patch("subprocess.run")
     def test_run_radon_mi_failure(self, mock_run: MagicMock) -> None:
         """Test radon MI execution failure."""
@@ -537,6 +1215,19 @@ class TestRunRadonMI:
 
         assert result is None
 
+    def test_run_radon_mi_library(self, tmp_path: Path) -> None:
+        """Test the radon library is used in process when installed."""
+        pytest.importorskip("radon")
+        (tmp_path / "mod.py").write_text("def f():\n    return 1\n")
+
+        analyzer = PostHocAnalyzer()
+        with patch("subprocess.run") as mock_run:
+            result = analyzer._run_radon_mi(tmp_path)
+
+        mock_run.assert_not_called()
+        assert result is not None
+        assert 0.0 < result <= 100.0
+
 
 class TestCountJavaDeps:
     """Tests for _count_java_deps helper."""
@@ -564,6 +1255,82 @@ dependencies {
         # Should count dependencies
         assert count >= 0
 
+    def test_count_java_deps_pom(self, tmp_path: Path) -> None:
+        """Test counting <dependency> tags in pom.xml."""
+        (tmp_path / "pom.xml").write_text(
+            "<project><dependencies>"
+            "<dependency><artifactId>a</artifactId></dependency>"
+            "<dependency><artifactId>b</artifactId></dependency>"
+            "</dependencies></project>"
+        )
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_java_deps(tmp_path) == 2
+
+
+class TestCountGoDeps:
+    """Tests for _count_go_deps helper."""
+
+    def test_count_go_deps(self, tmp_path: Path) -> None:
+        """Test single-line and block requires count, replace blocks do not."""
+        go_mod = tmp_path / "go.mod"
+        go_mod.write_text(
+            "module example.com/rpn2tex\n"
+            "\n"
+            "go 1.21\n"
+            "\n"
+            "require github.com/spf13/cobra v1.8.0\n"
+            "\n"
+            "require (\n"
+            "\t// pinned for go 1.21\n"
+            "\tgolang.org/x/text v0.14.0\n"
+            "\tgithub.com/pkg/errors v0.9.1 // indirect\n"
+            ")\n"
+            "\n"
+            "replace (\n"
+            "\tgolang.org/x/text v0.14.0 => ../text\n"
+            ")\n"
+        )
+
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_go_deps(go_mod) == 3
+
+    def test_count_go_deps_missing_file(self, tmp_path: Path) -> None:
+        """Test an unreadable go.mod counts as no dependencies."""
+        analyzer = PostHocAnalyzer()
+        assert analyzer._count_go_deps(tmp_path / "go.mod") == 0
+
+
+class TestGetJacocoCoverage:
+    """Tests for _get_jacoco_coverage helper."""
+
+    def test_reads_only_report_level_counters(self, tmp_path: Path) -> None:
+        """Test package and class counters do not override report totals."""
+        pytest.importorskip("defusedxml")
+        report_dir = tmp_path / "build" / "reports" / "jacoco" / "test"
+        report_dir.mkdir(parents=True)
+        (report_dir / "jacocoTestReport.xml").write_text(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<report name="rpn2tex">'
+            '<package name="com/rpn2tex">'
+            '<class name="com/rpn2tex/Lexer">'
+            '<counter type="LINE" missed="9" covered="1"/>'
+            "</class>"
+            '<counter type="LINE" missed="9" covered="1"/>'
+            "</package>"
+            '<counter type="LINE" missed="1" covered="3"/>'
+            '<counter type="BRANCH" missed="1" covered="1"/>'
+            '<counter type="METHOD" missed="0" covered="5"/>'
+            "</report>"
+        )
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._get_jacoco_coverage(tmp_path)
+
+        assert result.line_coverage_pct == 75.0
+        assert result.branch_coverage_pct == 50.0
+        assert result.function_coverage_pct == 100.0
+
 
 class TestGetCargoCoverage:
     """Tests for _get_cargo_coverage helper."""
@@ -572,7 +1339,7 @@ class TestGetCargoCoverage:
     def test_get_cargo_coverage_success(self, mock_run: MagicMock) -> None:
         """Test successful cargo coverage."""
         mock_run.return_value = MagicMock(
-            returncode=0, stdout="Coverage: 92.5%", stderr=""
+            returncode=0, stdout=b"Coverage: 92.5%", stderr=b""
         )
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -584,6 +1351,62 @@ class TestGetCargoCoverage:
             result.line_coverage_pct, (float, type(None))
         )
 
+    @patch("subprocess.run")
+    def test_llvm_cov_preferred_over_tarpaulin(
+        self, mock_run: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test tarpaulin is not run when llvm-cov reports coverage."""
+        summary = {
+            "data": [
+                {
+                    "totals": {
+                        "lines": {"count": 10, "percent": 90.0},
+                        "functions": {"count": 4, "percent": 75.0},
+                    }
+                }
+            ]
+        }
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout=json.dumps(summary).encode(), stderr=b""
+        )
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._get_cargo_coverage(tmp_path)
+
+        assert mock_run.call_count == 1
+        assert mock_run.call_args[0][0][1] == "llvm-cov"
+        assert result.line_coverage_pct == 90.0
+        assert result.function_coverage_pct == 75.0
+
+    @patch("subprocess.run")
+    def test_tarpaulin_fallback_uses_private_output_dir(
+        self, mock_run: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test tarpaulin runs only without llvm-cov, in a private output dir."""
+
+        def run(cmd: list[str], **kwargs: object) -> MagicMock:
+            if cmd[1] == "llvm-cov":
+                return MagicMock(
+                    returncode=101,
+                    stdout=b"",
+                    stderr=b"error: no such command: `llvm-cov`",
+                )
+            out_dir = Path(cmd[cmd.index("--output-dir") + 1])
+            (out_dir / "tarpaulin-report.json").write_text('{"coverage": 81.5}')
+            return MagicMock(returncode=0, stdout=b"", stderr=b"")
+
+        mock_run.side_effect = run
+
+        analyzer = PostHocAnalyzer()
+        result = analyzer._get_cargo_coverage(tmp_path)
+
+        tarpaulin_cmd = mock_run.call_args_list[1][0][0]
+        assert tarpaulin_cmd[1] == "tarpaulin"
+        out_dir = Path(tarpaulin_cmd[tarpaulin_cmd.index("--output-dir") + 1])
+        assert out_dir.name.startswith("tarpaulin-")
+        assert not out_dir.exists()
+        assert result.line_coverage_pct == 81.5
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,14 +1,18 @@
 """Unit tests for reporting CLI."""
 
 import argparse
+import os
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from migration.reporting.cli import (
+    _latest_log,
+    cmd_analyze,
     cmd_backfill,
     cmd_compare,
     cmd_export,
@@ -74,6 +78,55 @@ def create_test_metrics(
     )
 
 
+class TestCmdAnalyze:
+    """Tests for cmd_analyze log discovery."""
+
+    def test_latest_log_picks_newest(self, tmp_path: Path) -> None:
+        """Test the most recently modified .log/.txt file is chosen."""
+        for mtime, name in enumerate(["a.log", "b.txt", "c.md"], start=1):
+            path = tmp_path / name
+            path.write_text("")
+            os.utime(path, (mtime, mtime))
+
+        assert _latest_log(tmp_path) == tmp_path / "b.txt"
+
+    def test_analyze_no_logs(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test analyze fails when the directory has no log files."""
+        args = argparse.Namespace(migration_dir=str(tmp_path))
+
+        assert cmd_analyze(args) == 1
+        assert "No log files found" in capsys.readouterr().err
+
+    @patch("migration.reporting.analyzer.PostHocAnalyzer")
+    def test_analyze_collects_quality_gates(
+        self, mock_analyzer_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test quality gates run alongside the scans and land in the metrics."""
+        migration_dir = tmp_path / "runs" / "rpn2tex-rs"
+        (migration_dir / "src").mkdir(parents=True)
+        (migration_dir / "migration_20250101_100000.log").write_text(
+            "[10:00:00] MSG #1: type=SystemMessage\n"
+        )
+        analyzer = mock_analyzer_cls.return_value
+        analyzer.analyze_rust_target.return_value = CodeMetrics(production_loc=7)
+        gates = QualityGates()
+        gates.formatting.passed = True
+        analyzer.analyze_rust_quality.return_value = gates
+
+        args = argparse.Namespace(
+            migration_dir=str(migration_dir), database=tmp_path / "m.db"
+        )
+
+        assert cmd_analyze(args) == 0
+        analyzer.analyze_rust_quality.assert_called_once_with(migration_dir)
+        analyzer.analyze_python_source.assert_not_called()
+        saved = next((migration_dir / "metrics").glob("run_*.json")).read_text()
+        assert '"production_loc": 7' in saved
+        assert '"passed": true' in saved
+
+
 class TestCmdReport:
     """Tests for cmd_report command."""
 
@@ -170,6 +223,7 @@ class TestCmdQuery:
                 strategy=None,
                 status=None,
                 limit=20,
+                project_prefix=None,
             )
 
             result = cmd_query(args)
@@ -192,6 +246,7 @@ class TestCmdQuery:
                 strategy=None,
                 status=None,
                 limit=20,
+                project_prefix=None,
             )
 
             result = cmd_query(args)
@@ -214,6 +269,7 @@ class TestCmdQuery:
                 strategy=None,
                 status=None,
                 limit=20,
+                project_prefix=None,
             )
 
             result = cmd_query(args)
@@ -222,6 +278,30 @@ class TestCmdQuery:
         captured = capsys.readouterr()
         assert "Found 1 migration(s)" in captured.out
 
+    def test_query_with_project_prefix(self, capsys: pytest.CaptureFixture) -> None:
+        """Test query with a case-insensitive project prefix filter."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db = MigrationDatabase(Path(f.name))
+            db.insert(create_test_metrics(run_id="run-1", project="rpn2tex"))
+            db.insert(create_test_metrics(run_id="run-2", project="RPN_calc"))
+            db.insert(create_test_metrics(run_id="run-3", project="other"))
+
+            args = argparse.Namespace(
+                database=Path(f.name),
+                project=None,
+                target=None,
+                strategy=None,
+                status=None,
+                limit=20,
+                project_prefix="rpn",
+            )
+
+            result = cmd_query(args)
+
+        assert result == 0
+        captured = capsys.readouterr()
+        assert "Found 2 migration(s)" in captured.out
+
 
 class TestCmdExport:
     """Tests for cmd_export command."""
@@ -360,6 +440,7 @@ class TestCmdBackfill:
                 project=None,
                 strategy=None,
                 metrics_output=None,
+                batch=False,
             )
 
             result = cmd_backfill(args)
@@ -394,6 +475,7 @@ class TestCmdBackfill:
                 project="my-project",
                 strategy="feature-by-feature",
                 metrics_output=metrics_file.name,
+                batch=False,
             )
 
             result = cmd_backfill(args)
@@ -403,6 +485,75 @@ class TestCmdBackfill:
         assert "my-project" in captured.out
         assert "feature-by-feature" in captured.out
 
+    def test_backfill_batch(self, tmp_path: Path) -> None:
+        """Test batch backfill parses every matching log into the database."""
+        for name in ["migration_20250101_100000", "migration_20250102_100000"]:
+            (tmp_path / f"{name}.log").write_text(
+                "[10:00:00] Starting Migration: rpn2tex -> go\n"
+                f"[10:00:01] ResultMessage(session_id='{name}')\n"
+            )
+        (tmp_path / "notes.txt").write_text("not a log")
+        db_path = tmp_path / "m.db"
+
+        args = argparse.Namespace(
+            database=db_path,
+            log_file=str(tmp_path / "*.log"),
+            project=None,
+            strategy="module-by-module",
+            metrics_output=None,
+            batch=True,
+        )
+
+        assert cmd_backfill(args) == 0
+        db = MigrationDatabase(db_path)
+        assert db.count() == 2
+        run = db.get("migration_20250102_100000")
+        assert run is not None
+        assert run.identity.strategy == "module-by-module"
+        assert (tmp_path / "metrics_migration_20250101_100000.json").exists()
+
+    def test_backfill_batch_multi_directory_pattern(self, tmp_path: Path) -> None:
+        """Test wildcards in directory components expand across runs."""
+        for run in ["go-1", "go-2"]:
+            log_dir = tmp_path / "runs" / run / "logs"
+            log_dir.mkdir(parents=True)
+            (log_dir / f"migration_{run}.log").write_text(
+                "[10:00:00] Starting Migration: rpn2tex -> go\n"
+                f"[10:00:01] ResultMessage(session_id='{run}')\n"
+            )
+        db_path = tmp_path / "m.db"
+
+        args = argparse.Namespace(
+            database=db_path,
+            log_file=str(tmp_path / "runs" / "*" / "logs" / "migration_*.log"),
+            project=None,
+            strategy=None,
+            metrics_output=None,
+            batch=True,
+        )
+
+        assert cmd_backfill(args) == 0
+        assert MigrationDatabase(db_path).count() == 2
+        assert (
+            tmp_path / "runs" / "go-2" / "logs" / "metrics_migration_go-2.json"
+        ).exists()
+
+    def test_backfill_batch_no_matches(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test batch backfill fails when the pattern matches nothing."""
+        args = argparse.Namespace(
+            database=tmp_path / "m.db",
+            log_file=str(tmp_path / "*.log"),
+            project=None,
+            strategy=None,
+            metrics_output=None,
+            batch=True,
+        )
+
+        assert cmd_backfill(args) == 1
+        assert "No log files match" in capsys.readouterr().err
+
 
 class TestCmdStats:
     """Tests for cmd_stats command."""
@@ -454,6 +605,24 @@ class TestMain:
             result = main()
             assert result == 0
 
+    def test_import_skips_heavy_modules(self) -> None:
+        """Test importing the CLI does not load the analyzer or generator."""
+        code = (
+            "import sys, migration.reporting.cli; "
+            "print(sorted(m for m in sys.modules if m in {"
+            "'migration.reporting.analyzer', 'migration.reporting.collector', "
+            "'migration.reporting.generator'}))"
+        )
+        # A fresh interpreter, since this session already imported them
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        assert result.stdout.strip() == "[]"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
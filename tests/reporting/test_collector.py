@@ -1,11 +1,14 @@
 """Unit tests for MetricsCollector."""
 
 import time
+from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 
-from migration.reporting.collector import MetricsCollector
+from migration.reporting.collector import LogParser, MetricsCollector
+from migration.reporting.schema import IdentityMetrics, _host_info
 
 
 class MockResultMessage:
@@ -51,6 +54,19 @@ class TestMetricsCollector:
         assert metrics.identity.host_platform is not None
         assert " " in metrics.identity.host_platform  # Should have system + release
 
+    def test_identity_host_info_looked_up_once(self) -> None:
+        """Test package metadata is read once, with fresh run IDs per identity."""
+        _host_info.cache_clear()
+        with patch("importlib.metadata.version", return_value="1.2.3") as mock_version:
+            first = IdentityMetrics.create("p", "python", "rust", "module-by-module")
+            second = IdentityMetrics.create("p", "python", "go", "module-by-module")
+        _host_info.cache_clear()
+
+        mock_version.assert_called_once_with("claude-agent-sdk")
+        assert first.sdk_version == second.sdk_version == "1.2.3"
+        assert first.host_platform == second.host_platform
+        assert first.run_id != second.run_id
+
     def test_message_counting(self) -> None:
         """Test that messages are properly counted via record_message()."""
         collector = MetricsCollector("test", "python", "rust", "test")
@@ -165,6 +181,19 @@ class TestMetricsCollector:
         assert "setup" in metrics.timing.phase_durations_ms
         assert metrics.timing.phase_durations_ms["setup"] >= 100
 
+    def test_phase_timing_uses_monotonic_clock(self) -> None:
+        """Test phase durations come from integer monotonic nanoseconds."""
+        collector = MetricsCollector("test", "python", "rust", "test")
+
+        with patch(
+            "migration.reporting.collector.time.monotonic_ns",
+            side_effect=[10_000_000, 12_999_999],
+        ):
+            collector.start_phase("setup")
+            collector.end_phase("setup")
+
+        assert collector.timing.phase_durations_ms["setup"] == 2
+
     def test_finalize_sets_completed_at(self) -> None:
         """Test that finalize sets completed_at timestamp."""
         collector = MetricsCollector("test", "python", "rust", "test")
@@ -336,6 +365,16 @@ class TestMetricsCollector:
         assert collector.tokens.input_tokens == 100
         assert collector.outcome.status == "success"
 
+    def test_record_result_ignores_unsupported_type(self) -> None:
+        """Test record_result leaves metrics alone for non-object input."""
+        collector = MetricsCollector("test", "python", "rust", "test")
+        collector.outcome.status = "partial"
+
+        collector.record_result("ResultMessage(...)")
+
+        assert collector.timing.wall_clock_duration_ms == 0
+        assert collector.outcome.status == "partial"
+
     def test_finalize_calculates_wall_clock_if_not_set(self) -> None:
         """Test that finalize calculates wall clock from start time if not set."""
         collector = MetricsCollector("test", "python", "rust", "test")
@@ -349,3 +388,146 @@ class TestMetricsCollector:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+_SAMPLE_LOG = """\
+[10:00:00] Starting Migration: rpn2tex -> rust
+[10:00:00] Strategy: module-by-module
+[10:00:01] MSG #1: type=AssistantMessage
+[10:00:01] [CONTENT] [ToolUseBlock(id='a', name='Read', input={})]
+[10:00:02] MSG #2: type=AssistantMessage
+[10:00:02] [CONTENT] [ToolUseBlock(id='b', name='Task', input={}), \
+subagent_type='migrator']
+[10:30:00] MSG #3: type=ResultMessage
+[10:30:00] [RAW] ResultMessage(subtype='success', duration_ms=1800000, \
+duration_api_ms=1700000, is_error=False, num_turns=12, \
+session_id='abc-123', total_cost_usd=2.5, usage={'input_tokens': 10, \
+'cache_creation_input_tokens': 200, 'cache_read_input_tokens': 3000, \
+'output_tokens': 400})
+"""
+
+
+class TestLogParser:
+    """Tests for LogParser backfill."""
+
+    def test_parse_log(self, tmp_path: Path) -> None:
+        """Test a log is parsed into metrics in a single scan."""
+        log_path = tmp_path / "migration_20250101_100000.log"
+        log_path.write_text(_SAMPLE_LOG)
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert metrics.identity.project_name == "rpn2tex"
+        assert metrics.identity.target_language == "rust"
+        assert metrics.identity.strategy == "module-by-module"
+        assert metrics.identity.run_id == "abc-123"
+        assert metrics.identity.started_at == "2025-01-01T10:00:00"
+        assert metrics.identity.completed_at == "2025-01-01T10:30:00"
+        assert metrics.agent.total_messages == 3
+        assert metrics.agent.tool_invocations == {"Read": 1, "Task": 1}
+        assert metrics.agent.subagent_invocations == {"migrator": 1}
+        assert metrics.agent.total_turns == 12
+        assert metrics.timing.wall_clock_duration_ms == 1800000
+        assert metrics.timing.api_duration_ms == 1700000
+        assert metrics.cost.total_cost_usd == 2.5
+        assert metrics.tokens.input_tokens == 10
+        assert metrics.tokens.cache_creation_input_tokens == 200
+        assert metrics.tokens.cache_read_input_tokens == 3000
+        assert metrics.tokens.output_tokens == 400
+        assert metrics.outcome.status == "success"
+
+    def test_parse_log_without_results(self, tmp_path: Path) -> None:
+        """Test a truncated log keeps defaults for missing fields."""
+        log_path = tmp_path / "other.log"
+        log_path.write_text("[09:00:00] MSG #1: type=SystemMessage\n")
+
+        # With no duration in the log, finalize() falls back to the parser's
+        # own elapsed time; freeze the clock so that fallback is exactly 0
+        with patch(
+            "migration.reporting.collector.time.monotonic_ns",
+            return_value=1_000_000_000,
+        ):
+            metrics = LogParser().parse_log(log_path)
+
+        assert metrics.identity.project_name == "unknown"
+        assert metrics.agent.total_messages == 1
+        assert metrics.timing.wall_clock_duration_ms == 0
+        assert metrics.outcome.status != "success"
+
+    def test_parse_log_counts_one_message_per_stamped_line(
+        self, tmp_path: Path
+    ) -> None:
+        """Test "] MSG #" inside a logged message body is not counted."""
+        log_path = tmp_path / "other.log"
+        log_path.write_text(
+            "[09:00:00] MSG #1: type=AssistantMessage\n"
+            "[09:00:00] [TEXT] grep '] MSG #' found [09:00:01] MSG #7 twice\n"
+            "  quoted: [10:00:00] MSG #8: type=SystemMessage\n"
+            "[09:00:02] MSG #2: type=ResultMessage\n"
+        )
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert metrics.agent.total_messages == 2
+
+    def test_parse_log_skips_malformed_timestamp(self, tmp_path: Path) -> None:
+        """Test a stamp that is not HH:MM:SS leaves started_at untouched."""
+        log_path = tmp_path / "migration_20250101_100000.log"
+        log_path.write_text("[12] MSG #1: type=SystemMessage\n")
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert not metrics.identity.started_at.startswith("2025-01-01T")
+        assert metrics.agent.total_messages == 1
+
+    def test_parse_log_header_limited_to_first_lines(self, tmp_path: Path) -> None:
+        """Test a Starting Migration line after the header is ignored."""
+        log_path = tmp_path / "run.log"
+        log_path.write_text(
+            "[10:00:00] Starting Migration: rpn2tex -> go\n"
+            + "[10:00:01] MSG #1: type=AssistantMessage\n" * 20
+            + "[10:00:02] Starting Migration: other -> java\n"
+        )
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert metrics.identity.project_name == "rpn2tex"
+        assert metrics.identity.target_language == "go"
+
+    def test_parse_log_completed_at_skips_unstamped_tail(self, tmp_path: Path) -> None:
+        """Test the end time comes from the last line that has a timestamp."""
+        log_path = tmp_path / "migration_20250101_100000.log"
+        log_path.write_text(
+            "[10:00:00] MSG #1: type=AssistantMessage\n"
+            "[10:20:00] [TEXT] multi-line output\n"
+            "continued without a timestamp\n"
+            "\n"
+        )
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert metrics.identity.started_at == "2025-01-01T10:00:00"
+        assert metrics.identity.completed_at == "2025-01-01T10:20:00"
+
+    def test_parse_empty_log(self, tmp_path: Path) -> None:
+        """Test an empty log file parses to default metrics."""
+        log_path = tmp_path / "migration_20250101_100000.log"
+        log_path.write_bytes(b"")
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert metrics.identity.project_name == "unknown"
+        assert metrics.agent.total_messages == 0
+
+    def test_parse_log_ignores_bracketed_numbers_mid_line(self, tmp_path: Path) -> None:
+        """Test only line-leading brackets are treated as timestamps."""
+        log_path = tmp_path / "migration_20250101_100000.log"
+        log_path.write_text(
+            "[10:00:00] MSG #1: type=AssistantMessage\n"
+            "[10:05:00] [TEXT] see items [1] and [2]\n"
+        )
+
+        metrics = LogParser().parse_log(log_path)
+
+        assert metrics.identity.started_at == "2025-01-01T10:00:00"
+        assert metrics.agent.total_messages == 1
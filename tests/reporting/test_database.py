@@ -1,7 +1,12 @@
 """Unit tests for MigrationDatabase."""
 
+import json
+import sqlite3
 import tempfile
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -14,6 +19,7 @@ from migration.reporting.schema import (
     IdentityMetrics,
     IOContractMetrics,
     MigrationMetrics,
+    ModuleTiming,
     OutcomeMetrics,
     QualityGates,
     TestOutcomeResult,
@@ -109,6 +115,288 @@ class TestMigrationDatabase:
             assert retrieved.identity.run_id == "test-run-1"
             assert retrieved.identity.project_name == "test-project"
 
+    def test_json_round_trip(self) -> None:
+        """Test to_json matches the stdlib encoding and from_json accepts bytes."""
+        metrics = create_test_metrics()
+        encoded = metrics.to_json()
+
+        assert json.loads(encoded) == json.loads(json.dumps(metrics.to_dict()))
+        decoded = MigrationMetrics.from_json(encoded.encode())
+        assert decoded.to_json() == MigrationMetrics.from_json(encoded).to_json()
+        assert decoded.identity == metrics.identity
+        assert json.loads(metrics.to_json(indent=4)) == json.loads(encoded)
+
+    def test_to_dict_matches_asdict(self) -> None:
+        """Test to_dict matches asdict() plus computed fields, without aliasing."""
+        metrics = create_test_metrics()
+        metrics.timing.module_durations = [ModuleTiming("lexer", 1200, 2)]
+        metrics.agent.tool_invocations = {"Bash": 3}
+        expected = asdict(metrics)
+        expected["tokens"]["cache_efficiency_ratio"] = (
+            metrics.tokens.cache_efficiency_ratio
+        )
+        expected["io_contract"]["match_rate_pct"] = metrics.io_contract.match_rate_pct
+        expected["loc_expansion_ratio"] = metrics.loc_expansion_ratio
+        expected["cost_per_loc"] = metrics.cost_per_loc
+
+        data = metrics.to_dict()
+        assert json.dumps(data) == json.dumps(expected)
+
+        data["agent"]["tool_invocations"]["Read"] = 1
+        data["timing"]["module_durations"][0]["attempts"] = 9
+        assert metrics.agent.tool_invocations == {"Bash": 3}
+        assert metrics.timing.module_durations[0].attempts == 2
+
+    def test_metrics_dataclasses_are_slotted(self) -> None:
+        """Test metrics sections carry no per-instance __dict__."""
+        metrics = create_test_metrics()
+        for section in (metrics, metrics.identity, metrics.timing, metrics.tokens):
+            assert not hasattr(section, "__dict__")
+        with pytest.raises(AttributeError):
+            metrics.cost.total_cost = 1.0  # type: ignore[attr-defined]
+
+    def test_from_dict_generated_loaders(self) -> None:
+        """Test from_dict fills defaults, skips computed keys, and copies nothing."""
+        data = create_test_metrics().to_dict()
+        del data["agent"]["tool_invocations"]
+        del data["outcome"]["blocking_issues"]
+        data["cost"] = {"total_cost_usd": 2.0}
+
+        first = MigrationMetrics.from_dict(data)
+        second = MigrationMetrics.from_dict(data)
+
+        assert first.cost == CostMetrics(total_cost_usd=2.0)
+        assert first.tokens.cache_read_input_tokens == 200
+        assert first.io_contract.total_test_cases == 10
+        assert first.agent.tool_invocations == {}
+        assert first.agent.tool_invocations is not second.agent.tool_invocations
+        assert first.outcome.blocking_issues is not second.outcome.blocking_issues
+        del data["identity"]["run_id"]
+        with pytest.raises(KeyError, match="run_id"):
+            MigrationMetrics.from_dict(data)
+
+    def test_from_dict_defaults_missing_and_null_sections(self) -> None:
+        """Test the compiled loader defaults absent or null nested sections."""
+        data = create_test_metrics().to_dict()
+        del data["tokens"]
+        data["io_contract"] = None
+        data["quality_gates"]["linting"] = None
+        data["timing"]["module_durations"] = [
+            {"module_name": "lexer", "duration_ms": 5}
+        ]
+
+        metrics = MigrationMetrics.from_dict(data)
+
+        assert metrics.tokens == TokenMetrics()
+        assert metrics.io_contract == IOContractMetrics()
+        assert metrics.quality_gates.linting.tool == ""
+        assert metrics.quality_gates.coverage.line_coverage_pct == 85.0
+        assert metrics.timing.module_durations == [ModuleTiming("lexer", 5)]
+
+    def test_from_json_interns_categorical_strings(self) -> None:
+        """Test strategy and status strings are shared across loaded runs."""
+        encoded = create_test_metrics(strategy="feature-by-feature").to_json()
+        first = MigrationMetrics.from_json(encoded)
+        second = MigrationMetrics.from_json(encoded.encode())
+
+        assert first.identity.strategy is second.identity.strategy
+        assert first.outcome.status is second.outcome.status
+        assert first.identity.run_id == second.identity.run_id
+
+    def test_from_json_fast_without_msgspec(self) -> None:
+        """Test from_json_fast falls back to from_json when msgspec is missing."""
+        encoded = create_test_metrics().to_json()
+        with patch("migration.reporting.schema._HAS_MSGSPEC", False):
+            decoded = MigrationMetrics.from_json_fast(encoded)
+        assert decoded.to_json() == MigrationMetrics.from_json(encoded).to_json()
+
+    def test_from_json_fast_with_msgspec(self) -> None:
+        """Test the msgspec decoder matches from_json, null sections included."""
+        pytest.importorskip("msgspec")
+        metrics = create_test_metrics()
+        metrics.timing.module_durations = [ModuleTiming("lexer", 1200, 2)]
+        with_nulls = metrics.to_json()
+        clean = MigrationMetrics.from_json(with_nulls).to_json()
+
+        for encoded in (with_nulls, clean):
+            decoded = MigrationMetrics.from_json_fast(encoded.encode())
+            # msgspec coerces int values of float fields, so compare parsed
+            assert json.loads(decoded.to_json()) == json.loads(clean)
+        assert isinstance(decoded.timing.module_durations[0], ModuleTiming)
+
+    def test_save_and_load_bytes(self, tmp_path: Path) -> None:
+        """Test save writes the JSON bytes and load reads them back."""
+        metrics = create_test_metrics()
+        path = tmp_path / "metrics.json"
+
+        metrics.save(str(path))
+
+        assert path.read_bytes() == metrics.to_json_bytes()
+        assert metrics.to_json_bytes().decode() == metrics.to_json()
+        loaded = MigrationMetrics.load(str(path))
+        assert loaded.identity == metrics.identity
+        assert (
+            loaded.to_json() == MigrationMetrics.from_json(path.read_bytes()).to_json()
+        )
+
+    def test_load_cached_reuses_until_file_changes(self, tmp_path: Path) -> None:
+        """Test load_cached shares one parse until the file is rewritten."""
+        path = str(tmp_path / "metrics.json")
+        create_test_metrics(run_id="run-a").save(path)
+
+        first = MigrationMetrics.load_cached(path)
+        assert MigrationMetrics.load_cached(path) is first
+        assert MigrationMetrics.load(path) is not first
+
+        create_test_metrics(run_id="run-bb").save(path)
+        reloaded = MigrationMetrics.load_cached(path)
+        assert reloaded is not first
+        assert reloaded.identity.run_id == "run-bb"
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_save_many_and_load_many(self, tmp_path: Path, has_orjson: bool) -> None:
+        """Test runs round-trip through a JSON Lines file in flushed batches."""
+        runs = [create_test_metrics(run_id=f"run-{i}") for i in range(300)]
+        path = tmp_path / "cohort.jsonl"
+
+        with patch("migration.reporting.schema._HAS_ORJSON", has_orjson):
+            assert MigrationMetrics.save_many(iter(runs), str(path)) == 300
+
+        lines = path.read_bytes().splitlines()
+        assert len(lines) == 300
+        assert json.loads(lines[0])["identity"]["run_id"] == "run-0"
+        loaded = MigrationMetrics.load_many(str(path))
+        assert [m.identity.run_id for m in loaded] == [f"run-{i}" for i in range(300)]
+
+        assert MigrationMetrics.save_many([], str(path)) == 0
+        assert list(MigrationMetrics.load_many(str(path))) == []
+
+    def test_save_many_msgpack(self, tmp_path: Path) -> None:
+        """Test runs round-trip through a msgpack cohort file."""
+        pytest.importorskip("msgpack")
+        runs = [create_test_metrics(run_id=f"run-{i}") for i in range(3)]
+        path = tmp_path / "cohort.msgpack"
+
+        assert MigrationMetrics.save_many(runs, str(path), "msgpack") == 3
+
+        loaded = list(MigrationMetrics.load_many(str(path), "msgpack"))
+        assert [m.identity.run_id for m in loaded] == ["run-0", "run-1", "run-2"]
+        assert (
+            loaded[0].to_json()
+            == MigrationMetrics.from_json(runs[0].to_json()).to_json()
+        )
+
+    def test_cohort_format_validation(self, tmp_path: Path) -> None:
+        """Test unknown formats and a missing msgpack package are rejected."""
+        path = str(tmp_path / "cohort.bin")
+        with pytest.raises(ValueError, match="Available: jsonl, msgpack"):
+            MigrationMetrics.save_many([], path, "parquet")
+        with (
+            patch("migration.reporting.schema._HAS_MSGPACK", False),
+            pytest.raises(ImportError, match="pip install msgpack"),
+        ):
+            list(MigrationMetrics.load_many(path, "msgpack"))
+
+    def test_insert_reuses_serialized_json(self, tmp_path: Path) -> None:
+        """Test a precomputed metrics JSON is stored instead of re-serializing."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        metrics = create_test_metrics()
+        metrics_json = metrics.to_json(indent=0)
+
+        with patch.object(MigrationMetrics, "to_json") as mock_to_json:
+            db.insert(metrics, metrics_json)
+        mock_to_json.assert_not_called()
+
+        retrieved = db.get("test-run-1")
+        assert retrieved is not None
+        assert retrieved.identity.run_id == "test-run-1"
+
+    def test_insert_many(self, tmp_path: Path) -> None:
+        """Test inserting several runs in one call."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        first = create_test_metrics(run_id="run-a")
+        second = create_test_metrics(run_id="run-b")
+
+        assert db.insert_many([(first, None), (second, second.to_json())]) == 2
+        assert db.count() == 2
+        assert db.get("run-b") is not None
+
+    def test_insert_many_empty_and_insert_wrapper(self, tmp_path: Path) -> None:
+        """Test insert() goes through insert_many and empty batches are a no-op."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        assert db.insert_many([]) == 0
+
+        with patch.object(db, "insert_many", wraps=db.insert_many) as spy:
+            db.insert(create_test_metrics())
+        spy.assert_called_once()
+        assert db.count() == 1
+        assert not db._conn.in_transaction
+
+    def test_connection_is_reused_and_closed(self, tmp_path: Path) -> None:
+        """Test one WAL-mode connection serves all calls until close()."""
+        with MigrationDatabase(tmp_path / "m.db") as db:
+            conn = db._conn
+            db.insert(create_test_metrics())
+            assert db.count() == 1
+            assert db._conn is conn
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == "wal"
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_failed_statement_rolls_back(self, tmp_path: Path) -> None:
+        """Test work inside a failed _connect block is not committed."""
+        db = MigrationDatabase(tmp_path / "m.db")
+
+        with pytest.raises(sqlite3.IntegrityError), db._connect() as conn:
+            conn.execute(db.INSERT_SQL, db._insert_row(create_test_metrics(), None))
+            conn.execute("INSERT INTO migrations (run_id) VALUES ('x')")
+
+        assert db.count() == 0
+
+    def test_metrics_json_stored_compressed(self, tmp_path: Path) -> None:
+        """Test metrics_json is written as a compressed BLOB and read back."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        db.insert(create_test_metrics())
+
+        stored = db._conn.execute("SELECT metrics_json FROM migrations").fetchone()[0]
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(create_test_metrics().to_json())
+        retrieved = db.get("test-run-1")
+        assert retrieved is not None
+        assert retrieved.identity.run_id == "test-run-1"
+
+    def test_migration_compresses_text_rows(self, tmp_path: Path) -> None:
+        """Test opening a pre-V4 database compresses its plain-text rows."""
+        path = tmp_path / "m.db"
+        with MigrationDatabase(path) as db:
+            row = list(db._insert_row(create_test_metrics(), None))
+            row[-1] = create_test_metrics().to_json()
+            with db._connect() as conn:
+                conn.execute(db.INSERT_SQL, row)
+                conn.execute("PRAGMA user_version = 3")
+
+        with MigrationDatabase(path) as db:
+            stored = db._conn.execute("SELECT metrics_json FROM migrations")
+            assert isinstance(stored.fetchone()[0], bytes)
+            assert [m.identity.run_id for m in db.query()] == ["test-run-1"]
+
+    def test_report_columns_populated_and_backfilled(self, tmp_path: Path) -> None:
+        """Test report fields are stored as columns, including for old rows."""
+        path = tmp_path / "m.db"
+        columns = ["input_tokens", "tests_total", "tests_passed", "target_max_cc"]
+        with MigrationDatabase(path) as db:
+            db.insert(create_test_metrics())
+            assert tuple(db.query_columns(columns)[0]) == (1000, 5, 5, 0)
+
+            with db._connect() as conn:
+                conn.execute("UPDATE migrations SET input_tokens = NULL")
+                conn.execute("PRAGMA user_version = 4")
+
+        with MigrationDatabase(path) as db:
+            assert db.query_columns(["input_tokens"])[0]["input_tokens"] == 1000
+
     def test_get_nonexistent(self) -> None:
         """Test getting a non-existent migration returns None."""
         with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
@@ -155,6 +443,75 @@ class TestMigrationDatabase:
             results = db.query(target="rust")
             assert len(results) == 2
 
+    def test_query_time_range_uses_epoch_ms(self, tmp_path: Path) -> None:
+        """Test since/until filter and order runs by integer timestamps."""
+        path = tmp_path / "m.db"
+        db = MigrationDatabase(path)
+        for day in (1, 2, 3):
+            metrics = create_test_metrics(run_id=f"run-{day}")
+            metrics.identity.started_at = f"2024-01-0{day}T10:00:00"
+            db.insert(metrics)
+
+        results = db.query(
+            since=datetime(2024, 1, 2), until=datetime(2024, 1, 3, 23, 59)
+        )
+        assert [m.identity.run_id for m in results] == ["run-3", "run-2"]
+
+        # Databases from before V8 get the integer columns backfilled
+        with db._connect() as conn:
+            conn.execute("UPDATE migrations SET started_at_ms = NULL")
+            conn.execute("PRAGMA user_version = 7")
+        db.close()
+        db = MigrationDatabase(path)
+        rows = db.query_columns(["run_id", "started_at_ms"])
+        assert [row["run_id"] for row in rows] == ["run-3", "run-2", "run-1"]
+        assert rows[0]["started_at_ms"] == int(
+            datetime(2024, 1, 3, 10).timestamp() * 1000
+        )
+
+    def test_query_columns(self, tmp_path: Path) -> None:
+        """Test selecting scalar columns without decoding metrics_json."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        db.insert(create_test_metrics(run_id="run-1", target="rust", cost_usd=1.0))
+        db.insert(create_test_metrics(run_id="run-2", target="java", cost_usd=2.0))
+
+        with patch.object(MigrationMetrics, "from_json") as mock_from_json:
+            rows = db.query_columns(["run_id", "cost_usd"], target="java")
+        mock_from_json.assert_not_called()
+
+        assert [tuple(row) for row in rows] == [("run-2", 2.0)]
+
+    def test_where_clause_reused_per_filter_combination(self) -> None:
+        """Test each filter combination maps to one cached SQL text."""
+        first, params = MigrationDatabase._where(project="a", status="success")
+        second, _ = MigrationDatabase._where(project="b", status="failure")
+        assert first is second
+        assert first == "project_name = ? AND status = ?"
+        assert params == ["a", "success"]
+        assert MigrationDatabase._where() == ("1=1", [])
+
+    def test_query_project_prefix_is_literal(self, tmp_path: Path) -> None:
+        """Test prefix filters ignore case and treat LIKE wildcards literally."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        for run_id, project in [("1", "rpn_a"), ("2", "RPNxa"), ("3", "rpn_B")]:
+            db.insert(create_test_metrics(run_id=run_id, project=project))
+
+        rows = db.query_columns(["run_id"], project_prefix="RPN_")
+        assert sorted(row["run_id"] for row in rows) == ["1", "3"]
+        plan = db._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT run_id FROM migrations "
+            "WHERE project_name LIKE ? ESCAPE '\\'",
+            ("rpn%",),
+        ).fetchall()
+        assert "idx_project_nocase" in " ".join(row[-1] for row in plan)
+
+    def test_query_columns_invalid_column(self, tmp_path: Path) -> None:
+        """Test query_columns rejects names outside the migrations table."""
+        db = MigrationDatabase(tmp_path / "m.db")
+
+        with pytest.raises(ValueError, match="Invalid columns"):
+            db.query_columns(["run_id", "1; DROP TABLE migrations"])
+
     def test_query_by_strategy(self) -> None:
         """Test querying by migration strategy."""
         with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
@@ -293,6 +650,154 @@ class TestMigrationDatabase:
             assert grouped["rust"].count == 2
             assert grouped["java"].count == 1
 
+    def test_group_by_matches_filtered_aggregate(self) -> None:
+        """Test each group's stats equal aggregate() filtered to that group."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db = MigrationDatabase(Path(f.name))
+
+            for i, (target, duration) in enumerate(
+                [("rust", 300), ("rust", 100), ("rust", 200), ("java", 50)]
+            ):
+                db.insert(
+                    create_test_metrics(
+                        run_id=f"run-{i}", target=target, duration_ms=duration
+                    )
+                )
+
+            grouped = db.group_by("target_language")
+            assert grouped["rust"] == db.aggregate(target="rust")
+            assert grouped["java"] == db.aggregate(target="java")
+            assert grouped["rust"].median_duration_ms == 200
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_percentile_unsorted_input(self, use_numpy: bool) -> None:
+        """Test percentiles interpolate correctly without sorted input."""
+        if use_numpy:
+            pytest.importorskip("numpy")
+        with (
+            tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f,
+            patch("migration.reporting.database._HAS_NUMPY", use_numpy),
+        ):
+            db = MigrationDatabase(Path(f.name))
+
+            values = [40, 10, 30, 20, 30, 50]
+            assert db._percentile(values, 50) == 30.0
+            assert db._percentile(values, 95) == pytest.approx(47.5)
+            assert db._percentile([7], 95) == 7.0
+            assert db._percentile([], 50) == 0.0
+            assert values == [40, 10, 30, 20, 30, 50]
+
+    def test_summary_cache_refreshed_after_writes(self, tmp_path: Path) -> None:
+        """Test cached unfiltered stats are served until the table changes."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        db.insert(create_test_metrics(run_id="run-1", target="rust", cost_usd=1.0))
+
+        assert db.group_by("target_language")["rust"].count == 1
+        assert db.aggregate() is not None
+        cached = db._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()
+        assert cached[0] == 2
+        assert db.group_by("target_language") == db.group_by("target_language")
+
+        db.insert(create_test_metrics(run_id="run-2", target="go", cost_usd=3.0))
+        grouped = db.group_by("target_language")
+        assert list(grouped) == ["go", "rust"]
+        totals = db.aggregate()
+        assert totals is not None
+        assert totals.count == 2
+        assert totals.total_cost_usd == 4.0
+
+        db.delete("run-2")
+        assert list(db.group_by("target_language")) == ["rust"]
+
+    def test_summary_cache_skipped_when_read_only(self, tmp_path: Path) -> None:
+        """Test stats still compute when the cache write is refused."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        db.insert(create_test_metrics(run_id="run-1", target="rust", cost_usd=1.0))
+        db._conn.execute("PRAGMA query_only = ON")
+
+        totals = db.aggregate()
+        assert totals is not None
+        assert totals.count == 1
+        assert db.group_by("target_language")["rust"].count == 1
+        cached = db._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()
+        assert cached[0] == 0
+
+    def test_summary_cache_schema_error_raised(self, tmp_path: Path) -> None:
+        """Test cache write errors other than read-only are not swallowed."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        db.insert(create_test_metrics(run_id="run-1", target="rust", cost_usd=1.0))
+        db._conn.execute("ALTER TABLE summary_cache DROP COLUMN avg_coverage_pct")
+
+        with pytest.raises(sqlite3.OperationalError, match="avg_coverage_pct"):
+            db.aggregate()
+
+    @pytest.mark.parametrize(
+        ("column", "index"),
+        [
+            ("project_name", "idx_cover_project"),
+            ("target_language", "idx_cover_target"),
+            ("strategy", "idx_cover_strategy"),
+        ],
+    )
+    def test_aggregate_uses_covering_index(
+        self, tmp_path: Path, column: str, index: str
+    ) -> None:
+        """Test filtered aggregates are answered from a covering index."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        sql = f"SELECT {db.AGGREGATE_COLUMNS} FROM migrations WHERE {column} = ?"  # noqa: S608
+        plan = db._conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("x",)).fetchall()
+        assert f"USING COVERING INDEX {index}" in " ".join(row[-1] for row in plan)
+
+    def test_counters_track_replace_update_and_delete(self, tmp_path: Path) -> None:
+        """Test trigger-kept counts match a scan of the table after each write."""
+        path = tmp_path / "m.db"
+        db = MigrationDatabase(path)
+
+        def scanned() -> tuple[int, list[str], list[str]]:
+            conn = db._conn
+            return (
+                conn.execute("SELECT COUNT(*) FROM migrations").fetchone()[0],
+                [
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT DISTINCT project_name FROM migrations ORDER BY 1"
+                    )
+                ],
+                [
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT DISTINCT target_language FROM migrations ORDER BY 1"
+                    )
+                ],
+            )
+
+        def counted() -> tuple[int, list[str], list[str]]:
+            return db.count(), db.list_projects(), db.list_targets()
+
+        assert counted() == scanned() == (0, [], [])
+        db.insert(create_test_metrics(run_id="run-1", project="a", target="rust"))
+        db.insert(create_test_metrics(run_id="run-2", project="b", target="go"))
+        # Replacing run-2 moves it to another project and target
+        db.insert(create_test_metrics(run_id="run-2", project="a", target="java"))
+        assert counted() == scanned() == (2, ["a"], ["java", "rust"])
+
+        with db._connect() as conn:
+            conn.execute(
+                "UPDATE migrations SET project_name = 'c' WHERE run_id = 'run-1'"
+            )
+        assert counted() == scanned() == (2, ["a", "c"], ["java", "rust"])
+
+        db.delete("run-1")
+        assert counted() == scanned() == (1, ["a"], ["java"])
+
+        # Databases from before the counters are seeded when opened
+        with db._connect() as conn:
+            conn.execute("DELETE FROM migration_counts")
+            conn.execute("PRAGMA user_version = 6")
+        db.close()
+        db = MigrationDatabase(path)
+        assert counted() == scanned()
+
     def test_group_by_invalid_field(self) -> None:
         """Test group_by with invalid field raises ValueError."""
         with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
@@ -316,6 +821,26 @@ class TestMigrationDatabase:
             content = Path(json_file.name).read_text()
             assert "test-run-1" in content
             assert "test-project" in content
+            exported = json.loads(content)
+            assert exported["count"] == 1
+            assert exported["migrations"][0]["identity"]["run_id"] == "test-run-1"
+
+    def test_export_to_json_streams_all_rows(self, tmp_path: Path) -> None:
+        """Test several stored documents are written as one valid JSON array."""
+        db = MigrationDatabase(tmp_path / "m.db")
+        db.insert_many(
+            [(create_test_metrics(run_id=f"run-{i}"), None) for i in range(3)]
+        )
+
+        db.export_to_json(tmp_path / "out.json")
+
+        exported = json.loads((tmp_path / "out.json").read_text())
+        assert exported["count"] == 3
+        assert sorted(m["identity"]["run_id"] for m in exported["migrations"]) == [
+            "run-0",
+            "run-1",
+            "run-2",
+        ]
 
 
 if __name__ == "__main__":
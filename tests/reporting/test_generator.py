@@ -1,5 +1,6 @@
 """Unit tests for ReportGenerator."""
 
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
@@ -82,6 +83,16 @@ class TestReportGenerator:
         assert "pct" in generator.env.filters
         assert "number" in generator.env.filters
 
+    def test_environment_shared_per_templates_dir(self, tmp_path: Path) -> None:
+        """Test generators for one directory reuse the environment and templates."""
+        first = ReportGenerator()
+        second = ReportGenerator()
+        assert first.env is second.env
+        assert first.env.get_template("summary.md.j2") is second.env.get_template(
+            "summary.md.j2"
+        )
+        assert ReportGenerator(tmp_path).env is not first.env
+
 
 class TestFormatFilters:
     """Tests for custom Jinja2 filters."""
@@ -106,6 +117,21 @@ class TestFormatFilters:
         generator = ReportGenerator()
         assert generator._format_duration(7200000) == "2.0h"
 
+    @pytest.mark.parametrize(
+        ("ms", "expected"),
+        [
+            (999, "999ms"),
+            (999.5, "999.5ms"),
+            (1000, "1.0s"),
+            (59_999, "60.0s"),
+            (60_000, "1.0min"),
+            (3_600_000, "1.0h"),
+        ],
+    )
+    def test_format_duration_boundaries(self, ms: float, expected: str) -> None:
+        """Test unit boundaries for both int and float inputs."""
+        assert ReportGenerator._format_duration(ms) == expected
+
     def test_format_cost(self) -> None:
         """Test formatting USD cost."""
         generator = ReportGenerator()
@@ -137,6 +137,7 @@ async def test_module_timing_and_outcome_tracking(tmp_path):
         patch("migration.runner.Path.iterdir", return_value=[]),
         patch("migration.runner.CheckpointManager", spec=True),
         patch("builtins.open", MagicMock()),
+        patch("migration.reporting.schema.MigrationMetrics.save"),
         patch("migration.runner.type", side_effect=mock_type, create=True),
     ):
         # Prepare messages with proper types
@@ -1,7 +1,9 @@
 """Tests for checkpoint module."""
 
 import json
+import threading
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -165,6 +167,30 @@ class TestCheckpointManager:
         assert manager.checkpoint_dir.exists()
         assert manager.state_file.exists()
 
+    def test_save_leaves_no_temp_file(self, tmp_path: Path) -> None:
+        """Test save renames its temp file over the state file."""
+        manager = CheckpointManager(tmp_path)
+        state = CheckpointState(
+            project="test", target="go", strategy="module-by-module"
+        )
+        manager.save(state)
+        manager.save(state)
+
+        assert [p.name for p in manager.checkpoint_dir.iterdir()] == ["state.json"]
+
+    def test_save_after_clear_recreates_directory(self, tmp_path: Path) -> None:
+        """Test save recreates the checkpoint directory removed after clear."""
+        manager = CheckpointManager(tmp_path)
+        state = CheckpointState(
+            project="test", target="go", strategy="module-by-module"
+        )
+        manager.save(state)
+        manager.clear()
+        manager.checkpoint_dir.rmdir()
+
+        manager.save(state)
+        assert manager.state_file.exists()
+
     def test_clear(self, tmp_path: Path) -> None:
         """Test clear removes checkpoint."""
         manager = CheckpointManager(tmp_path)
@@ -342,3 +368,129 @@ class TestCheckpointManager:
         parsed = json.loads(content)  # Should not raise
         assert parsed["project"] == "test"
         assert parsed["completed_features"] == ["a", "b"]
+
+    def test_state_file_matches_to_dict(self, tmp_path: Path) -> None:
+        """Test the saved file holds the same fields as to_dict."""
+        manager = CheckpointManager(tmp_path)
+        state = CheckpointState(
+            project="test",
+            target="java",
+            strategy="module-by-module",
+            current_feature="numbers",
+        )
+        manager.save(state)
+
+        parsed = json.loads(manager.state_file.read_text())
+        assert parsed == state.to_dict()
+
+
+class TestCheckpointBatching:
+    """Tests for batched checkpoint writes."""
+
+    def test_batched_mutations_stay_in_memory(self, tmp_path: Path) -> None:
+        """Test batched mutations are visible before being written."""
+        manager = CheckpointManager(tmp_path, batch_interval_sec=60.0)
+        manager.create_initial("test", "rust", "feature-by-feature")
+        manager.mark_feature_completed("numbers", "session-1")
+        manager.mark_feature_completed("addition", "session-2")
+
+        on_disk = json.loads(manager.state_file.read_text())
+        assert on_disk["completed_features"] == []
+
+        loaded = manager.load()
+        assert loaded is not None
+        assert loaded.completed_features == ["numbers", "addition"]
+        manager.flush()
+
+    def test_flush_writes_pending_state(self, tmp_path: Path) -> None:
+        """Test flush persists batched mutations."""
+        manager = CheckpointManager(tmp_path, batch_interval_sec=60.0)
+        manager.create_initial("test", "rust", "feature-by-feature")
+        manager.mark_feature_completed("numbers", "session-1")
+        manager.flush()
+
+        on_disk = json.loads(manager.state_file.read_text())
+        assert on_disk["completed_features"] == ["numbers"]
+        assert on_disk["session_id"] == "session-1"
+
+    def test_context_manager_flushes_on_exit(self, tmp_path: Path) -> None:
+        """Test leaving the context writes pending state."""
+        with CheckpointManager(tmp_path, batch_interval_sec=60.0) as manager:
+            manager.create_initial("test", "go", "module-by-module")
+            manager.mark_feature_failed("numbers", "boom", "session-1")
+
+        reloaded = CheckpointManager(tmp_path).load()
+        assert reloaded is not None
+        assert reloaded.failed_feature == "numbers"
+        assert reloaded.error_message == "boom"
+
+    def test_timer_writes_after_interval(self, tmp_path: Path) -> None:
+        """Test the background timer persists state once the interval elapses."""
+        manager = CheckpointManager(tmp_path, batch_interval_sec=0.01)
+        manager.create_initial("test", "rust", "feature-by-feature")
+        manager.mark_feature_started("numbers", "session-1")
+
+        timer = manager._timer
+        assert timer is not None
+        timer.join(timeout=5)
+
+        on_disk = json.loads(manager.state_file.read_text())
+        assert on_disk["current_feature"] == "numbers"
+
+    def test_timer_is_daemon(self, tmp_path: Path) -> None:
+        """Test a pending batched write cannot hold up interpreter exit."""
+        manager = CheckpointManager(tmp_path, batch_interval_sec=60.0)
+        manager.create_initial("test", "rust", "feature-by-feature")
+        manager.mark_feature_started("numbers", "session-1")
+
+        assert manager._timer is not None
+        assert manager._timer.daemon
+        manager.flush()
+
+    def test_mutation_holds_lock_until_committed(self, tmp_path: Path) -> None:
+        """Test another thread cannot take the lock between load and commit."""
+        manager = CheckpointManager(tmp_path, batch_interval_sec=60.0)
+        manager.create_initial("test", "rust", "feature-by-feature")
+        acquired: list[bool] = []
+
+        def try_lock() -> None:
+            got = manager._lock.acquire(blocking=False)
+            if got:
+                manager._lock.release()
+            acquired.append(got)
+
+        original_commit = manager._commit
+
+        def commit(state: CheckpointState) -> None:
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            original_commit(state)
+
+        with patch.object(manager, "_commit", side_effect=commit):
+            manager.mark_feature_completed("numbers", "session-1")
+
+        assert acquired == [False]
+        manager.flush()
+
+
+class TestCheckpointFormats:
+    """Tests for selectable on-disk checkpoint formats."""
+
+    def test_msgpack_roundtrip(self, tmp_path: Path) -> None:
+        """Test msgpack state saves to state.msgpack and loads back."""
+        pytest.importorskip("msgpack")
+        manager = CheckpointManager(tmp_path, state_format="msgpack")
+        manager.create_initial("test", "rust", "feature-by-feature")
+        manager.mark_feature_completed("numbers", "session-1")
+
+        assert manager.state_file.name == "state.msgpack"
+        loaded = CheckpointManager(tmp_path, state_format="msgpack").load()
+        assert loaded is not None
+        assert loaded.completed_features == ["numbers"]
+        assert loaded.session_id == "session-1"
+
+    def test_unknown_format_raises(self, tmp_path: Path) -> None:
+        """Test unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Unknown checkpoint format"):
+            CheckpointManager(tmp_path, state_format="yaml")
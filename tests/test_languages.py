@@ -3,8 +3,10 @@
 import pytest
 
 from migration.languages import (
+    LANGUAGE_REGISTRY,
     GoTarget,
     JavaTarget,
+    LanguageTarget,
     RustTarget,
     get_language_target,
 )
@@ -33,9 +35,14 @@ class TestGetLanguageTarget:
 
     def test_get_unknown_target_raises(self) -> None:
         """Test that unknown language raises ValueError."""
-        with pytest.raises(ValueError, match="Unknown language"):
+        with pytest.raises(ValueError, match="Available: go, java, rust"):
             get_language_target("cobol")
 
+    def test_registry_is_read_only(self) -> None:
+        """Test the language registry cannot be mutated."""
+        with pytest.raises(TypeError):
+            LANGUAGE_REGISTRY["cobol"] = RustTarget  # type: ignore[index]
+
 
 class TestRustTarget:
     """Tests for RustTarget class."""
@@ -220,6 +227,32 @@ ok  rpn2tex/cmd  coverage: 90.0% of statements"""
         result = target.parse_coverage_output(output)
         assert result == 85.0  # Average of 80 and 90
 
+    def test_parse_coverage_output_none(self) -> None:
+        """Test parsing returns None when no package reports coverage."""
+        target = GoTarget()
+        assert target.parse_coverage_output("ok  rpn2tex  0.01s") is None
+
+
+class TestConfigure:
+    """Tests for precomputed project-specific strings."""
+
+    def test_configure_caches_project_strings(self) -> None:
+        """Test configured arguments return the precomputed strings."""
+        target = JavaTarget()
+        target.configure("myproject", "/project")
+        assert target.get_project_subdir("myproject") == "myproject-java"
+        assert target.get_source_dir("/project") == (
+            "/project/src/main/java/com/rpn2tex"
+        )
+        assert target.get_coverage_command("/project").startswith("cd /project")
+
+    def test_configure_other_arguments_still_built(self) -> None:
+        """Test arguments other than the configured ones are built on demand."""
+        target = RustTarget()
+        target.configure("myproject", "/project")
+        assert target.get_project_subdir("other") == "other-rs"
+        assert target.get_source_dir("/elsewhere") == "/elsewhere/src"
+
 
 class TestBaseCoverageParser:
     """Tests for base class coverage parsing."""
@@ -237,6 +270,23 @@ class TestBaseCoverageParser:
         # Note: RustTarget overrides, so may not match base behavior
         assert result is None or result == 92.0
 
+    @pytest.mark.parametrize(
+        ("output", "expected"),
+        [
+            ("75.5% coverage", 75.5),
+            ("Coverage: 92%", 92.0),
+            ("ok pkg 0.1s 81.3% of statements", 81.3),
+            ("Line: 64.0%", 64.0),
+            ("no coverage info", None),
+        ],
+    )
+    def test_parse_coverage_base_implementation(
+        self, output: str, expected: float | None
+    ) -> None:
+        """Test the base implementation matches each supported pattern."""
+        target = RustTarget()
+        assert LanguageTarget.parse_coverage_output(target, output) == expected
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,6 +1,7 @@
 """Unit tests for runner module."""
 
 import tempfile
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -11,6 +12,7 @@ from migration.runner import (
     _count_java_loc,
     _count_python_loc,
     _count_rust_test_loc,
+    _iter_files,
     measure_loc,
 )
 
@@ -141,6 +143,13 @@ func TestAdd(t *testing.T) {
         assert prod == 0
         assert test == 0
 
+    def test_crlf_and_invalid_utf8_lines_counted(self, tmp_path: Path) -> None:
+        """Test CRLF endings and undecodable bytes do not drop the file."""
+        go_file = tmp_path / "main.go"
+        go_file.write_bytes(b'package main\r\n\r\n// \xff\r\nvar s = "\xfe"\r\n')
+
+        assert _count_go_loc(str(go_file)) == (2, 0)
+
 
 class TestCountJavaLoc:
     """Tests for _count_java_loc function."""
@@ -225,6 +234,16 @@ public class Main {
         # Only package line and class lines should count
         assert prod == 3  # package, public class Main {, }
 
+    def test_crlf_block_comment_and_non_ascii(self, tmp_path: Path) -> None:
+        """Test CRLF block comments and non-ASCII strings count as before."""
+        java_file = tmp_path / "Main.java"
+        java_file.write_bytes(
+            b"/*\r\n * \xc3\xa9t\xc3\xa9\r\n */\r\n"
+            b'class Main {\r\n    String s = "\xff";\r\n}\r\n'
+        )
+
+        assert _count_java_loc(str(java_file)) == (3, 0)
+
 
 class TestCountPythonLoc:
     """Tests for _count_python_loc function."""
@@ -349,6 +368,21 @@ class TestMeasureLoc:
         assert prod > 0
         assert count == 1
 
+    def test_measure_walks_nested_dirs_not_symlinks(self, tmp_path: Path) -> None:
+        """Test nested files are found, symlinked dirs and other files skipped."""
+        pkg = tmp_path / "src" / "com" / "example"
+        pkg.mkdir(parents=True)
+        (pkg / "Main.java").write_text("class Main {}\n")
+        (pkg / "MainTest.java").write_text("class MainTest {}\n")
+        (pkg / "notes.txt").write_text("not java\n")
+        (tmp_path / "linked").symlink_to(tmp_path / "src", target_is_directory=True)
+
+        assert sorted(_iter_files(str(tmp_path), ".java")) == [
+            str(pkg / "Main.java"),
+            str(pkg / "MainTest.java"),
+        ]
+        assert measure_loc(str(tmp_path), "java") == (1, 1, 2)
+
     def test_measure_nonexistent_directory(self) -> None:
         """Test handling of nonexistent directory."""
         prod, test, count = measure_loc("/nonexistent/dir", "python")
@@ -478,6 +512,34 @@ class TestLog:
             content = log_file.read_text()
             assert "Test message" in content
 
+    def test_log_to_open_handle(self, tmp_path: Path) -> None:
+        """Test logging to an open handle writes without reopening the file."""
+        from migration.runner import log
+
+        log_file = tmp_path / "test.log"
+        with open(log_file, "a") as f:
+            log("First", f, also_print=False)
+            log("Second", f, also_print=False)
+
+        lines = log_file.read_text().splitlines()
+        assert [line.split("] ", 1)[1] for line in lines] == ["First", "Second"]
+
+    def test_log_timestamp_follows_clock(self, tmp_path: Path) -> None:
+        """Test the cached timestamp changes with the wall-clock second."""
+        from migration.runner import log
+
+        log_file = tmp_path / "test.log"
+        for now in (1_700_000_000.2, 1_700_000_000.9, 1_700_000_001.0):
+            with patch("migration.runner.time.time", return_value=now):
+                log("Tick", log_file, also_print=False)
+
+        stamps = [line[1:9] for line in log_file.read_text().splitlines()]
+        expected = [
+            datetime.fromtimestamp(sec).strftime("%H:%M:%S")
+            for sec in (1_700_000_000, 1_700_000_000, 1_700_000_001)
+        ]
+        assert stamps == expected
+
 
 class TestBuildMigrationPrompt:
     """Tests for build_migration_prompt function."""